@@ -5,7 +5,7 @@ from typing import Optional, Dict, Any
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 from utils.accessing_data import AccessData
-from utils.write import write_to
+from utils import log_writer
 from utils.logging import Logging
 from PyQt5.QtWidgets import QApplication, QWidget, QLabel, QPushButton, QVBoxLayout, QTextEdit, QComboBox
 from PyQt5.QtCore import Qt
@@ -15,6 +15,8 @@ import uuid
 logger = Logging(service_name="player_report_service", user_id="Admin")
 create_log = logger.create_log
 
+PLAYER_REPORT_LOG = "C:/Users/Drags Jrs/Drags/Database/log/player_report_log.json"
+
 class Backend:
     @staticmethod
     def calculate_season_average(player: str, stat: str) -> Dict[str, Any]:
@@ -576,6 +578,8 @@ class Utils:
 
     @staticmethod
     def log_action(level: str, message: str, where: str, user_id: str, source_ip: str, request_id: str, error: Dict = None) -> None:
+        if not logger.log_filter.allow(level, where, message):
+            return
         try:
             log_entry = create_log(
                 level=level,
@@ -586,7 +590,7 @@ class Utils:
                 request_id=request_id,
                 error=error
             )
-            write_to("C:/Users/Drags Jrs/Drags/Database/log/player_report_log.json", log_entry)
+            log_writer.submit(PLAYER_REPORT_LOG, log_entry)
         except Exception as e:
             print(f"Logging error: {e}")
 
@@ -1317,6 +1321,7 @@ class PlayerReport(QWidget):
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
+    log_writer.install_qt_hook(app)
     player_report = PlayerReport(players_name="Myles Dragone", user_id="admin", source_ip="192.168.1.1")
     player_report.show()
     sys.exit(app.exec_())
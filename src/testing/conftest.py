@@ -0,0 +1,55 @@
+# Shared fixtures for the tests in this folder, run from the repo root with: python -m pytest -q src/testing
+# AccessData keeps its state on the class, every test gets it back to the defaults below and works on
+# its own copy of the data in tmp_path (journals, sidecars, backups and logs all land there too).
+import os
+import shutil
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils import accessing_data, log_writer
+from utils.accessing_data import AccessData
+from testing.helpers import DATA_JSON, load, make_season, write_data
+
+# Class level state AccessData carries between calls
+DEFAULTS = {
+    "data": {}, "cube": None, "tables": None, "dataset": None,
+    "reload_interval": None, "verify_hash": False, "stream_load": False, "snapshot_load": False,
+    "validate_on_load": True, "strict_schema": False, "compact_load": False, "read_only_views": False,
+    "journal_max_bytes": 1024 * 1024, "compact_in_background": False,
+    "_journal": None, "_save_state": None, "_compacting": False,
+    "storage": None, "_storage_revision": None, "_loaded_revision": None,
+    "file_path": "", "_initialized": False, "_checked_at": 0.0
+}
+
+@pytest.fixture(autouse=True)
+def fresh_access_data(tmp_path, monkeypatch):
+    for name, value in DEFAULTS.items():
+        monkeypatch.setattr(AccessData, name, value.copy() if isinstance(value, dict) else value)
+    log_dir = tmp_path / "log"
+    log_dir.mkdir()
+    monkeypatch.setattr(accessing_data, "ACCESS_DATA_LOG", str(log_dir / "accessing_data_log.json"))
+    yield
+    # Nothing left for the writer thread to put in tmp_path once it's gone
+    log_writer.flush(timeout=5)
+
+@pytest.fixture
+def data_file(tmp_path) -> str:
+    # A copy of the repo's Data.json
+    target = tmp_path / "Database" / "Data.json"
+    target.parent.mkdir(exist_ok=True)
+    shutil.copy(DATA_JSON, target)
+    return str(target)
+
+@pytest.fixture
+def season_file(tmp_path) -> str:
+    return write_data(tmp_path / "Database" / "Season.json", make_season())
+
+@pytest.fixture
+def access(data_file) -> AccessData:
+    return load(data_file)
+
+@pytest.fixture
+def season(season_file) -> AccessData:
+    return load(season_file)
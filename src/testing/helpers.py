@@ -0,0 +1,59 @@
+# Data and loading helpers for the tests (conftest.py has the fixtures)
+import json
+import os
+
+from utils.accessing_data import AccessData
+
+DATA_JSON = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "Database", "Data.json")
+TEAM = "Newport Raiders U16 Boys Julie"
+OPPONENT = "Newport Raiders U16 Boys Paul"
+PLAYERS = ["Angus Lee", "Myles Dragone", "Benjamin Berridge", "Harry Wu", "Sam Ortiz"]
+STATS = ["Points", "Fouls", "Rebounds", "Assists", "Turnovers"]
+
+def make_season(games: int = 8, seed: int = 0) -> dict:
+    # A small season shaped like Data.json, with numeric dates (two per month) so the date index orders them
+    data = {}
+    for number in range(1, games + 1):
+        quarters = {}
+        for quarter in range(1, 5):
+            players = PLAYERS[(number + quarter) % 2:]
+            quarters[f"Quarter {quarter}"] = {
+                player: {stat: (seed + number * 7 + quarter * 3 + index * 5 + column) % 6 for column, stat in enumerate(STATS)}
+                for index, player in enumerate(players)
+            }
+        data[f"Game_{number}"] = {
+            "Details": {
+                "Time": "6:05PM", "Day": 1 + (number % 2) * 14, "Month": 8 + (number - 1) // 2, "Year": 2025,
+                "Game_against": OPPONENT
+            },
+            "Lineup": {OPPONENT: ["Someone Else"], TEAM: list(PLAYERS)},
+            "Quarters": quarters
+        }
+    return data
+
+def walk_totals(data: dict, games=None, quarter=None) -> dict:
+    # player -> stat totals the slow way, over games (all of them by default) and one quarter or all
+    totals = {}
+    for game in (data if games is None else games):
+        for quarter_name, quarter_stats in data[game]["Quarters"].items():
+            if quarter is not None and quarter_name != quarter:
+                continue
+            for player, stats in quarter_stats.items():
+                player_totals = totals.setdefault(player, {})
+                for stat, value in stats.items():
+                    player_totals[stat] = player_totals.get(stat, 0) + value
+    return totals
+
+def write_data(path, data: dict) -> str:
+    os.makedirs(os.path.dirname(str(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(data, file, indent=4, ensure_ascii=False)
+    return str(path)
+
+def load(path: str) -> AccessData:
+    # Not AccessData(): it loads src/Database/Data.json first, and returns its ERROR log from __init__ when that isn't there
+    app = AccessData.__new__(AccessData)
+    app.user_id, app.source_ip, app.request_id = "tests", None, "tests"
+    failed = app.initialize(filename=path, force=True)
+    assert failed is None, failed
+    return app
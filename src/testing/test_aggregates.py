@@ -0,0 +1,137 @@
+# The aggregate tables (utils/aggregates.py) against the dict walks, update_game(), and the <Data>.aggregates.json sidecar
+import json
+import os
+
+from utils import aggregates
+from utils.accessing_data import AccessData
+from utils.aggregates import TABLES, AggregateTables, content_hash, sidecar_path
+from testing.helpers import PLAYERS, load, make_season, walk_totals, write_data
+
+QUARTERS = [f"Quarter {number}" for number in range(1, 5)]
+
+def same(result, expected):
+    # Same values and the same key order, i.e. the same JSON
+    assert json.dumps(result) == json.dumps(expected)
+
+def uneven_season() -> dict:
+    # Players with an empty stat line, a quarter a player sits out, and stats listed in another order
+    data = make_season(4)
+    data["Game_2"]["Quarters"]["Quarter 3"]["Harry Wu"] = {}
+    del data["Game_3"]["Quarters"]["Quarter 2"]["Sam Ortiz"]
+    line = data["Game_4"]["Quarters"]["Quarter 1"]["Myles Dragone"]
+    data["Game_4"]["Quarters"]["Quarter 1"]["Myles Dragone"] = dict(reversed(list(line.items())))
+    return data
+
+def check_against_walks(tables: AggregateTables, data: dict):
+    same(tables.team_totals(), walk_totals(data))
+    same(tables.team_by_game(), {game: walk_totals(data, [game]) for game in data})
+    for game in data:
+        same(tables.game_totals(game), walk_totals(data, [game]))
+    for player in PLAYERS:
+        same(tables.season_totals(player), walk_totals(data).get(player, {}))
+        same(tables.season_by_game(player), {
+            game: walk_totals(data, [game])[player] for game in data if walk_totals(data, [game]).get(player)
+        })
+        for quarter in QUARTERS:
+            same(tables.quarter_totals(player, quarter), walk_totals(data, quarter=quarter).get(player, {}))
+            same(tables.quarter_by_game(player, quarter), {
+                game: walk_totals(data, [game], quarter)[player] for game in data if walk_totals(data, [game], quarter).get(player)
+            })
+
+def test_tables_match_the_walks():
+    data = uneven_season()
+    tables = AggregateTables.build(data)
+    check_against_walks(tables, data)
+    # Callers get copies
+    tables.season_totals("Harry Wu")["Points"] = 999
+    tables.game_totals("Game_1")["Harry Wu"]["Points"] = 999
+    check_against_walks(tables, data)
+
+def test_update_game_matches_a_build():
+    data = uneven_season()
+    tables = AggregateTables.build(data, "digest")
+    before = json.dumps({name: getattr(tables, name) for name in TABLES})
+
+    # Numbers only (shifted), a new player in a quarter, a new game, a removed one
+    changed = tables.copy()
+    data["Game_1"]["Quarters"]["Quarter 1"]["Harry Wu"]["Points"] += 10
+    assert changed.update_game(data, "Game_1")
+    check_against_walks(changed, data)
+    data["Game_3"]["Quarters"]["Quarter 2"]["Sam Ortiz"] = {"Points": 3}
+    assert changed.update_game(data, "Game_3")
+    data["Game_5"] = make_season(1, seed=2)["Game_1"]
+    assert changed.update_game(data, "Game_5")
+    del data["Game_2"]
+    assert changed.update_game(data, "Game_2")
+    check_against_walks(changed, data)
+    assert changed.source_hash is None
+
+    # The tables it was copied from are left as they were
+    assert json.dumps({name: getattr(tables, name) for name in TABLES}) == before
+
+def test_data_it_cant_sum():
+    data = make_season(2)
+    data["Game_2"]["Quarters"]["Quarter 1"]["Harry Wu"]["Points"] = "12"
+    assert AggregateTables.build(data) is None
+    tables = AggregateTables.build(make_season(2))
+    assert tables.update_game(data, "Game_2") is False
+
+def sidecar_of(data_file: str) -> dict:
+    with open(sidecar_path(data_file), encoding="utf-8") as file:
+        return json.load(file)
+
+def digest_of(data_file: str) -> str:
+    with open(data_file, "rb") as file:
+        return content_hash(file.read())
+
+def test_sidecar_made_and_reused(season_file, monkeypatch):
+    assert not os.path.exists(sidecar_path(season_file))
+    load(season_file)
+    assert sidecar_of(season_file)["source_hash"] == digest_of(season_file)
+    assert sidecar_of(season_file)["format"] == aggregates.FORMAT
+
+    # Same bytes: read back, nothing built
+    def no_build(*args, **kwargs):
+        raise AssertionError("tables built again")
+    monkeypatch.setattr(AggregateTables, "build", no_build)
+    load(season_file)
+    check_against_walks(AccessData.tables, make_season())
+
+def test_sidecar_for_other_bytes_is_rebuilt(season_file):
+    load(season_file)
+    # A sidecar whose sha256 doesn't match, with tables that don't either
+    payload = sidecar_of(season_file)
+    payload["source_hash"] = "0" * 64
+    payload["season"] = {"Harry Wu": {"Points": 999}}
+    with open(sidecar_path(season_file), "w", encoding="utf-8") as file:
+        json.dump(payload, file)
+    load(season_file)
+    check_against_walks(AccessData.tables, make_season())
+    assert sidecar_of(season_file)["source_hash"] == digest_of(season_file)
+
+    # Another format, or not JSON at all
+    for raw in (json.dumps({**sidecar_of(season_file), "format": aggregates.FORMAT + 1}), "{not json"):
+        with open(sidecar_path(season_file), "w", encoding="utf-8") as file:
+            file.write(raw)
+        assert AggregateTables.load(sidecar_path(season_file), digest_of(season_file)) is None
+        load(season_file)
+        check_against_walks(AccessData.tables, make_season())
+
+def test_stale_sidecar_is_not_reused(season_file):
+    load(season_file)
+    stale = sidecar_of(season_file)
+    changed = make_season(6, seed=3)
+    write_data(season_file, changed)
+    stat = os.stat(season_file)
+    os.utime(season_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    load(season_file)
+    check_against_walks(AccessData.tables, changed)
+    assert sidecar_of(season_file)["source_hash"] == digest_of(season_file) != stale["source_hash"]
+    assert AccessData.get_team_season_stats(sum_total=True) == walk_totals(changed)
+
+def test_save_writes_the_sidecar(season, season_file):
+    assert season.set_stat("Game_1", "Quarter 1", "Harry Wu", "Points", 40) is True
+    assert season.save() is True
+    assert sidecar_of(season_file)["source_hash"] == digest_of(season_file)
+    load(season_file)
+    check_against_walks(AccessData.tables, AccessData.data)
@@ -0,0 +1,91 @@
+# The mapped snapshot of Data.json (utils/binary_snapshot.py): round trip, files it must refuse, and rebuilding when Data.json changes
+import os
+
+import pytest
+
+pytest.importorskip("numpy")
+from utils import binary_snapshot
+from utils.accessing_data import AccessData
+from utils.stat_cube import StatCube
+from testing.helpers import PLAYERS, load, make_season, walk_totals, write_data
+
+def plain(data: dict) -> dict:
+    # The snapshot's games with their Quarters views read back into dicts
+    return {game: {**game_data, "Quarters": game_data["Quarters"].copy()} for game, game_data in data.items()}
+
+def written(tmp_path, data: dict) -> str:
+    path = str(tmp_path / "Season.snapshot.bin")
+    binary_snapshot.write(path, data, StatCube(data), 1, 2, "digest")
+    return path
+
+def test_round_trip(tmp_path):
+    data = make_season(4)
+    data["Game_2"]["Details"]["Venue"] = "Jubilee Stadium, Ōtautahi"
+    loaded, cube, digest = binary_snapshot.load(written(tmp_path, data), 1, 2)
+    assert digest == "digest"
+    assert plain(loaded) == data
+    assert list(loaded) == list(data)
+    assert cube.season_totals(PLAYERS[3]) == walk_totals(data)[PLAYERS[3]]
+    assert not os.path.exists(f"{binary_snapshot.snapshot_path(str(tmp_path / 'Season.json'))}.tmp")
+
+@pytest.mark.parametrize("damage", ["magic", "format", "truncated", "empty"])
+def test_files_it_cant_use_are_ignored(tmp_path, damage):
+    path = written(tmp_path, make_season(2))
+    with open(path, "r+b") as file:
+        magic, version, length = binary_snapshot._PREFIX.unpack(file.read(binary_snapshot._PREFIX.size))
+        file.seek(0)
+        if damage == "magic":
+            file.write(binary_snapshot._PREFIX.pack(b"NOTASNAP", version, length))
+        elif damage == "format":
+            file.write(binary_snapshot._PREFIX.pack(magic, binary_snapshot.FORMAT + 1, length))
+        elif damage == "truncated":
+            file.truncate(binary_snapshot._PREFIX.size + length // 2)
+        else:
+            file.truncate(0)
+    assert binary_snapshot.load(path, 1, 2) is None
+
+def test_made_for_another_file(tmp_path):
+    path = written(tmp_path, make_season(2))
+    assert binary_snapshot.load(path, 1, 2) is not None
+    assert binary_snapshot.load(path, 5, 2) is None
+    assert binary_snapshot.load(path, 1, 3) is None
+
+def test_rebuilt_when_data_json_changes(tmp_path):
+    data_file = write_data(tmp_path / "Season.json", make_season(3))
+    path = binary_snapshot.snapshot_path(data_file)
+    first, _, digest = binary_snapshot.load_or_build(data_file)
+    assert plain(first) == make_season(3)
+    made = os.stat(path).st_mtime_ns
+
+    # Used again while the mtime and size match
+    assert binary_snapshot.load_or_build(data_file)[2] == digest
+    assert os.stat(path).st_mtime_ns == made
+
+    # Only the mtime moved: made again for the new stamp
+    stat = os.stat(data_file)
+    os.utime(data_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    assert binary_snapshot.load(path, os.stat(data_file).st_mtime_ns, stat.st_size) is None
+    assert plain(binary_snapshot.load_or_build(data_file)[0]) == make_season(3)
+    assert binary_snapshot.load(path, os.stat(data_file).st_mtime_ns, stat.st_size) is not None
+
+    # New content (and size): the old snapshot isn't reused
+    write_data(data_file, make_season(5, seed=2))
+    second, _, new_digest = binary_snapshot.load_or_build(data_file)
+    assert new_digest != digest
+    assert plain(second) == make_season(5, seed=2)
+
+def test_snapshot_load_follows_the_file(season_file, monkeypatch):
+    monkeypatch.setattr(AccessData, "snapshot_load", True)
+    load(season_file)
+    assert AccessData.dataset.read_only
+    assert os.path.exists(binary_snapshot.snapshot_path(season_file))
+    assert AccessData.get_season_stats("Harry Wu", sum_total=True) == walk_totals(make_season())["Harry Wu"]
+
+    changed = make_season(3, seed=4)
+    write_data(season_file, changed)
+    stat = os.stat(season_file)
+    os.utime(season_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    load(season_file)
+    assert AccessData.dataset.read_only
+    assert AccessData.get_season_stats("Harry Wu", sum_total=True) == walk_totals(changed)["Harry Wu"]
+    assert AccessData.get_team_season_stats(sum_total=True) == walk_totals(changed)
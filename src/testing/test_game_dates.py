@@ -0,0 +1,79 @@
+# The date index over game Details (utils/game_dates.py) and the getters that use it
+import datetime
+
+import pytest
+
+from utils.accessing_data import AccessData
+from utils.game_dates import GameDates, date_of, minutes_of, window_key
+from testing.helpers import make_season
+
+def dated(year, month, day, time="6:05PM") -> dict:
+    game_data = make_season(1)["Game_1"]
+    game_data["Details"] = {"Time": time, "Day": day, "Month": month, "Year": year}
+    return game_data
+
+def brute_force(data: dict) -> list:
+    # Every dated game, oldest first, ties in data order
+    order = {game: position for position, game in enumerate(data)}
+    return sorted((game for game in data if date_of(data[game]) is not None), key=lambda game: (date_of(data[game]), order[game]))
+
+def test_date_of():
+    assert date_of(dated(2025, "Aug", 14)) == (2025, 8, 14, 18 * 60 + 5)
+    assert date_of(dated(2025, "september", "3", "18:30")) == (2025, 9, 3, 18 * 60 + 30)
+    # Weekday names, a bad month and an unreadable time count as 0
+    assert date_of(dated(2025, "Aug", "Monday")) == (2025, 8, 0, 18 * 60 + 5)
+    assert date_of(dated(2025, 13, 40, "25:00")) == (2025, 0, 0, 0)
+    assert date_of(dated(None, "Aug", 14)) is None
+    assert date_of(dated(True, "Aug", 14)) is None
+    assert date_of({"Quarters": {}}) is None
+    assert [minutes_of(text) for text in ("12AM", "12:30PM", "6pm", "13PM", "7:60")] == [0, 12 * 60 + 30, 18 * 60, 0, 0]
+
+def test_window_key():
+    assert window_key(2025) == (2025, 0, 0, 0)
+    assert window_key(2025, upper=True) == (2025, 13, 32, 24 * 60)
+    assert window_key("2025-08", upper=True) == (2025, 8, 32, 24 * 60)
+    assert window_key((2025, 8, 14)) == window_key("2025-08-14") == window_key(datetime.date(2025, 8, 14))
+    assert window_key("2025-08-14 18:05") == window_key(datetime.datetime(2025, 8, 14, 18, 5)) == (2025, 8, 14, 1085)
+    for value in ("Aug 2025", (2025, True), 2025.0, "2025-8-14x"):
+        with pytest.raises(ValueError):
+            window_key(value)
+
+def test_between_and_last():
+    data = make_season(8)
+    data["Game_9"] = dated(2024, "Dec", 31)
+    data["Game_10"] = dated(None, "Aug", 1)
+    dates = GameDates(data)
+    assert dates.between() == brute_force(data)
+    assert dates.between() == ["Game_9", "Game_2", "Game_1", "Game_4", "Game_3", "Game_6", "Game_5", "Game_8", "Game_7"]
+    assert dates.between("2025-08", "2025-09") == ["Game_2", "Game_1", "Game_4", "Game_3"]
+    assert dates.between("2025-08", "2025-09", data_order=True) == ["Game_1", "Game_2", "Game_3", "Game_4"]
+    assert dates.between(end=2024) == ["Game_9"]
+    assert dates.last(3) == ["Game_5", "Game_8", "Game_7"]
+    assert dates.last(2, end="2025-08") == ["Game_2", "Game_1"]
+    assert dates.undated == ["Game_10"] and len(dates) == 9
+
+def test_same_date_keeps_data_order(access):
+    # Data.json: weekday names in Day, so every game is 2025-08 at 6:05PM
+    assert AccessData.get_games_between(2025) == list(AccessData.data)
+    assert AccessData.get_last_games(2) == list(AccessData.data)[-2:]
+
+def test_index_follows_changes(season):
+    before = AccessData.dataset.dates
+    kept = before.between()
+    assert season.set_stat("Game_1", "Quarter 1", "Harry Wu", "Points", 40) is True
+    assert season.set_game("Game_3", {**AccessData.data["Game_3"], "Details": dated(2024, 1, 1)["Details"]}) is True
+    assert season.set_game("Game_9", dated(2025, 8, 15, "7PM")) is True
+    assert season.set_game("Game_10", dated(None, 1, 1)) is True
+    assert season.delete_game("Game_8") is True
+    assert season.set_game("Game_4", {**AccessData.data["Game_4"], "Details": {}}) is True
+    assert season.set_game("Game_10", dated(2025, 8, 15, "6:05PM")) is True
+
+    data = AccessData.data
+    dates = AccessData.dataset.dates
+    assert dates.between() == brute_force(data) == GameDates(data).between()
+    assert dates.undated == ["Game_4"]
+    assert AccessData.get_games_between("2025-08-15", "2025-08-15") == ["Game_1", "Game_10", "Game_9"]
+    assert AccessData.get_last_games(1) == brute_force(data)[-1:]
+    assert AccessData.get_games_between(end=2024) == ["Game_3"]
+    # The previous dataset's index is as it was
+    assert before.between() == kept and before.undated == []
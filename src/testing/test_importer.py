@@ -0,0 +1,136 @@
+# Box score CSV imports (utils/importer.py and AccessData.import_box_scores)
+import copy
+import json
+
+from utils import importer, interning
+from utils.accessing_data import AccessData
+from utils.aggregates import AggregateTables
+from utils.player_index import PlayerIndex
+from testing.helpers import TEAM, make_season, walk_totals
+
+HEADER = "game,quarter,player,team,Points,Fouls,Rebounds,Assists,Turnovers\n"
+
+def csv_file(tmp_path, name: str, text: str) -> str:
+    path = tmp_path / name
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+def test_read(tmp_path):
+    path = csv_file(tmp_path, "box.csv", "﻿" + HEADER.upper().replace("POINTS", "Points") +
+                    "Game_9,Quarter 1,Angus Lee,Team A,4,1,2,0,1\n"
+                    "\n"
+                    "Game_9, Quarter 1 ,Harry Wu,,2.5,,0,0,0\n"
+                    "Game_1,Quarter 2,Angus Lee,Team A,7,0,0,0,0\n")
+    batch = importer.read([path])
+    assert batch.problems == []
+    assert (batch.files, batch.rows, batch.lines()) == (1, 3, 3)
+    assert batch.games == {
+        "Game_9": {"Quarter 1": {"Angus Lee": {"Points": 4, "FOULS": 1, "REBOUNDS": 2, "ASSISTS": 0, "TURNOVERS": 1},
+                                 "Harry Wu": {"Points": 2.5, "REBOUNDS": 0, "ASSISTS": 0, "TURNOVERS": 0}}},
+        "Game_1": {"Quarter 2": {"Angus Lee": {"Points": 7, "FOULS": 0, "REBOUNDS": 0, "ASSISTS": 0, "TURNOVERS": 0}}}
+    }
+    assert batch.lineups == {"Game_9": {"Team A": ["Angus Lee"]}, "Game_1": {"Team A": ["Angus Lee"]}}
+
+def test_every_problem_is_collected(tmp_path):
+    good = csv_file(tmp_path, "good.csv", HEADER + "Game_9,Quarter 1,Angus Lee,,4,1,2,0,1\n")
+    bad = csv_file(tmp_path, "bad.csv", HEADER +
+                   "Game_9,Quarter 1,Harry Wu,,4,1,2,0\n"
+                   "Game_9,Quarter 1,Harry Wu,,four,1,2,0,1\n"
+                   ",Quarter 1,Harry Wu,,4,1,2,0,1\n"
+                   "Game_9,Quarter 1,Angus Lee,,4,1,2,0,1\n"
+                   "Game_9,Quarter 2,Sam Ortiz,,nan,1,2,0,1\n")
+    no_keys = csv_file(tmp_path, "no keys.csv", "game,player,Points\nGame_9,Angus Lee,3\n")
+    no_stats = csv_file(tmp_path, "no stats.csv", "game,quarter,player\n")
+    twice = csv_file(tmp_path, "twice.csv", "game,quarter,player,Points,Points\n")
+    empty = csv_file(tmp_path, "empty.csv", "")
+    batch = importer.read([good, bad, no_keys, no_stats, twice, empty, str(tmp_path / "missing.csv")])
+    assert [str(problem) for problem in batch.problems[:-1]] == [
+        "bad.csv:2: expected 9 cells, got 8",
+        "bad.csv:3: Points must be a number, got 'four'",
+        "bad.csv:4: game, quarter and player can't be empty",
+        "bad.csv:5: Game_9 / Quarter 1 / Angus Lee is already in good.csv:2",
+        "bad.csv:6: Points must be a number, got 'nan'",
+        "no keys.csv:1: missing column(s): quarter",
+        "no stats.csv:1: no stat columns",
+        "twice.csv:1: duplicate column(s): Points",
+        "empty.csv:1: the file is empty"
+    ]
+    assert str(batch.problems[-1]).startswith("missing.csv:0: FileNotFoundError")
+
+def test_merge_leaves_the_data_alone():
+    data = make_season(2)
+    interning.compact(data)
+    before = json.dumps(data, default=interning.json_default)
+    batch = importer.Batch()
+    batch.games = {
+        "Game_1": {"Quarter 1": {"Harry Wu": {"Points": 30}, "New Kid": {"Points": 1}}, "Overtime": {"Harry Wu": {"Points": 2}}},
+        "Game_9": {"Quarter 1": {"Angus Lee": {"Points": 4}}}
+    }
+    batch.lineups = {"Game_1": {TEAM: ["Harry Wu", "New Kid"]}, "Game_9": {TEAM: ["Angus Lee"]}}
+    merged = importer.merge(data, batch)
+    assert json.dumps(data, default=interning.json_default) == before
+
+    game = merged["Game_1"]
+    old_line = data["Game_1"]["Quarters"]["Quarter 1"]["Harry Wu"]
+    # A row sets the stats it has, the rest of the line stays
+    assert game["Quarters"]["Quarter 1"]["Harry Wu"] == {**old_line, "Points": 30}
+    assert type(game["Quarters"]["Quarter 1"]) is dict and type(game["Quarters"]["Quarter 1"]["Sam Ortiz"]) is dict
+    assert game["Quarters"]["Quarter 1"]["New Kid"] == {"Points": 1}
+    assert game["Quarters"]["Overtime"] == {"Harry Wu": {"Points": 2}}
+    # Quarters the batch doesn't touch are shared
+    assert game["Quarters"]["Quarter 2"] is data["Game_1"]["Quarters"]["Quarter 2"]
+    assert game["Lineup"][TEAM][-1] == "New Kid" and game["Lineup"][TEAM].count("Harry Wu") == 1
+    assert game["Details"] is data["Game_1"]["Details"]
+    assert merged["Game_9"] == {"Quarters": {"Quarter 1": {"Angus Lee": {"Points": 4}}}, "Lineup": {TEAM: ["Angus Lee"]}}
+
+def test_import_box_scores(season, season_file, tmp_path):
+    snapshot = AccessData.snapshot()
+    before = copy.deepcopy(snapshot.data)
+    path = csv_file(tmp_path, "box.csv", HEADER +
+                    f"Game_2,Quarter 1,Harry Wu,{TEAM},30,0,0,0,0\n"
+                    f"Game_9,Quarter 1,New Kid,{TEAM},5,1,1,1,1\n")
+    result = season.import_box_scores(path)
+    assert (result["files"], result["rows"], result["games"], result["stat_lines"]) == (1, 2, 2, 2)
+    assert result["rows_per_sec"] > 0
+
+    # Saved, and published as a new dataset: the snapshot taken before still has the old games
+    assert snapshot.data == before
+    current = AccessData.snapshot()
+    assert current.version > snapshot.version
+    with open(season_file, encoding="utf-8") as file:
+        assert json.load(file) == current.data
+    assert current.data["Game_2"]["Quarters"]["Quarter 1"]["Harry Wu"]["Points"] == 30
+    assert "New Kid" in current.data["Game_9"]["Lineup"][TEAM]
+    assert json.dumps(vars(current.tables), sort_keys=True, default=str) == json.dumps(vars(AggregateTables.build(current.data, current.tables.source_hash)), sort_keys=True, default=str)
+    assert dict(current.players.games("New Kid")) == dict(PlayerIndex(current.data).games("New Kid"))
+    assert AccessData.get_season_stats("Harry Wu", sum_total=True) == walk_totals(current.data)["Harry Wu"]
+
+def test_nothing_changes_when_a_row_is_bad(season, season_file, tmp_path):
+    with open(season_file, "rb") as file:
+        raw = file.read()
+    before = copy.deepcopy(AccessData.data)
+    version = AccessData.data_version
+    good = csv_file(tmp_path, "good.csv", HEADER + "Game_2,Quarter 1,Harry Wu,,30,0,0,0,0\n")
+    bad = csv_file(tmp_path, "bad.csv", HEADER + "Game_9,Quarter 1,New Kid,,5,x,1,1,1\n")
+    result = season.import_box_scores([good, bad])
+    assert result["log_level"] == "ERROR"
+    assert result["error"]["problems"] == ["bad.csv:2: Fouls must be a number, got 'x'"]
+    assert AccessData.data == before and AccessData.data_version == version
+    with open(season_file, "rb") as file:
+        assert file.read() == raw
+
+def test_failed_save_leaves_the_data_alone(season, season_file, tmp_path, monkeypatch):
+    before = copy.deepcopy(AccessData.data)
+    dataset = AccessData.dataset
+
+    def fail(*args, **kwargs):
+        raise OSError("disk full")
+    with monkeypatch.context() as patch:
+        patch.setattr(AccessData, "_save_file", staticmethod(fail))
+        result = season.import_box_scores(csv_file(tmp_path, "box.csv", HEADER + "Game_2,Quarter 1,Harry Wu,,30,0,0,0,0\n"))
+    assert result["error"] == {"type": "OSError", "message": "disk full"}
+    assert AccessData.dataset is dataset and AccessData.data == before
+    # Saving afterwards writes the loaded data, not the import that failed
+    assert season.save() is True
+    with open(season_file, encoding="utf-8") as file:
+        assert json.load(file) == before
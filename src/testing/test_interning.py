@@ -0,0 +1,134 @@
+# Compact quarters (utils/interning.py) behave like the dicts they replace
+import copy
+import json
+
+import pytest
+
+from utils import interning
+from utils.accessing_data import AccessData
+from utils.interning import CompactQuarter, Interner, StatLine
+from testing.helpers import PLAYERS, STATS, load, make_season, walk_totals
+
+def packed_season(games: int = 4) -> tuple:
+    data = make_season(games)
+    plain = copy.deepcopy(data)
+    interning.compact(data)
+    return data, plain
+
+def wide_quarter(rows: int) -> CompactQuarter:
+    return CompactQuarter.pack(Interner(), {f"Player {row}": {"Points": row, "Fouls": row % 5} for row in range(rows)})
+
+def test_reads_match_the_dicts():
+    data, plain = packed_season()
+    for game, game_data in data.items():
+        for quarter, quarter_stats in game_data["Quarters"].items():
+            expected = plain[game]["Quarters"][quarter]
+            assert isinstance(quarter_stats, CompactQuarter)
+            assert list(quarter_stats) == list(expected) and len(quarter_stats) == len(expected)
+            assert quarter_stats == expected and quarter_stats.copy() == expected
+            assert type(quarter_stats.copy()[next(iter(expected))]) is dict
+            for player, stats in quarter_stats.items():
+                assert isinstance(stats, StatLine)
+                assert list(stats.items()) == list(expected[player].items())
+                assert quarter_stats[player]["Points"] == expected[player]["Points"]
+            assert "Nobody" not in quarter_stats
+            with pytest.raises(KeyError):
+                quarter_stats["Nobody"]
+            with pytest.raises(KeyError):
+                quarter_stats[PLAYERS[-1]]["Steals"]
+    assert json.dumps(data, indent=4, default=interning.json_default) == json.dumps(plain, indent=4)
+
+def test_writes_stay_packed():
+    data, plain = packed_season(2)
+    quarter_stats = data["Game_1"]["Quarters"]["Quarter 1"]
+    expected = plain["Game_1"]["Quarters"]["Quarter 1"]
+    quarter_stats["Harry Wu"]["Points"] = 30
+    quarter_stats["New Kid"] = dict.fromkeys(STATS, 1)
+    expected["Harry Wu"]["Points"] = 30
+    expected["New Kid"] = dict.fromkeys(STATS, 1)
+    del quarter_stats[PLAYERS[-1]]
+    del expected[PLAYERS[-1]]
+    assert quarter_stats._dicts is None
+    assert quarter_stats == expected and list(quarter_stats) == list(expected)
+
+def test_stat_line_follows_its_row():
+    data, plain = packed_season(2)
+    quarter_stats = data["Game_1"]["Quarters"]["Quarter 1"]
+    last = quarter_stats["Sam Ortiz"]
+    first = next(iter(quarter_stats))
+    del quarter_stats[first]
+    # Its row moved up one
+    assert last == plain["Game_1"]["Quarters"]["Quarter 1"]["Sam Ortiz"]
+    last["Fouls"] = 4
+    assert quarter_stats["Sam Ortiz"]["Fouls"] == 4
+    removed = quarter_stats["Harry Wu"]
+    del quarter_stats["Harry Wu"]
+    with pytest.raises(KeyError):
+        removed["Points"]
+
+@pytest.mark.parametrize("rows", [3, interning.INDEX_ROWS + 1, 200])
+def test_lookups_in_wide_quarters(rows):
+    quarter_stats = wide_quarter(rows)
+    expected = quarter_stats.copy()
+    assert all(quarter_stats[player]["Points"] == stats["Points"] for player, stats in expected.items())
+    assert (quarter_stats._rows is not None) == (rows > interning.INDEX_ROWS)
+    quarter_stats["Late Arrival"] = {"Points": 1, "Fouls": 0}
+    del quarter_stats["Player 1"]
+    assert quarter_stats["Late Arrival"]["Points"] == 1
+    assert quarter_stats[f"Player {rows - 1}"]["Points"] == rows - 1
+    assert "Player 1" not in quarter_stats
+    assert len(quarter_stats) == rows
+
+def test_what_rows_cant_hold_goes_back_to_dicts():
+    data, plain = packed_season(2)
+    quarters = data["Game_2"]["Quarters"]
+    quarters["Quarter 1"]["Harry Wu"]["Minutes"] = 7.5
+    quarters["Quarter 2"]["Harry Wu"] = {"Points": 2.5}
+    quarters["Quarter 3"]["Harry Wu"]["Points"] = 2 ** 40
+    del quarters["Quarter 4"]["Harry Wu"]["Fouls"]
+    expected = plain["Game_2"]["Quarters"]
+    expected["Quarter 1"]["Harry Wu"]["Minutes"] = 7.5
+    expected["Quarter 2"]["Harry Wu"] = {"Points": 2.5}
+    expected["Quarter 3"]["Harry Wu"]["Points"] = 2 ** 40
+    del expected["Quarter 4"]["Harry Wu"]["Fouls"]
+    for quarter, quarter_stats in quarters.items():
+        assert quarter_stats._dicts is not None
+        assert quarter_stats == expected[quarter]
+        assert json.dumps(quarter_stats, default=interning.json_default) == json.dumps(expected[quarter])
+
+def test_quarters_that_dont_fit_stay_dicts():
+    data = make_season(1)
+    quarters = data["Game_1"]["Quarters"]
+    quarters["Quarter 1"]["Harry Wu"] = {"Fouls": 1, "Points": 2, "Rebounds": 0, "Assists": 0, "Turnovers": 0}
+    quarters["Quarter 2"]["Harry Wu"]["Points"] = True
+    quarters["Quarter 3"]["Harry Wu"]["Points"] = 2.0
+    interning.compact(data)
+    assert [type(quarter_stats) for quarter_stats in quarters.values()] == [dict, dict, dict, CompactQuarter]
+
+def test_compact_load_answers_like_dicts(season_file):
+    load(season_file)
+    expected = [AccessData.get_season_stats(player, sum_total=True) for player in PLAYERS]
+    AccessData.compact_load = True
+    app = load(season_file)
+    assert isinstance(AccessData.data["Game_1"]["Quarters"]["Quarter 1"], CompactQuarter)
+    assert [AccessData.get_season_stats(player, sum_total=True) for player in PLAYERS] == expected
+    # Nothing keeps a copy of each line next to the rows
+    assert AccessData.dataset.tables is None and AccessData.dataset.cube is None
+    assert app.set_stat("Game_1", "Quarter 1", "Harry Wu", "Points", 30) is True
+    assert app.save() is True
+    with open(season_file, encoding="utf-8") as file:
+        assert json.load(file)["Game_1"]["Quarters"]["Quarter 1"]["Harry Wu"]["Points"] == 30
+    assert AccessData.dataset.tables is None and AccessData.dataset.cube is None
+    assert AccessData.get_season_stats("Harry Wu", sum_total=True) == walk_totals(AccessData.data)["Harry Wu"]
+
+def test_memory():
+    # Six players a quarter like the 2000-game test season, where the docs have it ~3x smaller
+    data = make_season(200)
+    for game_data in data.values():
+        for quarter_stats in game_data["Quarters"].values():
+            for player in PLAYERS + ["Extra Player"]:
+                quarter_stats.setdefault(player, dict.fromkeys(STATS, 2))
+    result = interning.measure(json.dumps(data).encode("utf-8"))
+    assert result["packed"] == result["quarters"] == 800
+    assert result["ratio"] >= 2.5
+    assert result["compact_bytes"] / result["lines"] < 100
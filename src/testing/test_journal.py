@@ -0,0 +1,192 @@
+# The change journal (utils/journal.py) and the set_* methods that write to it
+import copy
+import json
+import os
+import threading
+
+from utils import accessing_data, journal
+from utils.accessing_data import AccessData
+from utils.aggregates import TABLES, AggregateTables, content_hash
+from utils.game_dates import GameDates
+from utils.player_index import PlayerIndex
+from utils.query_cache import query_cache
+from testing.helpers import PLAYERS, load, make_season, walk_totals
+
+def tables_json(tables: AggregateTables) -> str:
+    return json.dumps({name: getattr(tables, name) for name in TABLES}, sort_keys=True)
+
+def dates_of(dates: GameDates) -> list:
+    return [(dates.date(game), game) for game in dates._by_game] + [("undated", game) for game in dates.undated]
+
+def players_of(index: PlayerIndex) -> dict:
+    return {player: dict(index.games(player)) for player in sorted(index.cells)}
+
+def test_applied_leaves_data_alone():
+    data = make_season(3)
+    before = copy.deepcopy(data)
+    entries = [
+        {"op": "set_stat", "game": "Game_1", "quarter": "Quarter 1", "player": "Harry Wu", "stat": "Points", "value": 40},
+        {"op": "set_player", "game": "Game_2", "quarter": "Quarter 2", "player": "New Kid", "value": {"Points": 1}},
+        {"op": "set_quarter", "game": "Game_3", "quarter": "Overtime", "value": {}},
+        {"op": "set_game", "game": "Game_4", "value": make_season(1)["Game_1"]},
+        {"op": "delete_game", "game": "Game_2"}
+    ]
+    for entry in entries:
+        new = journal.applied(data, entry)
+        assert data == before
+        changed = copy.deepcopy(before)
+        journal.apply(changed, entry)
+        assert new == changed
+        # Games the entry doesn't touch are shared, not copied
+        assert all(new[game] is data[game] for game in new if game in data and game != entry["game"])
+
+def test_snapshot_keeps_what_it_saw(season):
+    snapshot = AccessData.snapshot()
+    data = copy.deepcopy(snapshot.data)
+    tables = tables_json(snapshot.tables)
+    dates, players = dates_of(snapshot.dates), players_of(snapshot.players)
+
+    assert season.set_stat("Game_2", "Quarter 1", "Harry Wu", "Points", 40) is True
+    assert season.set_player_stats("Game_3", "Quarter 2", "New Kid", {"Points": 3}) is True
+    assert season.set_game("Game_1", {**data["Game_1"], "Details": {**data["Game_1"]["Details"], "Day": 28}}) is True
+    assert season.delete_game("Game_4") is True
+
+    assert snapshot.data == data
+    assert tables_json(snapshot.tables) == tables
+    assert dates_of(snapshot.dates) == dates
+    assert players_of(snapshot.players) == players
+
+    # The new dataset has every change, its tables and indexes agree with ones built from scratch
+    current = AccessData.snapshot()
+    assert current.version > snapshot.version
+    assert current.data["Game_2"]["Quarters"]["Quarter 1"]["Harry Wu"]["Points"] == 40
+    assert "Game_4" not in current.data
+    assert tables_json(current.tables) == tables_json(AggregateTables.build(current.data))
+    assert players_of(current.players) == players_of(PlayerIndex(current.data))
+    assert sorted(dates_of(current.dates)) == sorted(dates_of(GameDates(current.data)))
+    assert AccessData.get_season_stats("Harry Wu", sum_total=True) != snapshot.tables.season["Harry Wu"]
+    assert "New Kid" in current.players.cells and "New Kid" not in snapshot.players.cells
+    assert PLAYERS[0] in current.players.cells
+
+def journal_lines(path: str) -> list:
+    with open(journal.journal_path(path), encoding="utf-8") as file:
+        return [json.loads(line) for line in file]
+
+def test_changes_are_replayed_on_load(season, season_file):
+    assert season.set_stat("Game_1", "Quarter 1", "Harry Wu", "Points", 40) is True
+    assert season.set_quarter_stats("Game_2", "Overtime", {"Harry Wu": {"Points": 2}}) is True
+    assert season.delete_game("Game_3") is True
+    expected = copy.deepcopy(AccessData.data)
+    header, *entries = journal_lines(season_file)
+    assert header == {"format": journal.FORMAT, "base": AccessData.dataset.stamp.digest}
+    assert [entry["op"] for entry in entries] == ["set_stat", "set_quarter", "delete_game"]
+
+    load(season_file)
+    assert AccessData.data == expected
+    assert AccessData.get_season_stats("Harry Wu", sum_total=True) == walk_totals(expected)["Harry Wu"]
+
+def test_torn_last_line_is_skipped(season, season_file):
+    assert season.set_stat("Game_1", "Quarter 1", "Harry Wu", "Points", 40) is True
+    with open(journal.journal_path(season_file), "a", encoding="utf-8") as file:
+        file.write('{"op": "set_stat", "game": "Game_1", "quarter": "Quar')
+    load(season_file)
+    assert AccessData.data["Game_1"]["Quarters"]["Quarter 1"]["Harry Wu"]["Points"] == 40
+
+    # The next change starts on a line of its own
+    assert season.set_stat("Game_1", "Quarter 1", "Harry Wu", "Fouls", 5) is True
+    load(season_file)
+    assert AccessData.data["Game_1"]["Quarters"]["Quarter 1"]["Harry Wu"]["Fouls"] == 5
+
+def test_journal_for_another_base_is_ignored(season, season_file):
+    expected = copy.deepcopy(AccessData.data)
+    entry = {"op": "set_stat", "game": "Game_1", "quarter": "Quarter 1", "player": "Harry Wu", "stat": "Points", "value": 40}
+    with open(journal.journal_path(season_file), "w", encoding="utf-8") as file:
+        file.write(json.dumps({"format": journal.FORMAT, "base": "not this file"}) + "\n" + json.dumps(entry) + "\n")
+    load(season_file)
+    assert AccessData.data == expected
+
+def test_save_folds_the_journal_in(season, season_file):
+    assert season.set_stat("Game_1", "Quarter 1", "Harry Wu", "Points", 40) is True
+    assert season.save() is True
+    assert journal_lines(season_file) == [{"format": journal.FORMAT, "base": AccessData.dataset.stamp.digest}]
+    with open(season_file, encoding="utf-8") as file:
+        assert json.load(file) == AccessData.data
+
+def test_compaction(season, season_file):
+    for value in range(3):
+        assert season.set_stat("Game_2", "Quarter 2", "Harry Wu", "Points", value) is True
+    assert season.set_game("Game_9", make_season(1)["Game_1"]) is True
+    expected = copy.deepcopy(AccessData.data)
+    assert season.compact_journal() is True
+
+    with open(season_file, "rb") as file:
+        raw = file.read()
+    assert json.loads(raw) == expected
+    # Byte for byte what save() would have written
+    assert raw == json.dumps(expected, indent=4, ensure_ascii=False).encode("utf-8")
+    assert journal_lines(season_file) == [{"format": journal.FORMAT, "base": AccessData.dataset.stamp.digest}]
+    assert season.compact_journal() is False
+    load(season_file)
+    assert AccessData.data == expected
+
+def test_interrupted_compaction_uses_next(season, season_file):
+    assert season.set_stat("Game_1", "Quarter 1", "Harry Wu", "Points", 40) is True
+    data_journal = AccessData._journal
+    raw = json.dumps(AccessData.data, indent=4, ensure_ascii=False).encode("utf-8")
+    # Died after Data.json was replaced, before the journal was: only .next matches the new file
+    entry = {"op": "set_stat", "game": "Game_1", "quarter": "Quarter 1", "player": "Harry Wu", "stat": "Fouls", "value": 5}
+    with open(data_journal.next_path, "w", encoding="utf-8") as file:
+        file.write(json.dumps({"format": journal.FORMAT, "base": content_hash(raw)}) + "\n" + json.dumps(entry) + "\n")
+    with open(season_file, "wb") as file:
+        file.write(raw)
+    load(season_file)
+    stats = AccessData.data["Game_1"]["Quarters"]["Quarter 1"]["Harry Wu"]
+    assert (stats["Points"], stats["Fouls"]) == (40, 5)
+    assert not os.path.exists(data_journal.next_path)
+
+def test_save_during_compaction_wins(season, season_file, monkeypatch):
+    # A compaction that finishes after a save() must not put its older dump over the saved file
+    assert season.set_stat("Game_1", "Quarter 1", "Harry Wu", "Points", 10) is True
+    written, carry_on = threading.Event(), threading.Event()
+    write_snapshot = journal.Journal.write_snapshot
+
+    def slow_write(self, data_file, raw):
+        temp_path = write_snapshot(self, data_file, raw)
+        written.set()
+        carry_on.wait(5)
+        return temp_path
+
+    monkeypatch.setattr(journal.Journal, "write_snapshot", slow_write)
+    assert season.compact_journal(background=True) is True
+    compaction = next(thread for thread in threading.enumerate() if thread.name == "journal-compaction")
+    assert written.wait(5)
+    assert season.set_stat("Game_1", "Quarter 1", "Harry Wu", "Points", 20) is True
+    assert season.save() is True
+    carry_on.set()
+    compaction.join(5)
+
+    with open(season_file, encoding="utf-8") as file:
+        assert json.load(file)["Game_1"]["Quarters"]["Quarter 1"]["Harry Wu"]["Points"] == 20
+    assert journal_lines(season_file) == [{"format": journal.FORMAT, "base": AccessData.dataset.stamp.digest}]
+    assert not os.path.exists(season_file + ".compact")
+    load(season_file)
+    assert AccessData.data["Game_1"]["Quarters"]["Quarter 1"]["Harry Wu"]["Points"] == 20
+
+def test_getters_read_one_dataset(season, monkeypatch):
+    # A reader that sees data, tables and cube from a reload half way through _publish() still answers from one dataset
+    query_cache.clear()
+    expected = {
+        "season": AccessData.get_season_stats("Harry Wu", sum_total=True),
+        "team": AccessData.get_team_season_stats(sum_total=True),
+        "quarter": AccessData.get_quarter_season_stats("Harry Wu", "Quarter 1", sum_total=True),
+        "game": AccessData.get_game_stats("Game_1", "Harry Wu"),
+    }
+    other = make_season(3, seed=5)
+    monkeypatch.setattr(AccessData, "data", other)
+    monkeypatch.setattr(AccessData, "tables", AggregateTables.build(other))
+    monkeypatch.setattr(AccessData, "cube", accessing_data.StatCube.build(other))
+    query_cache.clear()
+    assert AccessData.get_season_stats("Harry Wu", sum_total=True) == expected["season"]
+    assert AccessData.get_team_season_stats(sum_total=True) == expected["team"]
+    assert AccessData.get_quarter_season_stats("Harry Wu", "Quarter 1", sum_total=True) == expected["quarter"]
+    assert AccessData.get_game_stats("Game_1", "Harry Wu") == expected["game"]
@@ -0,0 +1,127 @@
+# Querying the logs (utils/log_query.py): filters, the sidecar index, and the index following appends and rotation
+import json
+import os
+import sqlite3
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from utils import log_query, write
+
+START = datetime(2025, 12, 8, 5, 0, tzinfo=timezone.utc)
+WHERE = ["get_details", "get_lineup", "get_season_stats"]
+
+def entry(number: int) -> dict:
+    # One log entry a minute, three entries per request
+    return {
+        "timestamp": (START + timedelta(minutes=number)).isoformat(),
+        "log_level": "ERROR" if number % 7 == 0 else "INFO",
+        "message": f"entry {number}",
+        "where": WHERE[number % 3],
+        "user_id": f"user-{number % 2}",
+        "request_id": f"request-{number // 3}"
+    }
+
+def numbers(entries) -> list:
+    return [int(found["message"].split()[1]) for found in entries]
+
+@pytest.fixture
+def log(tmp_path) -> str:
+    # 40 entries over four closed segments (gzipped) and the active file
+    path = str(tmp_path / "accessing_data_log.json")
+    write.set_rotation(path, max_bytes=0, backup_count=0)
+    for first in range(0, 40, 10):
+        write.write_many(path, [entry(number) for number in range(first, first + 10)])
+        if first < 30:
+            write.rotate(path)
+    return path
+
+def indexed_rows(path: str) -> int:
+    connection = sqlite3.connect(f"{path}.idx")
+    try:
+        return connection.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+    finally:
+        connection.close()
+
+def both_ways(path: str, **filters) -> list:
+    # The indexed answer, checked against a full scan
+    found = numbers(log_query.query(path, **filters))
+    assert found == numbers(log_query.query(path, use_index=False, **filters))
+    return found
+
+def test_filters(log):
+    assert both_ways(log) == list(range(40))
+    assert both_ways(log, request_id="request-4") == [12, 13, 14]
+    assert both_ways(log, request_id="request-4", where=["get_details"]) == [12]
+    assert both_ways(log, log_level=["ERROR"]) == [0, 7, 14, 21, 28, 35]
+    assert both_ways(log, where=["get_lineup", "get_details"], user_id="user-1") == [1, 3, 7, 9, 13, 15, 19, 21, 25, 27, 31, 33, 37, 39]
+    assert both_ways(log, request_id="no such request") == []
+
+def test_time_range(log):
+    # Across a segment boundary, bounds included; dates without an offset are UTC
+    assert both_ways(log, since="2025-12-08T05:08", until="2025-12-08T05:12") == [8, 9, 10, 11, 12]
+    assert both_ways(log, since="2025-12-08T05:35") == [35, 36, 37, 38, 39]
+    assert both_ways(log, until="2025-12-08T05:02") == [0, 1, 2]
+    assert both_ways(log, since="2025-12-08T07:08+02:00", until="2025-12-08T07:09+02:00", log_level=["INFO"]) == [8, 9]
+    assert both_ways(log, since="2025-12-09") == []
+
+def test_index_only_reads_what_is_new(log):
+    index = log_query.LogIndex(log)
+    try:
+        assert index.update() == 40
+        assert index.update() == 0
+        write.write_many(log, [entry(40), entry(41)])
+        assert index.update() == 2
+
+        # A line still being written is left for next time
+        with open(log, "a", encoding="utf-8") as file:
+            file.write(json.dumps(entry(42))[:20])
+        assert index.update() == 0
+        with open(log, "a", encoding="utf-8") as file:
+            file.write(json.dumps(entry(42))[20:] + "\n")
+        assert index.update() == 1
+    finally:
+        index.close()
+    assert indexed_rows(log) == 43
+    assert both_ways(log, request_id="request-14") == [42]
+
+def test_index_follows_rotation(log):
+    assert both_ways(log, request_id="request-11") == [33, 34, 35]
+    # The active file closes as a segment and a new, longer one starts under the same name:
+    # the offsets indexed for the old one are dropped even though the file only grew
+    write.rotate(log)
+    write.write_many(log, [entry(number) for number in range(40, 55)])
+    assert both_ways(log, request_id="request-11") == [33, 34, 35]
+    assert both_ways(log, request_id="request-13") == [39, 40, 41]
+    assert both_ways(log, since="2025-12-08T05:38", until="2025-12-08T05:41") == [38, 39, 40, 41]
+    assert indexed_rows(log) == 55
+
+    # Segments removed by backup_count are forgotten
+    write.set_rotation(log, backup_count=2)
+    write.rotate(log)
+    assert both_ways(log) == list(range(30, 55))
+    assert both_ways(log, request_id="request-2") == []
+    assert indexed_rows(log) == 25
+
+def test_legacy_log_is_migrated_first(tmp_path):
+    path = tmp_path / "player_report_log.json"
+    path.write_text(json.dumps([entry(number) for number in range(6)], indent=2), encoding="utf-8")
+    assert numbers(log_query.query(str(path), request_id="request-1")) == [3, 4, 5]
+    assert not write.is_legacy(str(path))
+
+def test_command_line(log, capsys):
+    assert log_query.main([log, "--request-id", "request-4", "--level", "INFO"]) == 0
+    assert numbers(json.loads(line) for line in capsys.readouterr().out.splitlines()) == [12, 13]
+    assert log_query.main([log, "--since", "2025-12-08", "--limit", "3"]) == 0
+    assert numbers(json.loads(line) for line in capsys.readouterr().out.splitlines()) == [0, 1, 2]
+    assert log_query.main([log, "--where", "get_details", "--where", "get_lineup", "--count", "--no-index"]) == 0
+    assert capsys.readouterr().out.strip() == "27"
+
+    # --reindex throws the sidecar away first
+    connection = sqlite3.connect(f"{log}.idx")
+    connection.execute("DELETE FROM entries")
+    connection.commit()
+    connection.close()
+    assert log_query.main([log, "--request-id", "request-4", "--count", "--reindex"]) == 0
+    assert capsys.readouterr().out.strip() == "3"
+    assert os.path.exists(f"{log}.idx")
@@ -0,0 +1,63 @@
+# The background log writer (utils/log_writer.py): batching, overflow policies and shutdown
+import threading
+
+from utils import write
+from utils.log_writer import LogWriter
+
+def entries(path) -> list:
+    return [entry["n"] for entry in write.read_all(str(path))]
+
+def test_batches_reach_the_file(tmp_path):
+    log = tmp_path / "log.json"
+    writer = LogWriter(batch_size=7, flush_interval=0.05)
+    for number in range(50):
+        writer.submit(str(log), {"log_level": "INFO", "n": number})
+    assert writer.flush(timeout=5)
+    assert entries(log) == list(range(50))
+    writer.shutdown()
+
+def test_drop_info_drops_info_when_full(tmp_path):
+    log = tmp_path / "log.json"
+    writer = LogWriter(max_queue=1, overflow="drop_info")
+    # No worker to empty the queue: the first entry fills it
+    writer.start = lambda: None
+    writer.submit(str(log), {"log_level": "INFO", "n": 0})
+    writer.submit(str(log), {"log_level": "INFO", "n": 1})
+    assert writer.dropped == 1
+
+def test_spill_survives_rotation(tmp_path):
+    # The spill file used to go through write_to and rotate with the log's policy, losing what rotated out
+    log = tmp_path / "log.json"
+    write.set_rotation(str(log) + ".spill", max_bytes=200)
+    writer = LogWriter(max_queue=1, overflow="spill")
+    writer.start = lambda: None
+    for number in range(20):
+        writer.submit(str(log), {"log_level": "INFO", "n": number, "padding": "x" * 40})
+    assert writer.spilled == 19
+    assert write.list_segments(str(log) + ".spill") == []
+    writer.shutdown()
+    # The one entry that made it onto the queue had no worker to write it
+    assert entries(log) == list(range(1, 20))
+
+def test_submit_during_shutdown_is_written(tmp_path):
+    log = tmp_path / "log.json"
+    writer = LogWriter(flush_interval=0.01)
+    stop = threading.Event()
+
+    def keep_submitting():
+        number = 0
+        while not stop.is_set():
+            writer.submit(str(log), {"log_level": "INFO", "n": number})
+            number += 1
+        keep_submitting.count = number
+
+    thread = threading.Thread(target=keep_submitting)
+    thread.start()
+    while not log.exists():
+        pass
+    writer.shutdown()
+    stop.set()
+    thread.join()
+    # Nothing lost, whether it was drained by the worker or written directly after it stopped
+    assert sorted(entries(log)) == list(range(keep_submitting.count))
+    assert writer.queue.empty()
@@ -0,0 +1,165 @@
+# Host identity and the log filter (utils/logging.py)
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from utils import logging as log_module
+from utils.logging import HostInfo, LogFilter, Logging
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+def test_min_level_and_sampling(monkeypatch):
+    log_filter = LogFilter(min_level="WARNING")
+    assert not log_filter.allow("INFO", "get_details", "ran")
+    assert log_filter.allow("ERROR", "get_details", "failed")
+
+    log_filter.configure(min_level="DEBUG", sample_rates={"get_details": 0.25})
+    monkeypatch.setattr(log_module.random, "random", lambda: 0.5)
+    assert not log_filter.allow("INFO", "get_details", "ran")
+    assert log_filter.allow("INFO", "get_lineup", "ran")
+    # Warnings and errors are never sampled away
+    assert log_filter.allow("WARNING", "get_details", "slow")
+    assert log_filter.suppressed == 1
+
+def test_rate_limit_per_window(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(log_module.time, "monotonic", clock)
+    log_filter = LogFilter(rate_limit=2, rate_window=10)
+    assert [log_filter.allow("ERROR", "save", "failed") for _ in range(4)] == [True, True, False, False]
+    assert log_filter.allow("ERROR", "save", "another message")
+    clock.now += 10
+    assert log_filter.allow("ERROR", "save", "failed")
+
+@pytest.mark.parametrize("window", [1, 10 ** 6])
+def test_rate_limit_counters_stay_bounded(monkeypatch, window):
+    # One message per call (the error detail differs every time) must not grow the counters forever,
+    # whether they expire (window=1) or the oldest have to go (window=10**6)
+    clock = Clock()
+    monkeypatch.setattr(log_module.time, "monotonic", clock)
+    log_filter = LogFilter(rate_limit=1, rate_window=window)
+    for number in range(5 * LogFilter.MAX_SEEN):
+        clock.now += 0.01
+        assert log_filter.allow("ERROR", "get_game_stats", f"Could not find Game_{number}")
+        assert len(log_filter._seen) <= LogFilter.MAX_SEEN
+
+    # Within the window, the newest counters are the ones kept
+    assert not log_filter.allow("ERROR", "get_game_stats", f"Could not find Game_{5 * LogFilter.MAX_SEEN - 1}")
+
+class FakeLookup:
+    # Stands in for urlopen(PUBLIC_IP_URL): counts calls, can be held until the test lets it answer
+    def __init__(self, ip: str = "203.0.113.7", fail: bool = False):
+        self.ip = ip
+        self.fail = fail
+        self.calls = 0
+        self.release = threading.Event()
+        self.release.set()
+
+    def __call__(self, url, timeout=None):
+        self.calls += 1
+        assert timeout == log_module.PUBLIC_IP_TIMEOUT
+        self.release.wait(5)
+        if self.fail:
+            raise OSError("no network")
+        ip = self.ip
+
+        class Response:
+            def read(self):
+                return f"{ip}\n".encode()
+        return Response()
+
+@pytest.fixture
+def lookup(monkeypatch) -> FakeLookup:
+    fake = FakeLookup()
+    monkeypatch.setattr(log_module.urllib.request, "urlopen", fake)
+    monkeypatch.setattr(log_module.socket, "gethostname", lambda: "test-host")
+    return fake
+
+def test_public_ip_never_waits_on_the_network(tmp_path, lookup):
+    lookup.release.clear()
+    host = HostInfo(tmp_path / "host_info.json")
+    assert host.public_ip == "N/A"
+    assert host.public_ip == "N/A"
+    lookup.release.set()
+    host.refresh(wait=True)
+    assert host.public_ip == "203.0.113.7"
+    # One lookup in flight at a time
+    assert lookup.calls == 1
+    with open(tmp_path / "host_info.json", encoding="utf-8") as file:
+        cached = json.load(file)
+    assert (cached["hostname"], cached["public_ip"]) == ("test-host", "203.0.113.7")
+
+def test_cached_ip_is_used_until_the_ttl(tmp_path, lookup):
+    HostInfo(tmp_path / "host_info.json").refresh(wait=True)
+    assert lookup.calls == 1
+    # A restart reads it back, no lookup
+    assert HostInfo(tmp_path / "host_info.json").public_ip == "203.0.113.7"
+    assert lookup.calls == 1
+
+    # Too old: looked up again (in the background) and written back
+    lookup.ip = "203.0.113.8"
+    stale = HostInfo(tmp_path / "host_info.json", ttl=60)
+    with open(tmp_path / "host_info.json", encoding="utf-8") as file:
+        cached = json.load(file)
+    cached["resolved_at"] = time.time() - 61
+    with open(tmp_path / "host_info.json", "w", encoding="utf-8") as file:
+        json.dump(cached, file)
+    assert stale.public_ip == "N/A"
+    stale.refresh(wait=True)
+    assert lookup.calls == 2
+    assert HostInfo(tmp_path / "host_info.json").public_ip == "203.0.113.8"
+
+@pytest.mark.parametrize("cached", ['{"hostname": "other-host", "public_ip": "198.51.100.1", "resolved_at": %f}', '{"public_ip": ', '[]'])
+def test_cache_for_another_host_or_broken_is_ignored(tmp_path, lookup, cached):
+    path = tmp_path / "host_info.json"
+    path.write_text(cached % time.time() if "%f" in cached else cached, encoding="utf-8")
+    host = HostInfo(path)
+    assert host.public_ip == "N/A"
+    host.refresh(wait=True)
+    assert host.public_ip == "203.0.113.7"
+    assert lookup.calls == 1
+
+def test_falls_back_to_the_host_name(tmp_path, lookup, monkeypatch):
+    lookup.fail = True
+    monkeypatch.setattr(log_module.socket, "gethostbyname", lambda name: "192.0.2.1" if name == "test-host" else None)
+    host = HostInfo(tmp_path / "host_info.json")
+    host.refresh(wait=True)
+    assert host.public_ip == "192.0.2.1"
+
+def test_hostname_looked_up_once(monkeypatch):
+    calls = []
+    monkeypatch.setattr(log_module.socket, "gethostname", lambda: calls.append(1) or "test-host")
+    logger = Logging(host=HostInfo(None))
+    for _ in range(3):
+        assert logger.create_log("INFO", "ran", "get_details")["host"] == "test-host"
+    assert len(calls) == 1
+
+    def broken():
+        raise OSError("no host name")
+    monkeypatch.setattr(log_module.socket, "gethostname", broken)
+    assert HostInfo(None).hostname == "unknown"
+
+def test_import_does_no_network_work(tmp_path):
+    # A fresh interpreter where any lookup fails loudly
+    script = """
+import socket, sys, urllib.request
+def refuse(*args, **kwargs):
+    raise AssertionError("network or DNS used during import")
+urllib.request.urlopen = socket.gethostbyname = socket.getaddrinfo = socket.create_connection = refuse
+sys.path.insert(0, sys.argv[1])
+import utils.accessing_data
+import threading
+assert [thread.name for thread in threading.enumerate() if thread.name == "HostInfo"] == []
+"""
+    src = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run([sys.executable, "-c", script, src], cwd=tmp_path, capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
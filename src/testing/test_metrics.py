@@ -0,0 +1,122 @@
+# Per-method metrics (utils/metrics.py): the histogram, snapshot() / dump(), and instrument() on AccessData
+import threading
+
+import pytest
+
+from utils import metrics as metrics_module
+from utils.accessing_data import AccessData
+from utils.metrics import BUCKETS_MS, Metrics, elapsed_ms, metrics
+from utils.query_cache import query_cache
+
+@pytest.fixture
+def instrumented():
+    # The shared metrics (log_action checks it for duration_ms), wrappers and counts gone after the test
+    metrics.reset()
+    metrics.instrument(AccessData, dump_at_exit=False)
+    try:
+        yield metrics
+    finally:
+        metrics.uninstrument()
+        metrics.reset()
+
+def test_histogram_and_snapshot():
+    recorder = Metrics()
+    for duration in (0.01, 0.07, 0.1, 3, 3, 4000):
+        recorder.record("AccessData.get_details", duration, False)
+    recorder.record("AccessData.get_details", 2, True)
+    recorder.record("AccessData.get_lineup", 1, False)
+
+    stats = recorder.snapshot()["AccessData.get_details"]
+    assert (stats["calls"], stats["errors"], stats["max_ms"]) == (7, 1, 4000)
+    assert stats["total_ms"] == round(0.01 + 0.07 + 0.1 + 3 + 3 + 4000 + 2, 3)
+    assert stats["mean_ms"] == round(stats["total_ms"] / 7, 3)
+    # Bounds are inclusive, anything past the last one is "+inf"
+    assert stats["histogram"]["<=0.05ms"] == 1 and stats["histogram"]["<=0.1ms"] == 2
+    assert stats["histogram"]["<=2.5ms"] == 1 and stats["histogram"]["<=5ms"] == 2 and stats["histogram"]["+inf"] == 1
+    assert sum(stats["histogram"].values()) == 7 and len(stats["histogram"]) == len(BUCKETS_MS) + 1
+    assert (stats["p50_ms"], stats["p95_ms"]) == (2.5, 4000)
+
+    # Slowest total first
+    lines = recorder.dump().splitlines()
+    assert lines[0].split()[:3] == ["method", "calls", "errors"]
+    assert [line.split()[0] for line in lines[1:]] == ["AccessData.get_details", "AccessData.get_lineup"]
+    recorder.reset()
+    assert recorder.snapshot() == {} and recorder.dump().count("\n") == 0
+    assert Metrics().snapshot() == {}
+
+def test_off_means_no_wrapper(season):
+    originals = dict(vars(AccessData))
+    assert not metrics.enabled
+    metrics.instrument(AccessData, dump_at_exit=False)
+    try:
+        assert metrics.enabled
+        assert vars(AccessData)["get_season_stats"] is not originals["get_season_stats"]
+        # Private helpers and class attributes are left alone
+        assert vars(AccessData)["_quarters"] is originals["_quarters"]
+        assert vars(AccessData)["reload_interval"] is originals["reload_interval"]
+    finally:
+        metrics.uninstrument()
+        metrics.reset()
+    assert not metrics.enabled
+    assert all(vars(AccessData)[name] is value for name, value in originals.items())
+    assert "duration_ms" not in AccessData.get_season_stats(42)
+
+def test_counts_calls_and_errors(season, instrumented):
+    query_cache.clear()
+    for _ in range(3):
+        AccessData.get_season_stats("Harry Wu", sum_total=True)
+    error = AccessData.get_season_stats(42)
+    season.get_details("Game_1")
+    season.get_details("No such game")
+
+    snapshot = instrumented.snapshot()
+    assert (snapshot["AccessData.get_season_stats"]["calls"], snapshot["AccessData.get_season_stats"]["errors"]) == (4, 1)
+    assert (snapshot["AccessData.get_details"]["calls"], snapshot["AccessData.get_details"]["errors"]) == (2, 1)
+    # The log entries written inside an instrumented call carry how long it had taken
+    assert error["log_level"] == "ERROR" and error["duration_ms"] >= 0
+
+def test_elapsed_ms_is_the_innermost_call(instrumented):
+    assert elapsed_ms() is None
+    seen = {}
+
+    class Service:
+        def outer(self):
+            seen["outer"] = elapsed_ms()
+            self.inner()
+            return seen
+
+        def inner(self):
+            seen["inner"] = elapsed_ms()
+
+    instrumented.instrument(Service, dump_at_exit=False)
+    assert Service().outer() is seen
+    assert seen["outer"] is not None and seen["inner"] is not None
+    assert elapsed_ms() is None
+
+    # Each thread has its own stack
+    other = []
+    thread = threading.Thread(target=lambda: other.append(elapsed_ms()))
+    thread.start()
+    thread.join()
+    assert other == [None]
+    assert instrumented.snapshot()["Service.outer"]["calls"] == 1 == instrumented.snapshot()["Service.inner"]["calls"]
+
+def test_raised_errors_are_counted_and_still_raised(instrumented):
+    class Service:
+        @staticmethod
+        def fail():
+            raise ValueError("no")
+
+    instrumented.instrument(Service, dump_at_exit=False)
+    with pytest.raises(ValueError):
+        Service.fail()
+    assert instrumented.snapshot()["Service.fail"]["errors"] == 1
+    assert metrics_module._local.starts == []
+
+def test_dump_at_exit(capsys):
+    recorder = Metrics()
+    recorder._dump_at_exit()
+    assert capsys.readouterr().out == ""
+    recorder.record("AccessData.get_details", 1, False)
+    recorder._dump_at_exit()
+    assert "AccessData.get_details" in capsys.readouterr().out
@@ -0,0 +1,81 @@
+# Season / team partitions (utils/partitions.py) and the filtered getters that use them
+import copy
+import functools
+import json
+
+from utils.accessing_data import AccessData
+from utils.partitions import NO_TEAM, UNDATED, PartitionIndex, partition_of
+from testing.helpers import OPPONENT, TEAM, make_season, walk_totals
+
+def mixed_season() -> dict:
+    # 2025 and 2026 games, one with a Details["Team"], one with no date and one with no team
+    data = make_season(6)
+    data["Game_5"]["Details"]["Year"] = 2026
+    data["Game_6"]["Details"]["Season"] = "2026"
+    data["Game_4"]["Details"]["Team"] = "Other Club"
+    del data["Game_3"]["Details"]["Year"]
+    data["Game_2"]["Lineup"] = {OPPONENT: [], TEAM: [], "Third Team": []}
+    return data
+
+def test_partition_of():
+    data = mixed_season()
+    assert [partition_of(game_data) for game_data in data.values()] == [
+        ("2025", TEAM), ("2025", NO_TEAM), (UNDATED, TEAM), ("2025", "Other Club"), ("2026", TEAM), ("2026", TEAM)
+    ]
+    assert partition_of("not a game") == (UNDATED, NO_TEAM)
+    assert partition_of({"Quarters": {}}) == (UNDATED, NO_TEAM)
+
+def test_tree_is_json_with_sorted_keys():
+    index = PartitionIndex(mixed_season())
+    tree = index.tree()
+    assert json.loads(json.dumps(tree, sort_keys=True)) == tree
+    assert tree[UNDATED] == {TEAM: ["Game_3"]}
+    assert index.games(season=UNDATED) == ["Game_3"]
+    assert index.games(team=NO_TEAM) == ["Game_2"]
+    assert index.games(season=2026) == index.games(season="2026") == ["Game_5", "Game_6"]
+    assert index.games(team=TEAM) == ["Game_1", "Game_3", "Game_5", "Game_6"]
+    assert index.seasons() == ["2025", UNDATED, "2026"]
+
+def test_team_totals():
+    data = mixed_season()
+    index = PartitionIndex(data)
+
+    def game_totals(game):
+        return walk_totals(data, [game])
+    assert index.team_totals(game_totals) == walk_totals(data)
+    assert index.team_totals(game_totals, season="2025") == walk_totals(data, ["Game_1", "Game_2", "Game_4"])
+    assert index.team_totals(game_totals, season="2025", team=TEAM) == walk_totals(data, ["Game_1"])
+
+def test_get_partitions(season):
+    # No Details at all: no season, and no Game_against to tell the two Lineup teams apart
+    assert season.set_game("Game_9", {**make_season(1)["Game_1"], "Details": {}}) is True
+    tree = AccessData.get_partitions()
+    assert json.loads(json.dumps(tree, sort_keys=True)) == tree
+    assert AccessData.get_partitions(season=UNDATED) == {UNDATED: {NO_TEAM: ["Game_9"]}}
+    totals = AccessData.get_team_season_stats(sum_total=True, season=UNDATED)
+    assert totals == walk_totals(AccessData.data, ["Game_9"])
+
+def test_index_follows_changes(season):
+    index = AccessData._partitions(AccessData.dataset)
+    assert AccessData.get_team_season_stats(sum_total=True, season=2025) == walk_totals(AccessData.data)
+
+    # Same partition: only its totals are summed again
+    assert season.set_stat("Game_1", "Quarter 1", "Harry Wu", "Points", 40) is True
+    assert AccessData.get_team_season_stats(sum_total=True, season=2025) == walk_totals(AccessData.data)
+
+    # A game moving to another season, a new one, and one removed
+    details = {**AccessData.data["Game_2"]["Details"], "Year": 2026}
+    assert season.set_game("Game_2", {**AccessData.data["Game_2"], "Details": details}) is True
+    assert season.set_game("Game_9", make_season(1)["Game_1"]) is True
+    assert season.delete_game("Game_3") is True
+    data = AccessData.data
+    fresh = PartitionIndex(data)
+    current = AccessData._partitions(AccessData.dataset)
+    game_totals = functools.partial(AccessData._game_player_totals, AccessData.dataset)
+    assert current.tree() == fresh.tree()
+    assert current.team_totals(game_totals, season="2025") == fresh.team_totals(game_totals, season="2025")
+    assert AccessData.get_team_season_stats(sum_total=True, season=2026) == walk_totals(data, ["Game_2"])
+    assert AccessData.get_partitions(season=2025)["2025"][TEAM] == [game for game in data if game != "Game_2"]
+    # The index the first dataset had is left as it was
+    assert index.games(season=2026) == []
+    assert "Game_3" in index.games()
@@ -0,0 +1,102 @@
+# Where each player shows up (utils/player_index.py), and the getters that use it
+from utils.accessing_data import AccessData
+from utils.player_index import PlayerIndex
+from testing.helpers import OPPONENT, PLAYERS, TEAM, make_season, walk_totals
+
+def walk(data: dict) -> dict:
+    # player -> game -> quarters, the way a walk over the data finds them
+    cells = {}
+    for game, game_data in data.items():
+        for quarter, quarter_stats in game_data["Quarters"].items():
+            for player in quarter_stats:
+                cells.setdefault(player, {}).setdefault(game, []).append(quarter)
+    return cells
+
+def indexed(index: PlayerIndex) -> dict:
+    return {player: dict(index.games(player)) for player in index.cells}
+
+def same(index: PlayerIndex, data: dict):
+    cells = walk(data)
+    assert indexed(index) == cells
+    # Same game order as the walk, not just the same games
+    assert all(list(index.games(player)) == list(games) for player, games in cells.items())
+    assert all(list(index.appearances(player)) == [(game, quarter) for game, quarters in games.items() for quarter in quarters]
+               for player, games in cells.items())
+
+def test_build():
+    data = make_season(4)
+    index = PlayerIndex(data)
+    same(index, data)
+    assert index.games("Angus Lee") == {"Game_1": ["Quarter 1", "Quarter 3"], "Game_2": ["Quarter 2", "Quarter 4"],
+                                        "Game_3": ["Quarter 1", "Quarter 3"], "Game_4": ["Quarter 2", "Quarter 4"]}
+    assert index.games("Nobody") == {}
+    assert index.in_lineup("Game_1", TEAM, "Angus Lee") is True
+    assert index.in_lineup("Game_1", OPPONENT, "Angus Lee") is False
+    assert index.in_lineup("Game_1", "Some Other Team", "Angus Lee") is None
+    assert index.in_lineup("Game_9", TEAM, "Angus Lee") is None
+
+def test_updates():
+    data = make_season(4)
+    index = PlayerIndex(data)
+    # A new player in an early game, after they already had a later one
+    data["Game_4"]["Quarters"]["Quarter 1"]["New Kid"] = {"Points": 1}
+    index.update_game(data, "Game_4")
+    data["Game_2"]["Quarters"]["Quarter 3"]["New Kid"] = {"Points": 1}
+    index.update_game(data, "Game_2")
+    same(index, data)
+    # Out of a game, a whole game gone, a new one, a lineup that isn't lists
+    del data["Game_3"]["Quarters"]["Quarter 1"]["Angus Lee"], data["Game_3"]["Quarters"]["Quarter 3"]["Angus Lee"]
+    index.update_game(data, "Game_3")
+    del data["Game_1"]
+    index.update_game(data, "Game_1")
+    data["Game_5"] = make_season(1)["Game_1"]
+    data["Game_5"]["Lineup"] = {TEAM: "everyone"}
+    index.update_game(data, "Game_5")
+    same(index, data)
+    assert index.in_lineup("Game_1", TEAM, "Angus Lee") is None
+    assert index.in_lineup("Game_5", TEAM, "Angus Lee") is None
+
+def test_copy_shares_until_written():
+    data = make_season(3)
+    data["Game_1"]["Quarters"]["Quarter 2"]["Late Arrival"] = {"Points": 2}
+    index = PlayerIndex(data)
+    before = indexed(index)
+    changed = dict(data)
+    changed["Game_2"] = make_season(2)["Game_2"]
+    changed["Game_2"]["Quarters"]["Quarter 1"]["New Kid"] = {"Points": 1}
+    del changed["Game_2"]["Quarters"]["Quarter 1"]["Harry Wu"]
+    del changed["Game_3"]
+    copy = index.copy()
+    copy.update_game(changed, "Game_2")
+    copy.update_game(changed, "Game_3")
+    same(copy, changed)
+    assert indexed(index) == before
+    # A player only in games neither side changed still shares one dict
+    assert copy.cells["Late Arrival"] is index.cells["Late Arrival"]
+    # And the original can still move on its own without touching the copy
+    data["Game_1"] = make_season(1)["Game_1"]
+    data["Game_1"]["Quarters"]["Quarter 2"]["Someone New"] = {"Points": 2}
+    index.update_game(data, "Game_1")
+    same(index, data)
+    same(copy, changed)
+
+def test_getters_follow_changes(season):
+    players_before = AccessData.dataset.players
+    kept = indexed(players_before)
+    assert season.set_player_stats("Game_2", "Quarter 1", "New Kid", {"Points": 9, "Fouls": 0}) is True
+    assert season.set_stat("Game_5", "Quarter 2", "Harry Wu", "Points", 30) is True
+    assert season.set_quarter_stats("Game_3", "Quarter 1", {"Harry Wu": {"Points": 1}}) is True
+    assert season.delete_game("Game_7") is True
+    data = AccessData.data
+    same(AccessData.dataset.players, data)
+    assert indexed(players_before) == kept
+
+    totals = walk_totals(data)
+    for player in PLAYERS + ["New Kid"]:
+        assert AccessData.get_season_stats(player, sum_total=True) == totals[player]
+    assert AccessData.get_season_stats("New Kid") == {"Game_2": {"Points": 9, "Fouls": 0}}
+    assert AccessData.get_season_stats_many(["New Kid", "Harry Wu"], sum_total=True) == {player: totals[player] for player in ("New Kid", "Harry Wu")}
+    assert AccessData.specific_players_best_stat("Harry Wu", "Points", look_good=True) == "Harry Wu got the most Points (30) in Quarter 2 of Game_5"
+    assert AccessData.specific_players_best_stat("New Kid", "Points", look_good=True) == "New Kid got the most Points (9) in Quarter 1 of Game_2"
+    assert AccessData.check_player("Game_2", TEAM, "Harry Wu") is True
+    assert AccessData.check_player("Game_7", TEAM, "Harry Wu")["error"]["type"] == "KeyError"
@@ -0,0 +1,109 @@
+# The query cache (utils/query_cache.py) on its own, and in front of the AccessData getters
+import pytest
+
+from utils.accessing_data import AccessData
+from utils.query_cache import QueryCache, query_cache
+from testing.helpers import PLAYERS, walk_totals
+
+def hits() -> int:
+    return query_cache.stats()["hits"]
+
+class Owner:
+    # Stands in for AccessData: a data_version and a method that counts its calls
+    data_version = 1
+    calls = 0
+
+    @classmethod
+    def answer(cls, value):
+        cls.calls += 1
+        if value == "bad":
+            return {"log_level": "ERROR", "error": {"type": "ValueError"}}
+        return {"value": value, "lines": [{"Points": 1}]}
+
+def cached_owner(max_size: int = 256):
+    cache = QueryCache(max_size)
+    owner = type("CachedOwner", (Owner,), {"calls": 0})
+    owner.answer = classmethod(cache.cached(Owner.answer.__func__))
+    return cache, owner
+
+def test_least_recently_used_goes_first():
+    cache, owner = cached_owner(max_size=2)
+    owner.answer("a")
+    owner.answer("b")
+    owner.answer("a")
+    # "b" is now the oldest, so "c" pushes it out and "a" stays
+    owner.answer("c")
+    assert cache.stats()["size"] == 2
+    assert owner.calls == 3
+    owner.answer("a")
+    assert owner.calls == 3
+    owner.answer("b")
+    assert owner.calls == 4
+    assert cache.stats() == {"size": 2, "max_size": 2, "hits": 2, "misses": 4}
+    with pytest.raises(ValueError):
+        QueryCache(0)
+
+def test_new_version_drops_every_entry():
+    cache, owner = cached_owner()
+    owner.answer("a")
+    owner.answer("b")
+    owner.data_version = 2
+    owner.answer("a")
+    assert owner.calls == 3
+    assert cache.stats()["size"] == 1
+    # A result computed for an older version is never stored under the new one
+    cache.put(("answer", ("b",), ()), 1, {"value": "stale"})
+    owner.answer("b")
+    assert owner.calls == 4
+
+def test_callers_get_their_own_copy():
+    cache, owner = cached_owner()
+    first = owner.answer("a")
+    first["value"] = "changed"
+    first["lines"][0]["Points"] = 99
+    second = owner.answer("a")
+    assert second == {"value": "a", "lines": [{"Points": 1}]}
+    second["lines"].append({})
+    assert owner.answer("a") == {"value": "a", "lines": [{"Points": 1}]}
+    assert owner.calls == 1
+
+def test_errors_and_unhashable_arguments_are_not_cached():
+    cache, owner = cached_owner()
+    assert owner.answer("bad")["log_level"] == "ERROR"
+    assert owner.answer("bad")["log_level"] == "ERROR"
+    assert owner.calls == 2
+    owner.answer(["a"])
+    owner.answer(["a"])
+    assert owner.calls == 4
+    assert cache.stats()["size"] == 0
+
+def test_many_methods_cache_lists_of_players(season):
+    query_cache.clear()
+    players = ["Harry Wu", PLAYERS[1]]
+    first = AccessData.get_season_stats_many(players, sum_total=True)
+    before = hits()
+    # A new list with the same players, and a tuple, are the same entry
+    assert AccessData.get_season_stats_many(list(players), sum_total=True) == first
+    assert AccessData.get_season_stats_many(tuple(players), True) == first
+    assert hits() == before + 2
+
+    games = AccessData.get_game_stats_many("Game_1", players)
+    quarters = AccessData.get_quarter_season_stats_many("Quarter 1", players, sum_total=True)
+    before = hits()
+    assert AccessData.get_game_stats_many("Game_1", players=list(players)) == games
+    assert AccessData.get_quarter_season_stats_many("Quarter 1", list(players), sum_total=True) == quarters
+    assert hits() == before + 2
+
+    # A set still works, it's cached like the list it came from
+    assert AccessData.get_season_stats_many({"Harry Wu"}, sum_total=True) == {"Harry Wu": first["Harry Wu"]}
+
+def test_many_methods_see_changes(season):
+    query_cache.clear()
+    players = ["Harry Wu"]
+    AccessData.get_season_stats_many(players, sum_total=True)
+    assert season.set_stat("Game_1", "Quarter 1", "Harry Wu", "Points", 40) is True
+    result = AccessData.get_season_stats_many(players, sum_total=True)
+    assert result == {"Harry Wu": walk_totals(AccessData.data)["Harry Wu"]}
+
+def test_many_methods_still_check_players(season):
+    assert AccessData.get_season_stats_many("Harry Wu")["error"]["type"] == "TypeError"
@@ -0,0 +1,97 @@
+# Read only views (utils/read_only.py) and the getters handing them out with view=True / read_only_views
+import copy
+
+import pytest
+
+from utils.accessing_data import AccessData
+from utils.read_only import ListView, QuarterView, proxy
+from testing.helpers import OPPONENT, TEAM, load
+
+def test_proxy():
+    details = {"Day": 1, "Month": 2}
+    view = proxy(details)
+    assert view == details and dict(view) == details
+    with pytest.raises(TypeError):
+        view["Day"] = 2
+    with pytest.raises(TypeError):
+        del view["Day"]
+    # A view, not a copy: later changes show through
+    details["Day"] = 3
+    assert view["Day"] == 3
+    # Not a MutableMapping, already read only
+    assert proxy(view) is view
+
+def test_list_view():
+    players = ["Angus Lee", "Harry Wu", "Sam Ortiz"]
+    view = ListView(players)
+    assert view == players and view == tuple(players) and view == ListView(list(players))
+    assert view != players[:2] and view != set(players)
+    assert list(view) == players and len(view) == 3 and "Harry Wu" in view
+    assert view[1] == players[1] and view[-1] == players[-1] and view[:2] == tuple(players[:2])
+    assert view.index("Sam Ortiz") == 2 and view.count("Harry Wu") == 1
+    for write in (lambda: view.__setitem__(0, "x"), lambda: view.append("x"), lambda: view.__delitem__(0)):
+        with pytest.raises((TypeError, AttributeError)):
+            write()
+    with pytest.raises(TypeError):
+        hash(view)
+    copied = view.copy()
+    copied.append("x")
+    assert players == ["Angus Lee", "Harry Wu", "Sam Ortiz"]
+
+def test_quarter_view():
+    quarter = {"Harry Wu": {"Points": 4, "Fouls": 1}, "Sam Ortiz": {"Points": 2}}
+    view = QuarterView(quarter)
+    assert dict(view) == quarter and view == quarter
+    assert list(view) == list(quarter) and len(view) == 2 and "Harry Wu" in view and "Nobody" not in view
+    assert view.get("Nobody") is None
+    with pytest.raises(TypeError):
+        view["Harry Wu"] = {}
+    with pytest.raises(TypeError):
+        view["Harry Wu"]["Points"] = 40
+    assert quarter["Harry Wu"]["Points"] == 4
+    # copy() is what get_quarter_stats returns without views: a new outer dict
+    copied = view.copy()
+    copied["New Player"] = {}
+    assert "New Player" not in quarter
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_getters_give_the_same_answers(season_file, monkeypatch, compact):
+    monkeypatch.setattr(AccessData, "compact_load", compact)
+    season = load(season_file)
+    before = copy.deepcopy(AccessData.data["Game_1"]["Details"]), copy.deepcopy(AccessData.data["Game_1"]["Lineup"])
+    for game in ("Game_1", "Game_2"):
+        assert season.get_details(game, view=True) == season.get_details(game)
+        assert isinstance(season.get_lineup(game, TEAM, view=True), ListView)
+        for team in (TEAM, OPPONENT):
+            assert season.get_lineup(game, team, view=True) == season.get_lineup(game, team)
+        for quarter in ("Quarter 1", "Quarter 4"):
+            view = AccessData.get_quarter_stats(game, quarter, view=True)
+            assert isinstance(view, QuarterView)
+            assert dict(view) == AccessData.get_quarter_stats(game, quarter)
+            assert {player: dict(line) for player, line in view.items()} == {player: dict(line) for player, line in AccessData.get_quarter_stats(game, quarter).items()}
+
+    details = season.get_details("Game_1", view=True)
+    lineup = season.get_lineup("Game_1", TEAM, view=True)
+    quarter = AccessData.get_quarter_stats("Game_1", "Quarter 1", view=True)
+    with pytest.raises(TypeError):
+        details["Day"] = 1
+    with pytest.raises((TypeError, AttributeError)):
+        lineup.append("Someone")
+    with pytest.raises(TypeError):
+        quarter["Harry Wu"]["Points"] = 99
+    assert (AccessData.data["Game_1"]["Details"], AccessData.data["Game_1"]["Lineup"]) == before
+
+def test_read_only_views_is_the_default_for_view(season, monkeypatch):
+    assert isinstance(season.get_details("Game_1"), dict)
+    monkeypatch.setattr(AccessData, "read_only_views", True)
+    assert isinstance(season.get_lineup("Game_1", TEAM), ListView)
+    assert isinstance(AccessData.get_quarter_stats("Game_1", "Quarter 1"), QuarterView)
+    with pytest.raises(TypeError):
+        season.get_details("Game_1")["Day"] = 1
+    # view=False still copies
+    details = season.get_details("Game_1", view=False)
+    details["Day"] = 1
+    assert isinstance(details, dict)
+    # A view of a set_* change's new game, not the old one
+    assert season.set_stat("Game_1", "Quarter 1", "Harry Wu", "Points", 40) is True
+    assert AccessData.get_quarter_stats("Game_1", "Quarter 1")["Harry Wu"]["Points"] == 40
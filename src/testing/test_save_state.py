@@ -0,0 +1,65 @@
+# save() skipping the work a change doesn't need (utils/save_state.py): dirty games, fragments and backups
+import json
+import os
+
+from utils import save_state
+from utils.accessing_data import AccessData
+from utils.aggregates import content_hash
+from utils.save_state import SaveState
+from testing.helpers import load, make_season, walk_totals
+
+def on_disk(path: str) -> dict:
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)
+
+def test_encode_matches_json_dumps():
+    data = make_season(3)
+    data["Game_2"]["Details"]["Venue"] = "Jubilee Stadium, Ōtautahi"
+    state = SaveState(data, "Data.json", None)
+    assert state.encode(data) == json.dumps(data, indent=4, ensure_ascii=False).encode("utf-8")
+    assert state.changed == list(data)
+
+    # Only a replaced game is encoded again, a removed one is listed too
+    data = {**data, "Game_1": make_season(1, seed=3)["Game_1"]}
+    del data["Game_3"]
+    state.moved(data)
+    assert state.encode(data) == json.dumps(data, indent=4, ensure_ascii=False).encode("utf-8")
+    assert sorted(state.changed) == ["Game_1", "Game_3"]
+    assert state.encoded == 4
+
+def test_nothing_changed_skips_the_write(season, season_file):
+    before = os.stat(season_file).st_mtime_ns
+    version = AccessData.data_version
+    assert season.save() is True
+    assert os.stat(season_file).st_mtime_ns == before
+    assert save_state.backups(season_file) == []
+    assert AccessData.data_version == version
+
+def test_edit_in_place_is_saved(season, season_file):
+    # Not through set_* and without mark_changed(): save() still has to notice it
+    assert AccessData.get_season_stats("Harry Wu", sum_total=True)["Points"] != 999
+    AccessData.data["Game_1"]["Quarters"]["Quarter 1"]["Harry Wu"]["Points"] = 999
+    version = AccessData.data_version
+    assert season.save() is True
+
+    assert on_disk(season_file)["Game_1"]["Quarters"]["Quarter 1"]["Harry Wu"]["Points"] == 999
+    assert AccessData.data_version > version
+    assert AccessData.get_season_stats("Harry Wu", sum_total=True) == walk_totals(AccessData.data)["Harry Wu"]
+    # Once every game has a fragment, only the edited one is encoded again
+    AccessData.data["Game_2"]["Quarters"]["Quarter 1"]["Harry Wu"]["Points"] = 998
+    assert season.save() is True
+    assert AccessData._save_state.changed == ["Game_2"]
+    load(season_file)
+    assert AccessData.data["Game_1"]["Quarters"]["Quarter 1"]["Harry Wu"]["Points"] == 999
+
+def test_backups_are_named_by_content(season, season_file, monkeypatch):
+    monkeypatch.setattr(AccessData, "backup_keep", 2)
+    for points in (10, 20, 30):
+        assert season.set_stat("Game_1", "Quarter 1", "Harry Wu", "Points", points) is True
+        assert season.save() is True
+    kept = save_state.backups(season_file)
+    assert len(kept) == 2
+    # The newest backup holds what was there before the last save
+    assert on_disk(kept[0])["Game_1"]["Quarters"]["Quarter 1"]["Harry Wu"]["Points"] == 20
+    with open(kept[0], "rb") as file:
+        assert kept[0] == save_state.backup_path(season_file, content_hash(file.read()))
@@ -0,0 +1,95 @@
+# Data.json checks (utils/schema.py): every problem, each with the JSON pointer of where it is
+import pytest
+
+from utils import schema
+from utils.accessing_data import AccessData
+from utils.interning import compact
+from testing.helpers import load, make_season, write_data
+
+def broken_season() -> dict:
+    data = make_season(3)
+    quarters = data["Game_1"]["Quarters"]
+    quarters["Quarter 1"]["Harry Wu"]["Points"] = "12"
+    quarters["Quarter 2"]["Harry Wu"]["Fouls"] = True
+    quarters["Quarter 3"]["Sam Ortiz"] = [1, 2]
+    data["Game_2"]["Lineup"]["Team/With~Slash"] = ["Someone", 7]
+    data["Game_2"]["Details"]["Court"] = {"Number": 3}
+    del data["Game_3"]["Quarters"]
+    data["Game_4"] = "not a game"
+    return data
+
+EXPECTED = [
+    "/Game_1/Quarters/Quarter 1/Harry Wu/Points: expected a number, got str",
+    "/Game_1/Quarters/Quarter 2/Harry Wu/Fouls: expected a number, got bool",
+    "/Game_1/Quarters/Quarter 3/Sam Ortiz: expected an object, got list",
+    "/Game_2/Details/Court: expected a string, number, bool or null, got dict",
+    "/Game_2/Lineup/Team~1With~0Slash/1: expected a string, got int",
+    "/Game_3/Quarters: is missing",
+    "/Game_4: expected an object, got str"
+]
+
+def test_every_problem_with_its_pointer():
+    problems = schema.validate(broken_season())
+    assert [str(problem) for problem in problems] == EXPECTED
+    assert problems[0].path == ("Game_1", "Quarters", "Quarter 1", "Harry Wu", "Points")
+    assert schema.validate(make_season()) == []
+    assert [str(problem) for problem in schema.validate([])] == ["/: expected an object, got list"]
+
+def test_one_game():
+    data = broken_season()
+    assert [str(problem) for problem in schema.validate_game("Game_2", data["Game_2"])] == EXPECTED[3:5]
+    assert schema.validate_game("Game_5", make_season(1)["Game_1"]) == []
+
+def test_compact_quarters_are_checked_like_dicts():
+    data = make_season(2)
+    compact(data)
+    assert schema.validate(data) == []
+    data["Game_1"]["Quarters"]["Quarter 1"]["Harry Wu"]["Points"] = 1.5
+    assert schema.validate(data) == []
+    data["Game_1"]["Quarters"]["Quarter 1"]["Harry Wu"]["Points"] = None
+    assert [str(problem) for problem in schema.validate(data)] == [
+        "/Game_1/Quarters/Quarter 1/Harry Wu/Points: expected a number, got null"
+    ]
+
+def test_summary():
+    problems = schema.validate(broken_season())
+    assert schema.summary(problems, 2) == "; ".join(EXPECTED[:2]) + "; and 5 more"
+    assert schema.summary(problems) == "; ".join(EXPECTED)
+
+def test_load_keeps_the_problems(tmp_path):
+    path = write_data(tmp_path / "Database" / "Broken.json", broken_season())
+    load(path)
+    assert [str(problem) for problem in AccessData.dataset.problems] == EXPECTED
+
+    # Changes move them along: fixing a game drops its problems, breaking one adds them
+    app = load(path)
+    assert app.set_game("Game_4", make_season(1)["Game_1"]) is True
+    assert app.set_stat("Game_1", "Quarter 1", "Harry Wu", "Points", 12) is True
+    assert app.delete_game("Game_3") is True
+    # (a changed game's problems go after the rest)
+    assert sorted(str(problem) for problem in AccessData.dataset.problems) == EXPECTED[1:5]
+
+def test_strict_schema_refuses_bad_data(tmp_path, season):
+    AccessData.strict_schema = True
+    bad_game = broken_season()["Game_1"]
+    result = season.set_game("Game_9", bad_game)
+    assert result["log_level"] == "ERROR"
+    assert "/Game_9/Quarters/Quarter 1/Harry Wu/Points: expected a number, got str" in result["error"]["message"]
+    assert "Game_9" not in AccessData.data
+
+    path = write_data(tmp_path / "Database" / "Broken.json", broken_season())
+    app = AccessData.__new__(AccessData)
+    app.user_id, app.source_ip, app.request_id = "tests", None, "tests"
+    failed = app.initialize(filename=path, force=True)
+    assert failed["log_level"] == "ERROR"
+    assert "7 problem(s)" in failed["error"]["message"]
+
+def test_validate_on_load_off(tmp_path):
+    AccessData.validate_on_load = False
+    load(write_data(tmp_path / "Database" / "Broken.json", broken_season()))
+    assert AccessData.dataset.problems is None
+
+@pytest.mark.parametrize("node", ["string", 3, None])
+def test_compile_rejects_what_isnt_a_node(node):
+    with pytest.raises(TypeError):
+        schema.compile_schema(node)
@@ -0,0 +1,92 @@
+# StatCube (utils/stat_cube.py) against the dict walks it stands in for, key order included
+import json
+
+import pytest
+
+pytest.importorskip("numpy")
+from utils import binary_snapshot
+from utils.stat_cube import StatCube
+from testing.helpers import PLAYERS, make_season, walk_totals
+
+def mixed_order_season() -> dict:
+    # Lines that list their stats in different orders, leave one out, or have none at all,
+    # and a game whose quarters come in another order than the rest
+    data = make_season(4)
+    for number, game_data in enumerate(data.values()):
+        for quarter_stats in game_data["Quarters"].values():
+            for index, (player, stats) in enumerate(quarter_stats.items()):
+                items = list(stats.items())
+                kind = (number + index) % 4
+                if kind == 1:
+                    items.reverse()
+                elif kind == 2:
+                    items = [item for item in items[2:] + items[:2] if item[0] != "Assists"]
+                elif kind == 3 and index == 0:
+                    items = []
+                quarter_stats[player] = dict(items)
+    quarters = data["Game_3"]["Quarters"]
+    data["Game_3"]["Quarters"] = {name: quarters[name] for name in ("Quarter 2", "Quarter 1", "Quarter 4", "Quarter 3")}
+    return data
+
+def same(cube_result, expected):
+    # Same values and the same key order, i.e. the same JSON
+    assert json.dumps(cube_result) == json.dumps(expected)
+
+def check_against_walks(cube: StatCube, data: dict):
+    totals = walk_totals(data)
+    same(cube.team_totals(), totals)
+    same(cube.team_by_game(), {game: walk_totals(data, [game]) for game in data})
+    for player in PLAYERS:
+        same(cube.season_totals(player), totals[player])
+        same(cube.season_by_game(player), {
+            game: walk_totals(data, [game])[player] for game in data if walk_totals(data, [game]).get(player)
+        })
+        for quarter in ("Quarter 1", "Quarter 3"):
+            same(cube.quarter_totals(player, quarter), walk_totals(data, quarter=quarter).get(player, {}))
+            same(cube.quarter_by_game(player, quarter), {
+                game: walk_totals(data, [game], quarter)[player] for game in data if walk_totals(data, [game], quarter).get(player)
+            })
+    for game in data:
+        same(cube.game_totals(game), walk_totals(data, [game]))
+        for player in PLAYERS:
+            same(cube.player_game_totals(game, player), walk_totals(data, [game]).get(player))
+        quarters = cube.quarters_view(game)
+        same(list(quarters), list(data[game]["Quarters"]))
+        same(quarters.copy(), data[game]["Quarters"])
+
+def test_cube_keeps_each_lines_key_order():
+    data = mixed_order_season()
+    check_against_walks(StatCube(data), data)
+
+def test_cube_from_a_streamed_build_matches():
+    data = mixed_order_season()
+    cube = StatCube()
+    for game, game_data in data.items():
+        cube.add_game(game, game_data)
+    cube.finish()
+    check_against_walks(cube, data)
+
+def test_snapshot_keeps_the_layouts(tmp_path):
+    data = mixed_order_season()
+    path = str(tmp_path / "Season.snapshot.bin")
+    binary_snapshot.write(path, data, StatCube(data), 1, 2, "digest")
+    loaded, cube, digest = binary_snapshot.load(path, 1, 2)
+    assert digest == "digest"
+    assert not cube.layout.flags.writeable
+    check_against_walks(cube, data)
+    same({game: game_data["Quarters"].copy() for game, game_data in loaded.items()}, {game: game_data["Quarters"] for game, game_data in data.items()})
+
+def test_old_snapshot_format_is_ignored(tmp_path):
+    data = mixed_order_season()
+    path = str(tmp_path / "Season.snapshot.bin")
+    binary_snapshot.write(path, data, StatCube(data), 1, 2, "digest")
+    with open(path, "r+b") as file:
+        magic, _, length = binary_snapshot._PREFIX.unpack(file.read(binary_snapshot._PREFIX.size))
+        file.seek(0)
+        file.write(binary_snapshot._PREFIX.pack(magic, 1, length))
+    assert binary_snapshot.load(path, 1, 2) is None
+
+def test_build_gives_up_on_what_it_cant_hold():
+    data = make_season(2)
+    data["Game_2"]["Quarters"]["Quarter 1"]["Harry Wu"]["Points"] = "12"
+    assert StatCube.build(data) is None
@@ -0,0 +1,105 @@
+# The SQLite and shard backends (utils/storage.py) answer like Data.json, before and after changes
+import json
+
+import pytest
+
+from utils import interning, storage
+from utils.accessing_data import AccessData
+from utils.storage import ShardedStorage, SqliteStorage
+from testing.helpers import OPPONENT, PLAYERS, TEAM, load, make_season, write_data
+
+BACKENDS = {
+    "sqlite": (storage.to_sqlite, lambda path: SqliteStorage(path), "Season.sqlite"),
+    "shards": (storage.to_shards, lambda path: ShardedStorage(path, max_cached_games=2), "Season.shards")
+}
+
+CHANGES = [
+    ("set_stat", ("Game_2", "Quarter 1", "Harry Wu", "Points", 40)),
+    ("set_player_stats", ("Game_3", "Quarter 2", "New Kid", {"Points": 3, "Fouls": 1})),
+    ("set_quarter_stats", ("Game_4", "Overtime", {"Harry Wu": {"Points": 2}})),
+    ("set_game", ("Game_9", make_season(1, seed=3)["Game_1"])),
+    ("delete_game", ("Game_5",))
+]
+
+def answers(app: AccessData) -> str:
+    # What the getters say, as JSON so views, compact quarters and dicts compare alike
+    games = list(AccessData.snapshot().data)
+    results = [games]
+    for game in games:
+        results += [
+            app.get_details(game), app.get_lineup(game, TEAM), AccessData.get_highest_stats_game(game, "Points"),
+            AccessData.check_player(game, TEAM, "Harry Wu"), AccessData.check_player(game, OPPONENT, "Harry Wu")
+        ]
+        for quarter in ("Quarter 1", "Quarter 2"):
+            results += [AccessData.get_quarter_stats(game, quarter), AccessData.get_highest_stats_quarter(game, quarter, "Rebounds")]
+            results += [AccessData.get_specific_stats(game, quarter, player) for player in PLAYERS]
+        results += [AccessData.get_game_stats(game, player) for player in PLAYERS]
+    for player in PLAYERS + ["New Kid"]:
+        results += [
+            AccessData.get_season_stats(player), AccessData.get_season_stats(player, sum_total=True),
+            AccessData.get_quarter_season_stats(player, "Quarter 1", sum_total=True),
+            AccessData.specific_players_best_stat(player, "Points")
+        ]
+    results += [AccessData.get_team_season_stats(), AccessData.get_team_season_stats(sum_total=True)]
+    # An ERROR log (a player who sat a quarter out, ...) compares by its error, not its timestamp
+    results = [{"error": result["error"]} if isinstance(result, dict) and result.get("log_level") == "ERROR" else result for result in results]
+    return json.dumps(results, default=plain)
+
+def plain(value):
+    # Some getters hand back the exception instead of raising it
+    return repr(value) if isinstance(value, Exception) else interning.json_default(value)
+
+def change(app: AccessData):
+    for method, args in CHANGES:
+        assert getattr(app, method)(*args) is True
+
+@pytest.mark.parametrize("backend", sorted(BACKENDS))
+def test_backend_answers_like_json(backend, season, season_file, tmp_path):
+    convert, open_backend, name = BACKENDS[backend]
+    path = str(tmp_path / "Database" / name)
+    assert convert(season_file, path) == 8
+    expected = answers(season)
+
+    AccessData.use_storage(open_backend(path))
+    try:
+        assert answers(season) == expected
+        change(season)
+        changed = answers(season)
+    finally:
+        AccessData.use_storage(None)
+
+    # The same changes through the journal on Data.json
+    load(season_file)
+    change(season)
+    assert answers(season) == changed
+
+    # What the backend stored converts back to the same season
+    round_trip = str(tmp_path / "Round trip.json")
+    storage.to_json(path, round_trip)
+    with open(round_trip, encoding="utf-8") as file:
+        assert json.load(file) == AccessData.data
+
+@pytest.mark.parametrize("backend", sorted(BACKENDS))
+def test_backend_save_replaces_everything(backend, season, tmp_path):
+    convert, open_backend, name = BACKENDS[backend]
+    path = str(tmp_path / "Database" / name)
+    backend_storage = open_backend(path)
+    data = make_season(3, seed=5)
+    backend_storage.save(data)
+    assert backend_storage.load() == data
+    revision = backend_storage.revision()
+    backend_storage.save(make_season(2))
+    assert backend_storage.load() == make_season(2)
+    assert backend_storage.revision() != revision
+    backend_storage.close()
+
+def test_shards_only_read_what_they_need(tmp_path):
+    data = make_season(6)
+    path = write_data(tmp_path / "Database" / "Season.json", data)
+    directory = str(tmp_path / "Database" / "Season.shards")
+    storage.to_shards(path, directory)
+    shards = ShardedStorage(directory, max_cached_games=2)
+    assert shards.game("Game_4") == data["Game_4"]
+    assert shards.game("Game_4") == data["Game_4"]
+    assert (shards.hits, shards.misses) == (1, 1)
+    assert shards.game("Game_7") is None
@@ -0,0 +1,86 @@
+# Reading Data.json a game at a time (utils/streaming.py) gives what json.load gives, at any chunk size
+import hashlib
+import json
+
+import pytest
+
+from utils import streaming
+from testing.helpers import DATA_JSON, make_season, walk_totals, write_data
+
+CHUNK_SIZES = [1, 2, 3, 7, 64, streaming.CHUNK_SIZE]
+
+def awkward_season() -> dict:
+    # Multi-byte names that chunks cut in half, escapes, and numbers of every shape
+    data = make_season(3)
+    game_data = data["Game_2"]
+    game_data["Details"].update({"Who_was_the_ref": "Zoë \"the whistle\" Ōkubo \\ 裁判", "Court": 12345678901234567890, "Rating": -1.5e-3})
+    game_data["Quarters"]["Quarter 1"]["Émile Ñúñez"] = {"Points": 10, "Minutes": 7.25}
+    data["Game_3 ✨"] = data.pop("Game_3")
+    return data
+
+def read(path: str, chunk_size: int) -> list:
+    return list(streaming.iter_games(path, chunk_size))
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_round_trip(tmp_path, chunk_size):
+    for path in (DATA_JSON, write_data(tmp_path / "Awkward.json", awkward_season())):
+        with open(path, "rb") as file:
+            raw = file.read()
+        hasher = hashlib.sha256()
+        games = list(streaming.iter_games(path, chunk_size, hasher))
+        # Same games, same order, and the hasher saw every byte
+        assert games == list(json.loads(raw).items())
+        assert hasher.hexdigest() == hashlib.sha256(raw).hexdigest()
+
+def test_compact_and_empty_files(tmp_path):
+    data = awkward_season()
+    path = tmp_path / "Compact.json"
+    path.write_text(json.dumps(data, separators=(",", ":"), ensure_ascii=False), encoding="utf-8")
+    assert read(str(path), 3) == list(data.items())
+    path.write_text(" { \n } \n", encoding="utf-8")
+    assert read(str(path), 1) == []
+
+@pytest.mark.parametrize("text, message", [
+    ('{"Game_1": {}, "Game_1": {}}', "appears twice"),
+    ('{"Game_1": {}} {}', "Extra data"),
+    ('{"Game_1": {"Details": ', None),
+    ('{"Game_1": {}', "ended early"),
+    ('[]', "Expected"),
+    ('{1: {}}', None)
+])
+def test_bad_files(tmp_path, text, message):
+    path = tmp_path / "Bad.json"
+    path.write_text(text, encoding="utf-8")
+    with pytest.raises(ValueError, match=message):
+        read(str(path), 2)
+
+def test_buffer_stays_around_one_game(tmp_path):
+    path = write_data(tmp_path / "Season.json", make_season(40))
+    stats = {}
+    for _ in streaming.iter_games(path, 256, stats=stats):
+        pass
+    with open(path, encoding="utf-8") as file:
+        whole = len(file.read())
+    game = len(json.dumps(make_season(1)["Game_1"], indent=4))
+    assert stats["peak_buffer"] < 2 * game + 4 * 256 < whole
+
+@pytest.mark.parametrize("chunk_size", [5, streaming.CHUNK_SIZE])
+def test_ingest(tmp_path, chunk_size):
+    pytest.importorskip("numpy")
+    data = make_season(6)
+    path = write_data(tmp_path / "Season.json", data)
+    data_out, cube, digest = streaming.ingest(path, chunk_size)
+    with open(path, "rb") as file:
+        assert digest == hashlib.sha256(file.read()).hexdigest()
+    assert list(data_out) == list(data)
+    for game, game_data in data.items():
+        assert list(data_out[game]) == list(game_data)
+        assert data_out[game]["Details"] == game_data["Details"]
+        assert data_out[game]["Quarters"].copy() == game_data["Quarters"]
+    assert cube.team_totals() == walk_totals(data)
+
+def test_ingest_leaves_what_the_cube_cant_hold(tmp_path):
+    pytest.importorskip("numpy")
+    data = make_season(2)
+    data["Game_2"]["Quarters"]["Quarter 1"]["Harry Wu"]["Points"] = "12"
+    assert streaming.ingest(write_data(tmp_path / "Season.json", data), 7) is None
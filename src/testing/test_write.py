@@ -0,0 +1,177 @@
+# The JSON Lines log sink (utils/write.py): appending, reading old JSON array logs, migrating them, and rotation
+import gzip
+import json
+import os
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from utils import write
+
+@pytest.fixture(autouse=True)
+def fresh_write_state(monkeypatch):
+    # write.py remembers which logs it migrated and their rotation settings per process
+    monkeypatch.setattr(write, "_migrated", set())
+    monkeypatch.setattr(write, "_rotation", {})
+    monkeypatch.setattr(write, "_opened_day", {})
+    monkeypatch.setattr(write, "DEFAULT_ROTATION", dict(write.DEFAULT_ROTATION))
+
+def lines_of(path) -> list:
+    with open(path, encoding="utf-8") as file:
+        return file.read().splitlines()
+
+def test_entries_are_appended_as_lines(tmp_path):
+    log = str(tmp_path / "log.json")
+    write.write_to(log, {"message": "first", "where": "Ōtautahi"})
+    write.write_many(log, [{"message": "second"}, {"message": "third"}])
+    write.write_many(log, [])
+    assert lines_of(log) == [
+        '{"message": "first", "where": "Ōtautahi"}', '{"message": "second"}', '{"message": "third"}'
+    ]
+    assert [entry["message"] for entry in write.read_log(log)] == ["first", "second", "third"]
+    assert not write.is_legacy(log)
+
+def test_writing_never_reads_the_log_back(tmp_path, monkeypatch):
+    log = str(tmp_path / "log.json")
+    write.write_to(log, {"message": "first"})
+    # Once a log was checked for the old format, appending doesn't open it to read
+    def no_read(*args, **kwargs):
+        raise AssertionError("log read back")
+    monkeypatch.setattr(write, "read_log", no_read)
+    monkeypatch.setattr(write, "is_legacy", no_read)
+    for number in range(50):
+        write.write_to(log, {"number": number})
+    assert len(lines_of(log)) == 51
+
+def test_half_written_and_blank_lines_are_skipped(tmp_path):
+    log = tmp_path / "log.json"
+    log.write_text('{"message": "first"}\n\n{"message": "sec\n{"message": "third"}\n', encoding="utf-8")
+    assert [entry["message"] for entry in write.read_log(str(log))] == ["first", "third"]
+    assert list(write.read_log(str(tmp_path / "missing.json"))) == []
+
+def test_legacy_array_is_read_and_migrated(tmp_path):
+    log = tmp_path / "log.json"
+    entries = [{"message": "first"}, {"message": "second", "error": {"type": "KeyError"}}]
+    log.write_text("\n  " + json.dumps(entries, indent=2), encoding="utf-8")
+    assert write.is_legacy(str(log))
+    assert list(write.read_log(str(log))) == entries
+
+    # The first write turns it into JSON Lines, then appends
+    write.write_to(str(log), {"message": "third"})
+    assert not write.is_legacy(str(log))
+    assert list(write.read_log(str(log))) == entries + [{"message": "third"}]
+    assert write.migrate(str(log)) == 0
+    assert not (tmp_path / "log.json.tmp").exists()
+
+def test_migrate(tmp_path):
+    log = tmp_path / "log.json"
+    log.write_text(json.dumps([{"number": number} for number in range(3)]), encoding="utf-8")
+    assert write.migrate(str(log)) == 3
+    assert lines_of(log) == ['{"number": 0}', '{"number": 1}', '{"number": 2}']
+    # An empty array, and a missing file
+    log.write_text('[]', encoding="utf-8")
+    assert write.migrate(str(log)) == 0 and lines_of(log) == []
+    assert write.migrate(str(tmp_path / "missing.json")) == 0
+    assert not write.is_legacy(str(tmp_path / "missing.json"))
+
+def test_broken_legacy_file_reads_as_empty(tmp_path):
+    log = tmp_path / "log.json"
+    log.write_text('[{"message": "first"}, {"mess', encoding="utf-8")
+    assert list(write.read_log(str(log))) == []
+
+def write_numbers(log: str, numbers) -> None:
+    for number in numbers:
+        write.write_to(log, {"number": number})
+
+def numbers_in(path) -> list:
+    return [entry["number"] for entry in write.read_log(str(path))]
+
+def test_rotates_on_size(tmp_path):
+    log = str(tmp_path / "log.json")
+    write.set_rotation(log, max_bytes=60, backup_count=0)
+    write_numbers(log, range(10))
+    segments = write.list_segments(log)
+    # {"number": N}\n is 14 bytes: every fifth entry closes a segment
+    assert len(segments) == 2
+    assert all(segment.endswith(".gz") for segment in segments)
+    assert [numbers_in(segment) for segment in segments] == [[0, 1, 2, 3, 4], [5, 6, 7, 8, 9]]
+    assert not os.path.exists(log)
+    assert [entry["number"] for entry in write.read_all(log)] == list(range(10))
+
+    write_numbers(log, [10, 11])
+    assert [entry["number"] for entry in write.read_all(log)] == list(range(12))
+
+def test_keeps_the_newest_segments(tmp_path):
+    log = str(tmp_path / "log.json")
+    write.set_rotation(log, max_bytes=1, backup_count=3)
+    write_numbers(log, range(7))
+    segments = write.list_segments(log)
+    assert [numbers_in(segment) for segment in segments] == [[4], [5], [6]]
+    assert [entry["number"] for entry in write.read_all(log)] == [4, 5, 6]
+
+def test_uncompressed_segments(tmp_path):
+    log = str(tmp_path / "log.json")
+    write.set_rotation(log, max_bytes=0, compress=False)
+    write_numbers(log, range(3))
+    assert write.list_segments(log) == []
+    segment = write.rotate(log)
+    assert not segment.endswith(".gz") and numbers_in(segment) == [0, 1, 2]
+    # Nothing to close
+    assert write.rotate(log) is None
+    assert write.rotate(str(tmp_path / "missing.json")) is None
+
+def test_segment_names_sort_in_order(tmp_path, monkeypatch):
+    log = str(tmp_path / "log.json")
+    write.set_rotation(log, max_bytes=0)
+    # Rotations in the same microsecond get a longer name that still sorts after
+    class Frozen(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return datetime(2025, 8, 1, 12, 0, 0, 0)
+    monkeypatch.setattr(write, "datetime", Frozen)
+    for number in range(4):
+        write_numbers(log, [number])
+        write.rotate(log)
+    segments = write.list_segments(log)
+    assert segments[-1].endswith("log.json.20250801T120000000000000.gz")
+    assert [numbers_in(segment) for segment in segments] == [[0], [1], [2], [3]]
+    # Other files in the folder, another log's segments and the active file aren't segments
+    (tmp_path / "log.json.tmp").write_text("")
+    (tmp_path / "other.json.20250101T000000000000.gz").write_bytes(gzip.compress(b""))
+    assert write.list_segments(log) == segments
+    assert write.list_segments(str(tmp_path / "missing" / "log.json")) == []
+
+def test_rotates_when_the_day_changes(tmp_path, monkeypatch):
+    log = str(tmp_path / "log.json")
+    write.set_rotation(log, max_bytes=0, daily=True)
+    write_numbers(log, [0, 1])
+    assert write.list_segments(log) == []
+
+    class Tomorrow(date):
+        @classmethod
+        def today(cls):
+            return date.today() + timedelta(days=1)
+    monkeypatch.setattr(write, "date", Tomorrow)
+    write_numbers(log, [2, 3])
+    assert [numbers_in(segment) for segment in write.list_segments(log)] == [[0, 1]]
+    assert numbers_in(log) == [2, 3]
+
+def test_day_of_a_log_from_an_earlier_run(tmp_path):
+    # No day remembered for it yet: the file's mtime says when it was written
+    log = tmp_path / "log.json"
+    log.write_text('{"number": 0}\n', encoding="utf-8")
+    yesterday = datetime.combine(date.today() - timedelta(days=1), datetime.min.time().replace(hour=12)).timestamp()
+    os.utime(log, (yesterday, yesterday))
+    write.set_rotation(str(log), max_bytes=0, daily=True)
+    write_numbers(str(log), [1])
+    assert [numbers_in(segment) for segment in write.list_segments(str(log))] == [[0]]
+    assert numbers_in(log) == [1]
+
+def test_rotation_settings():
+    write.set_rotation("a.json", max_bytes=10)
+    assert write.get_rotation("a.json")["max_bytes"] == 10
+    assert write.get_rotation("b.json") is write.DEFAULT_ROTATION
+    write.set_rotation(backup_count=2)
+    assert write.get_rotation("b.json")["backup_count"] == 2
+    with pytest.raises(KeyError):
+        write.set_rotation("a.json", max_size=10)
@@ -1,4 +1,6 @@
+# Basketball Stats Application
 from . import write
+from . import log_writer
 from . import accessing_data
 
-__all__ = ['write', 'accessing_data']
+__all__ = ['write', 'log_writer', 'accessing_data']
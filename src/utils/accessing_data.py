@@ -2,16 +2,89 @@
 import sys
 from pathlib import Path
 try:
-    from utils import write
+    from utils import log_writer
 except ImportError:
-    import write
+    import log_writer
 try:
     from utils.logging import Logging
 except ImportError:
     from logging import Logging
+try:
+    from utils.metrics import metrics, elapsed_ms
+except ImportError:
+    from metrics import metrics, elapsed_ms
+try:
+    from utils.stat_cube import StatCube, CubeQuarter
+except ImportError:
+    from stat_cube import StatCube, CubeQuarter
+try:
+    from utils.aggregates import AggregateTables, content_hash, sidecar_path
+except ImportError:
+    from aggregates import AggregateTables, content_hash, sidecar_path
+try:
+    from utils.dataset import Dataset, FileStamp, same_stamp
+except ImportError:
+    from dataset import Dataset, FileStamp, same_stamp
+try:
+    from utils import journal
+except ImportError:
+    import journal
+try:
+    from utils.query_cache import query_cache
+except ImportError:
+    from query_cache import query_cache
+try:
+    from utils import streaming
+except ImportError:
+    import streaming
+try:
+    from utils import binary_snapshot
+except ImportError:
+    import binary_snapshot
+try:
+    from utils.storage import StorageBackend, open_storage
+except ImportError:
+    from storage import StorageBackend, open_storage
+try:
+    from utils.read_only import ListView, QuarterView, proxy
+except ImportError:
+    from read_only import ListView, QuarterView, proxy
+try:
+    from utils import interning
+except ImportError:
+    import interning
+try:
+    from utils import schema
+except ImportError:
+    import schema
+try:
+    from utils.partitions import NO_TEAM, PartitionIndex, sum_totals
+except ImportError:
+    from partitions import NO_TEAM, PartitionIndex, sum_totals
+try:
+    from utils.game_dates import GameDates
+except ImportError:
+    from game_dates import GameDates
+try:
+    from utils.player_index import PlayerIndex
+except ImportError:
+    from player_index import PlayerIndex
+try:
+    from utils import importer
+except ImportError:
+    import importer
+try:
+    from utils import save_state
+    from utils.save_state import SaveState
+except ImportError:
+    import save_state
+    from save_state import SaveState
+import functools
 import json
 import os
-import shutil
+import threading
+import time
+from collections.abc import Mapping
 from typing import Optional, Dict, Any
 from datetime import datetime, timezone
 import uuid
@@ -27,10 +100,85 @@ sys.path.insert(0, str(PROJECT_ROOT))
 logger = Logging(service_name="access_data_service", user_id="N/A")
 create_log = logger.create_log
 
+ACCESS_DATA_LOG = "C:/Users/Drags Jrs/Drags/Database/log/accessing_data_log.json"
+
+log_filter = logger.log_filter
+
+def log_action(level: str, message: str, where: str, user_id: str, source_ip: str, request_id: str, error: Dict = None) -> Dict[str, Any]:
+    # Builds the entry and hands it to the background writer, the caller never waits on disk.
+    # Filtered out entries are never built, except on error paths where the caller returns the entry.
+    if not log_filter.allow(level, where, message):
+        if error is None:
+            return None
+        return create_log(
+            level=level,
+            message=message,
+            where=where,
+            error=error,
+            user_id=user_id,
+            source_ip=source_ip,
+            request_id=request_id
+        )
+
+    log_entry = create_log(
+        level=level,
+        message=message,
+        where=where,
+        error=error,
+        user_id=user_id,
+        source_ip=source_ip,
+        request_id=request_id
+    )
+    if metrics.enabled:
+        duration_ms = elapsed_ms()
+        if duration_ms is not None:
+            log_entry["duration_ms"] = duration_ms
+    log_writer.submit(ACCESS_DATA_LOG, log_entry)
+    return log_entry
+
 class AccessData:
     data: Dict[str, Any] = {}
+    cube: Optional[StatCube] = None
+    tables: Optional[AggregateTables] = None
+    # Bumped every time the dataset is loaded or saved, cached query results from an older version are never served
+    data_version: int = 0
+    # The snapshot data/tables/cube/data_version above were taken from, swapped in one go on reload
+    dataset: Optional[Dataset] = None
+    # How often (seconds) the getters look at Data.json for changes, None = never after the first load
+    reload_interval: Optional[float] = 1.0
+    # Also compare a sha256 of the file, catches edits that keep the same size inside one mtime tick
+    verify_hash: bool = False
+    # Read Data.json game by game into the stat cube instead of keeping every quarter as dicts (read only, needs NumPy)
+    stream_load: bool = False
+    # Map <Data>.snapshot.bin (made and kept up to date from Data.json) instead of parsing, same read only views
+    snapshot_load: bool = False
+    # Check the whole dataset against utils/schema.py whenever it's loaded or saved, problems are logged
+    # as a WARNING (strict_schema: refused, initialize/save fail) and kept in dataset.problems
+    validate_on_load: bool = True
+    strict_schema: bool = False
+    # Keep each quarter's stat lines as interned rows of ints instead of a dict per player (see utils/interning.py),
+    # without the aggregate tables and cube: less memory, slower reads
+    compact_load: bool = False
+    # get_details/get_lineup/get_quarter_stats hand out read only views instead of copies (view=... per call overrides)
+    read_only_views: bool = False
+    # set_*/delete_game changes are appended to <Data>.journal.jsonl, folded into Data.json once it gets this big
+    journal_max_bytes: int = 1024 * 1024
+    compact_in_background: bool = True
+    _journal: Optional[journal.Journal] = None
+    # Which games changed since Data.json was read/written and their encoded JSON (None = nothing to go on)
+    _save_state: Optional[SaveState] = None
+    # save() keeps this many <Data.json>.<hash>.bak backups
+    backup_keep: int = save_state.BACKUP_KEEP
+    _compacting: bool = False
+    # Where the games live instead of Data.json (see use_storage), None = the JSON file
+    storage: Optional[StorageBackend] = None
+    # storage.revision() that data_version reflects / that data was loaded at
+    _storage_revision = None
+    _loaded_revision = None
     file_path: str = ""
     _initialized: bool = False
+    _checked_at: float = 0.0
+    _load_lock = threading.RLock()
     current_time = datetime.now()
     error_message = {}
     user_id: str = "N/A"
@@ -45,7 +193,7 @@ class AccessData:
 
         try:
             self.initialize()
-            log_entry = create_log(
+            log_entry = log_action(
                 level="INFO",
                 message="AccessData initialized successfully",
                 where="__init__",
@@ -53,10 +201,9 @@ class AccessData:
                 source_ip=self.source_ip,
                 request_id=self.request_id
             )
-            write.write_to("C:/Users/Drags Jrs/Drags/Database/log/accessing_data_log.json", log_entry)
         except Exception as e:
             error = {"type": type(e).__name__, 'message': str(e)}
-            log_entry = create_log(
+            log_entry = log_action(
                 level="ERROR",
                 message="AccessData initialized failed",
                 where="__init__",
@@ -65,7 +212,6 @@ class AccessData:
                 source_ip=self.source_ip,
                 request_id=self.request_id
             )
-            write.write_to("C:/Users/Drags Jrs/Drags/Database/log/accessing_data_log.json", log_entry)
             return log_entry
     def __repr__(self):
         self.error_message = {}
@@ -78,7 +224,7 @@ class AccessData:
                     for team in game["Lineup"].values():
                         player_count += len(team) if isinstance(team, list) else 0
 
-            log_entry = create_log(
+            log_entry = log_action(
                 level="INFO",
                 message="__repr__ ran successfully",
                 where="__repr__",
@@ -86,12 +232,11 @@ class AccessData:
                 source_ip=self.source_ip,
                 request_id=self.request_id
             )
-            write.write_to("C:/Users/Drags Jrs/Drags/Database/log/accessing_data_log.json", log_entry)
 
             return f"<AccessData file={self.file_path or 'Unknown'}\n games={game_count} players={player_count}>"
         except Exception as e:
             error = {"type": type(e).__name__, 'message': str(e)}
-            log_entry = create_log(
+            log_entry = log_action(
                 level="ERROR",
                 message="__repr__ failed",
                 where="__repr__",
@@ -100,7 +245,6 @@ class AccessData:
                 source_ip=self.source_ip,
                 request_id=self.request_id
             )
-            write.write_to("C:/Users/Drags Jrs/Drags/Database/log/accessing_data_log.json", log_entry)
             return log_entry
 
     def __str__(self):
@@ -114,7 +258,7 @@ class AccessData:
                     for team in game["Lineup"].values():
                         player_count += len(team) if isinstance(team, list) else 0
 
-            log_entry = create_log(
+            log_entry = log_action(
                 level="INFO",
                 message="__str__ ran successfully",
                 where="__str__",
@@ -122,13 +266,12 @@ class AccessData:
                 source_ip=self.source_ip,
                 request_id=self.request_id
             )
-            write.write_to("C:/Users/Drags Jrs/Drags/Database/log/accessing_data_log.json", log_entry)
 
             return f"File: {self.file_path or "Unknown"}\n Games Loaded: {game_count}\n Total Players: {player_count}"
 
         except Exception as e:
             error = {"type": type(e).__name__, 'message': str(e)}
-            log_entry = create_log(
+            log_entry = log_action(
                 level="ERROR",
                 message="__str__ failed",
                 where="__str__",
@@ -137,38 +280,431 @@ class AccessData:
                 source_ip=self.source_ip,
                 request_id=self.request_id
             )
-            write.write_to("C:/Users/Drags Jrs/Drags/Database/log/accessing_data_log.json", log_entry)
             return log_entry
 
+    @classmethod
+    def use_storage(cls, storage: Optional[StorageBackend]):
+        # Switches AccessData over to a storage backend (None = back to Data.json), the data is
+        # (re)loaded from it on the next call
+        if storage is not None and not isinstance(storage, StorageBackend):
+            raise TypeError("storage must be a StorageBackend")
+        with AccessData._load_lock:
+            AccessData.storage = storage
+            AccessData.dataset = None
+            AccessData._storage_revision = None
+            AccessData._loaded_revision = None
+            AccessData._initialized = False
+            AccessData.data_version += 1
+
+    @classmethod
+    def _ensure_current(cls, per_game: bool = False):
+        # What the getters the storage backend can answer with an index (or, per_game=True, from one game)
+        # call instead of _ensure_initialized: nothing gets loaded, a change made elsewhere only drops the cached results
+        storage = AccessData.storage
+        if storage is None or not (storage.indexed or (per_game and storage.per_game)):
+            cls._ensure_initialized()
+            return
+        cls.error_message = {}
+        if AccessData._storage_revision is not None and (
+            AccessData.reload_interval is None or time.monotonic() - AccessData._checked_at < AccessData.reload_interval
+        ):
+            return
+        with AccessData._load_lock:
+            AccessData._checked_at = time.monotonic()
+            revision = storage.revision()
+            if revision != AccessData._storage_revision:
+                AccessData._storage_revision = revision
+                AccessData.data_version += 1
+
     @classmethod
     def _ensure_initialized(cls):
         cls.error_message = {}
-        if not cls._initialized:
+        if not AccessData._initialized:
             cls()
-            cls._initialized = True
+            return
+
+        storage = AccessData.storage
+        # _ensure_current already saw the storage change
+        stale = storage is not None and AccessData._storage_revision != AccessData._loaded_revision
+        if not stale and (AccessData.reload_interval is None or time.monotonic() - AccessData._checked_at < AccessData.reload_interval):
+            return
+        AccessData._checked_at = time.monotonic()
+
+        if storage is not None:
+            changed = stale or storage.revision() != AccessData._loaded_revision
+            data_file = AccessData.file_path
+        else:
+            dataset = AccessData.dataset
+            if dataset is None or dataset.stamp is None:
+                return
+            stamp = dataset.stamp
+            data_file = stamp.path
+            try:
+                changed = AccessData.verify_hash or not stamp.same_file(FileStamp.of(stamp.path))
+            except OSError:
+                # File is gone (or mid-replace), keep serving what we have
+                return
+            if not changed and not same_stamp(dataset.journal, FileStamp.find(journal.journal_path(stamp.path))):
+                # Someone else appended to the journal
+                changed = True
+        if not changed:
+            return
+
+        try:
+            if AccessData._load(data_file):
+                log_entry = log_action(
+                    level="INFO",
+                    message="Data.json changed on disk, reloaded" if storage is None else "storage changed, reloaded",
+                    where="_ensure_initialized",
+                    user_id=cls.user_id,
+                    source_ip=cls.source_ip,
+                    request_id=cls.request_id
+                )
+        except Exception as e:
+            error = {"type": type(e).__name__, 'message': str(e)}
+            log_entry = log_action(
+                level="ERROR",
+                message="reload failed, still using the previous data",
+                where="_ensure_initialized",
+                error=error,
+                user_id=cls.user_id,
+                source_ip=cls.source_ip,
+                request_id=cls.request_id
+            )
+
+    @staticmethod
+    def _publish(dataset: Dataset):
+        if dataset.dates is None:
+            dataset.dates = GameDates(dataset.data)
+        if dataset.players is None:
+            dataset.players = PlayerIndex(dataset.data)
+        AccessData.dataset = dataset
+        AccessData.data = dataset.data
+        AccessData.tables = dataset.tables
+        AccessData.cube = dataset.cube
+        AccessData.data_version = dataset.version
+
+    @staticmethod
+    def _load(data_file: str, force: bool = False) -> bool:
+        # Loads data_file unless the current dataset already came from exactly that file.
+        # Returns True when a new dataset was swapped in.
+        if AccessData.storage is not None:
+            return AccessData._load_storage(force)
+        with AccessData._load_lock:
+            AccessData._checked_at = time.monotonic()
+            stamp = FileStamp.of(data_file)
+            data_journal = AccessData._journal
+            if data_journal is None or data_journal.path != journal.journal_path(data_file):
+                data_journal = journal.Journal(journal.journal_path(data_file))
+            journal_stamp = FileStamp.find(data_journal.path)
+            current = AccessData.dataset
+            loaded = current.stamp if current is not None else None
+            same_journal = current is not None and same_stamp(current.journal, journal_stamp)
+
+            if not force and not AccessData.verify_hash and stamp.same_file(loaded) and same_journal:
+                AccessData._initialized = True
+                return False
+
+            if AccessData.snapshot_load or AccessData.stream_load:
+                if AccessData.snapshot_load:
+                    loaded = binary_snapshot.load_or_build(data_file)
+                else:
+                    loaded = streaming.ingest(data_file)
+                if loaded is not None:
+                    data, cube, stamp.digest = loaded
+                    if not data_journal.entries_for(stamp.digest):
+                        AccessData._journal = data_journal
+                        AccessData._save_state = None
+                        AccessData._publish(Dataset(data, None, cube, AccessData.data_version + 1, stamp, journal_stamp, read_only=True))
+                        AccessData._initialized = True
+                        return True
+                # No NumPy, stats the cube can't hold, or a journal to replay: those need the dicts
+
+            with open(data_file, 'rb') as file:
+                raw = file.read()
+            stamp.digest = content_hash(raw)
+
+            if not force and loaded is not None and loaded.path == stamp.path and loaded.digest == stamp.digest and same_journal:
+                # Touched or rewritten with the same bytes
+                current.stamp = stamp
+                AccessData._initialized = True
+                return False
+
+            data = json.loads(raw.decode("utf-8"))
+            if not isinstance(data, dict):
+                raise ValueError("Invalid data format")
+
+            # Changes made since the last full save/compaction
+            replayed = data_journal.replay(data, stamp.digest)
+
+            problems = AccessData._check_schema(data, "initialize")
+            if AccessData.compact_load:
+                # Memory over speed: no tables or cube, both keep a total per stat line next to the rows
+                # (tables.game_quarters / quarter_games, the cube's dense arrays), the getters walk the rows
+                interning.compact(data)
+                tables = cube = None
+            else:
+                if replayed:
+                    # The sidecar tables describe Data.json alone, these include the journal
+                    tables = AggregateTables.build(data)
+                else:
+                    # The aggregate tables on disk are reused as long as Data.json is byte for byte the same
+                    tables = AggregateTables.load(sidecar_path(data_file), stamp.digest)
+                    if tables is None:
+                        tables = AggregateTables.build(data, stamp.digest)
+                        if tables is not None:
+                            tables.save(sidecar_path(data_file))
+                cube = StatCube.build(data)
+
+            AccessData._journal = data_journal
+            AccessData._save_state = SaveState(data, stamp.path, stamp.digest, clean=not replayed)
+            AccessData._publish(Dataset(data, tables, cube, AccessData.data_version + 1, stamp, FileStamp.find(data_journal.path), problems=problems))
+            AccessData._initialized = True
+            return True
+
+    @staticmethod
+    def _check_schema(data: Dict[str, Any], where: str) -> Optional[list]:
+        # Every problem with data (see utils/schema.py), None when validate_on_load is off
+        if not AccessData.validate_on_load:
+            return None
+        problems = schema.validate(data)
+        if problems:
+            if AccessData.strict_schema:
+                raise ValueError(f"{len(problems)} problem(s) in the data: {schema.summary(problems, 20)}")
+            log_action(
+                level="WARNING",
+                message=f"{len(problems)} problem(s) in the data",
+                where=where,
+                error={"type": "SchemaError", "message": schema.summary(problems, 20), "problems": [str(problem) for problem in problems]},
+                user_id=AccessData.user_id,
+                source_ip=AccessData.source_ip,
+                request_id=AccessData.request_id
+            )
+        return problems
+
+    @staticmethod
+    def _change_problems(dataset: Dataset, data: Dict[str, Any], entry: Dict[str, Any]) -> Optional[list]:
+        # dataset.problems for data (dataset.data with entry applied): only the changed game is checked again
+        if dataset.problems is None:
+            return None
+        game = entry["game"]
+        problems = [problem for problem in dataset.problems if problem.path[:1] != (game,)]
+        if game in data:
+            problems += schema.validate_game(game, data[game])
+        return problems
+
+    @staticmethod
+    def _change_tables(dataset: Dataset, data: Dict[str, Any], games) -> Optional[AggregateTables]:
+        # dataset.tables for data, where only games changed. Updates a copy, dataset keeps its own tables.
+        if dataset.tables is None:
+            return None
+        tables = dataset.tables.copy()
+        if all(tables.update_game(data, game) for game in games):
+            return tables
+        return AggregateTables.build(data)
+
+    @staticmethod
+    def _change_indexes(dataset: Dataset, data: Dict[str, Any], games) -> Dict[str, Any]:
+        # The partition, date and player indexes of dataset moved along to data, where only games changed.
+        # Like the tables each one is a copy (partitions=None stays None, it's built when a query needs it).
+        indexes = {}
+        for name in ("partitions", "dates", "players"):
+            index = getattr(dataset, name)
+            if index is not None:
+                index = index.copy()
+                for game in games:
+                    index.update_game(data, game)
+            indexes[name] = index
+        return indexes
+
+    @staticmethod
+    def _changed(dataset: Dataset, entry: Dict[str, Any], version: int, stamp, journal_stamp=None) -> Dataset:
+        # The Dataset that follows entry. dataset isn't touched, a snapshot() holding it keeps seeing
+        # the data, tables and indexes as they were. Only the changed game's path is copied (journal.applied).
+        # The cube has no cheap update, the tables and dict walks cover for it until the next load/save.
+        data = journal.applied(dataset.data, entry)
+        games = (entry["game"],)
+        return Dataset(
+            data, AccessData._change_tables(dataset, data, games), None, version, stamp, journal_stamp,
+            problems=AccessData._change_problems(dataset, data, entry),
+            **AccessData._change_indexes(dataset, data, games)
+        )
+
+    # The helpers below take the dataset a getter read once (dataset = AccessData.dataset), so a reload
+    # in the middle of a call can't pair one dataset's data with another's tables, cube or indexes
+
+    @classmethod
+    def _partitions(cls, dataset: Dataset) -> PartitionIndex:
+        if dataset.partitions is None:
+            dataset.partitions = PartitionIndex(dataset.data)
+        return dataset.partitions
+
+    @staticmethod
+    def _check_filters(season, team):
+        if season is not None and (isinstance(season, bool) or not isinstance(season, (str, int))):
+            raise TypeError("season must be a string or an int")
+        if team is not None and not isinstance(team, str):
+            raise TypeError("team must be a string")
+
+    @classmethod
+    def _select_games(cls, dataset: Dataset, season=None, team: Optional[str] = None, start=None, end=None) -> list:
+        # The games a season / team / date window filter leaves, in data order
+        if start is None and end is None:
+            return cls._partitions(dataset).games(season, team)
+        in_window = dataset.dates.between(start, end, data_order=True)
+        if season is None and team is None:
+            return in_window
+        in_window = set(in_window)
+        return [game for game in cls._partitions(dataset).games(season, team) if game in in_window]
+
+    @classmethod
+    def _team_name(cls, dataset: Dataset, season=None, team: Optional[str] = None) -> str:
+        # Heading for team rollups: the team asked for, or the one team in the matching games
+        if team is None:
+            teams = cls._partitions(dataset).teams(season)
+            team = teams[0] if len(teams) == 1 and teams[0] != NO_TEAM else "All teams"
+        return team if season is None else f"{team} {season}"
+
+    @classmethod
+    def _game_player_totals(cls, dataset: Dataset, game: str) -> Dict[str, Dict[str, Any]]:
+        # player -> stat total for one game, read only (the partition rollups sum these)
+        tables, cube = dataset.tables, dataset.cube
+        if tables is not None and game in tables.games:
+            return tables.games[game]
+        if cube is not None and game in cube.game_index:
+            return cube.game_totals(game)
+        totals = {}
+        for quarter_stats in cls._quarters(dataset, dataset.data[game]).values():
+            for player, stats in quarter_stats.items():
+                player_totals = totals.setdefault(player, {})
+                for stat_name, stat_value in stats.items():
+                    player_totals[stat_name] = player_totals.get(stat_name, 0) + stat_value
+        return totals
+
+    @classmethod
+    def _player_by_game(cls, dataset: Dataset, player: str, games, quarter: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        # game -> player's stat totals (in quarter, when given) for the games listed, only games where they recorded something
+        game_totals = {}
+        tables = dataset.tables
+        if tables is not None:
+            if quarter is None:
+                source = tables.players.get(player, {})
+            else:
+                source = tables.quarter_games.get(player, {}).get(quarter, {})
+            for game in games:
+                if game in source:
+                    game_totals[game] = dict(source[game])
+            return game_totals
+        for game in games:
+            quarters = cls._quarters(dataset, dataset.data[game])
+            totals = {}
+            for quarter_name in ((quarter,) if quarter is not None else quarters):
+                quarter_stats = quarters.get(quarter_name)
+                if quarter_stats is not None and player in quarter_stats:
+                    for stat_name, stat_value in quarter_stats[player].items():
+                        totals[stat_name] = totals.get(stat_name, 0) + stat_value
+            if totals:
+                game_totals[game] = totals
+        return game_totals
+
+    @staticmethod
+    def _check_players(players) -> Optional[list]:
+        # The players argument of the *_many methods: None (everyone) or a list / tuple / set of names
+        if players is None:
+            return None
+        if isinstance(players, str) or not isinstance(players, (list, tuple, set, frozenset)):
+            raise TypeError("players must be a list of strings (or None for every player)")
+        if not all(isinstance(player, str) for player in players):
+            raise TypeError("players must be a list of strings (or None for every player)")
+        return list(dict.fromkeys(players))
+
+    @staticmethod
+    def _players_key(players):
+        # A list or set of players as a tuple: the *_many methods are cached on their arguments, and a list can't be a key
+        return tuple(players) if isinstance(players, (list, set)) else players
+
+    @staticmethod
+    def _by_player(players: Optional[list], found: Dict[str, Any], empty) -> Dict[str, Any]:
+        # found keyed like players asked for it: everyone found (None), or each player asked for, empty() when they weren't
+        if players is None:
+            return found
+        return {player: found[player] if player in found else empty() for player in players}
+
+    @staticmethod
+    def _check_change(entry: Dict[str, Any]):
+        # Only a whole new game can break the schema, journal.check covers what every other change holds
+        if AccessData.strict_schema and entry["op"] == "set_game":
+            problems = schema.validate_game(entry["game"], entry["value"])
+            if problems:
+                raise ValueError(f"{len(problems)} problem(s) in the game: {schema.summary(problems, 20)}")
+
+    @classmethod
+    def _quarters(cls, dataset: Optional[Dataset], game_stats: Dict[str, Any]):
+        # A game's Quarters. Data that passed the schema check has them, anything else is checked here.
+        if dataset is not None and dataset.problems == [] and AccessData.storage is None:
+            return game_stats["Quarters"]
+        quarters = game_stats.get("Quarters")
+        if not isinstance(quarters, Mapping):
+            raise KeyError("Quarters not found")
+        return quarters
+
+    @classmethod
+    def _game(cls, dataset: Optional[Dataset], game: str) -> Optional[Dict[str, Any]]:
+        # One game's dict, read from its own file when the storage keeps one per game (the rest stays on disk)
+        storage = AccessData.storage
+        if storage is not None and storage.per_game:
+            return storage.game(game)
+        return dataset.data.get(game)
+
+    @staticmethod
+    def _load_storage(force: bool = False) -> bool:
+        # _load() for a storage backend: everything in memory, at the storage's current revision.
+        # No sidecar or journal, the backend keeps its own changes.
+        with AccessData._load_lock:
+            AccessData._checked_at = time.monotonic()
+            storage = AccessData.storage
+            revision = storage.revision()
+            if not force and AccessData.dataset is not None and revision == AccessData._loaded_revision:
+                AccessData._initialized = True
+                return False
+
+            data = storage.load()
+            problems = AccessData._check_schema(data, "initialize")
+            AccessData._save_state = None
+            AccessData._publish(Dataset(data, AggregateTables.build(data), StatCube.build(data), AccessData.data_version + 1, None, problems=problems))
+            AccessData._storage_revision = AccessData._loaded_revision = revision
+            AccessData._initialized = True
+            return True
 
-    def initialize(self, load: bool = False, filename: str = "Data.json") -> Optional[Dict[str, Any]]:
+    @classmethod
+    def snapshot(cls) -> Optional[Dataset]:
+        # The current dataset as one object, for callers that read data/tables/cube together and
+        # must not see half of a reload
+        cls._ensure_initialized()
+        return AccessData.dataset
+
+    def initialize(self, load: bool = False, filename: str = "Data.json", force: bool = False) -> Optional[Dict[str, Any]]:
         if not isinstance(load, bool):
             raise TypeError('load must be a bool')
 
         if not isinstance(filename, str):
             raise TypeError('filename must be a str')
 
+        if not isinstance(force, bool):
+            raise TypeError('force must be a bool')
+
         base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
         data_file = os.path.abspath(os.path.join(base_dir, "Database", filename))
         self.file_path = data_file
 
-        if not os.path.isfile(data_file):
+        if AccessData.storage is None and not os.path.isfile(data_file):
             raise FileNotFoundError("Could not find the file. Or wrong data format")
 
         try:
-            with open(data_file, 'r', encoding="utf-8") as file:
-                data = json.load(file)
-                if not isinstance(data, dict):
-                    raise ValueError("Invalid data format")
-                AccessData.data = data
+            # Nearly free when this exact file is already loaded and hasn't changed
+            AccessData._load(data_file, force)
 
-            log_entry = create_log(
+            log_entry = log_action(
                             level="INFO",
                             message="initialize ran successfully",
                             where="initialize",
@@ -176,14 +712,13 @@ class AccessData:
                             source_ip=self.source_ip,
                             request_id=self.request_id
                         )
-            write.write_to("C:/Users/Drags Jrs/Drags/Database/log/accessing_data_log.json", log_entry)
 
             if load:
                 return AccessData.data
 
         except Exception as e:
             error = {"type": type(e).__name__, 'message': str(e)}
-            log_entry = create_log(
+            log_entry = log_action(
                 level="ERROR",
                 message="initialize failed",
                 where="initialize",
@@ -192,13 +727,15 @@ class AccessData:
                 source_ip=self.source_ip,
                 request_id=self.request_id
             )
-            write.write_to("C:/Users/Drags Jrs/Drags/Database/log/accessing_data_log.json", log_entry)
             return log_entry
 
     def save(self, filename: Optional[str] = None, backup: bool = True) -> bool:
         if not isinstance(self.data, dict):
             raise TypeError('self.data must be a dict')
 
+        if AccessData.dataset is not None and AccessData.dataset.read_only and self.data is AccessData.dataset.data:
+            raise TypeError('data loaded with stream_load / snapshot_load is read only, load it normally to change it')
+
         save_path = filename or self.file_path
         if not save_path:
             raise TypeError('File path not set')
@@ -206,17 +743,12 @@ class AccessData:
         os.makedirs(os.path.dirname(save_path), exist_ok=True)
 
         try:
-            if backup and os.path.exists(save_path):
-                backup_path = f"{save_path}.bak"
-                shutil.copy2(save_path, backup_path)
-
-            temp_path = f"{save_path}.tmp"
-            with open(temp_path, "w", encoding="utf-8") as temp_file:
-                json.dump(self.data, temp_file, indent=4, ensure_ascii=False)
-
-            os.replace(temp_path, save_path)
+            if AccessData.storage is not None and filename is None:
+                AccessData._save_storage(self.data, backup)
+            else:
+                AccessData._save_file(self.data, save_path, backup)
 
-            log_entry = create_log(
+            log_entry = log_action(
                             level="INFO",
                             message="save ran successfully",
                             where="save",
@@ -224,12 +756,11 @@ class AccessData:
                             source_ip=self.source_ip,
                             request_id=self.request_id
                         )
-            write.write_to("C:/Users/Drags Jrs/Drags/Database/log/accessing_data_log.json", log_entry)
 
             return True
         except Exception as e:
             error = {"type": type(e).__name__, 'message': str(e)}
-            log_entry = create_log(
+            log_entry = log_action(
                 level="ERROR",
                 message="save failed",
                 where="save",
@@ -238,24 +769,378 @@ class AccessData:
                 source_ip=self.source_ip,
                 request_id=self.request_id
             )
-            write.write_to("C:/Users/Drags Jrs/Drags/Database/log/accessing_data_log.json", log_entry)
             return log_entry
 
-    def get_details(self, game: str):
+    @staticmethod
+    def _save_file(data: Dict[str, Any], save_path: str, backup: bool):
+        # save() to a JSON file. Held the whole way so no journaled change can slip in between the dump and the journal reset.
+        with AccessData._load_lock:
+            target = os.path.abspath(save_path)
+            current = AccessData.dataset
+            # The digest of what's in the file now, when it's still the file we read/wrote last
+            on_disk = None
+            if current is not None and current.stamp is not None and current.stamp.path == target and os.path.exists(target):
+                if FileStamp.of(target).same_file(current.stamp):
+                    on_disk = current.stamp.digest
+
+            state = AccessData._save_state
+            # The loaded data, or a dict the save state was moved() to from it: only the games encoded again differ
+            follows = current is not None and (current.data is data or (state is not None and state.data is data))
+            if state is None or state.data is not data:
+                state = SaveState(data, target, None, clean=False)
+            # Only games that changed since the last save are encoded again
+            raw = state.encode(data)
+            digest = content_hash(raw)
+            if digest == on_disk and state.clean and current.data is data:
+                # Nothing changed since Data.json was read or written, edits made in place included
+                return
+
+            problems = AccessData._check_schema(data, "save")
+
+            if digest != on_disk:
+                if backup and os.path.exists(save_path):
+                    old_digest = on_disk
+                    if old_digest is None:
+                        with open(save_path, 'rb') as file:
+                            old_digest = content_hash(file.read())
+                    save_state.backup(save_path, old_digest, AccessData.backup_keep)
+
+                temp_path = f"{save_path}.tmp"
+                with open(temp_path, "wb") as temp_file:
+                    temp_file.write(raw)
+
+                os.replace(temp_path, save_path)
+
+            # The loaded tables (and indexes, below) only need the games that were encoded again, unless that's most of them
+            moved = follows and len(state.changed) * 4 <= len(data)
+            if AccessData.compact_load:
+                # Loaded without tables or cube (see _load), saving doesn't bring them back
+                tables = cube = None
+            else:
+                tables = AccessData._change_tables(current, data, state.changed) if moved else None
+                if tables is not None:
+                    tables.source_hash = digest
+                else:
+                    tables = AggregateTables.build(data, digest)
+                if tables is not None:
+                    tables.save(sidecar_path(save_path))
+                cube = StatCube.build(data)
+            # What we just wrote is what's in memory, don't reload it on the next check
+            stamp = FileStamp.of(target, digest)
+            journal_stamp = current.journal if current is not None else None
+            if current is not None and current.stamp is not None and current.stamp.path != stamp.path:
+                stamp = current.stamp
+                if state.path != stamp.path:
+                    # Saved somewhere else, the loaded file still has whatever it had
+                    state = SaveState(data, stamp.path, stamp.digest, clean=False)
+            else:
+                state.written(data, target, digest)
+                if AccessData._journal is not None and AccessData._journal.path == journal.journal_path(stamp.path):
+                    # Everything in the journal is in the new Data.json now
+                    AccessData._journal.reset(digest)
+                    journal_stamp = FileStamp.find(AccessData._journal.path)
+            AccessData._save_state = state
+            # Same for the partition, date and player indexes, None has them built again
+            indexes = AccessData._change_indexes(current, data, state.changed) if moved else {}
+            AccessData._publish(Dataset(
+                data, tables, cube, AccessData.data_version + 1, stamp, journal_stamp,
+                problems=problems, **indexes
+            ))
+
+    @classmethod
+    def mark_changed(cls, game: Optional[str] = None):
+        # The next save() encodes game again (None = every game). Not needed for correctness: replaced games
+        # are noticed by identity and edits made in place by each game's fingerprint (utils/save_state.py).
+        state = AccessData._save_state
+        if state is not None:
+            state.mark(game)
+
+    @staticmethod
+    def _save_storage(data: Dict[str, Any], backup: bool):
+        # save() with a storage backend: one transaction, what's in memory is then exactly what's stored
+        with AccessData._load_lock:
+            storage = AccessData.storage
+            if AccessData.dataset is None:
+                # Would replace everything stored with an empty season
+                raise RuntimeError("No data loaded")
+            problems = AccessData._check_schema(data, "save")
+            if backup:
+                storage.backup()
+            storage.save(data)
+            AccessData._publish(Dataset(data, AggregateTables.build(data), StatCube.build(data), AccessData.data_version + 1, None, problems=problems))
+            AccessData._storage_revision = AccessData._loaded_revision = storage.revision()
+
+    def _journal_change(self, entry: Dict[str, Any], where: str):
+        # One change: checked, appended to the journal, applied in memory. Cost is the size of the change,
+        # Data.json itself is only rewritten by save() or when the journal gets compacted.
         try:
+            if AccessData.storage is not None:
+                self._storage_change(entry)
+                compact = False
+            else:
+                compact = self._file_change(entry)
+
+            if compact:
+                self.compact_journal(background=AccessData.compact_in_background)
+
+            log_entry = log_action(
+                level="INFO",
+                message=f"{where} ran successfully",
+                where=where,
+                user_id=self.user_id,
+                source_ip=self.source_ip,
+                request_id=self.request_id
+            )
+            return True
+        except Exception as e:
+            error = {"type": type(e).__name__, 'message': str(e)}
+            log_entry = log_action(
+                level="ERROR",
+                message=f"{where} failed",
+                where=where,
+                error=error,
+                user_id=self.user_id,
+                source_ip=self.source_ip,
+                request_id=self.request_id
+            )
+            return log_entry
+
+    def _storage_change(self, entry: Dict[str, Any]):
+        # The backend checks and stores it, the in-memory copy (if one was loaded) gets the same change
+        self._ensure_current()
+        with AccessData._load_lock:
+            entry = json.loads(json.dumps(entry, ensure_ascii=False))
+            AccessData._check_change(entry)
+            # Only patch the in-memory copy when nobody else wrote since it was loaded
+            in_sync = AccessData.storage.revision() == AccessData._loaded_revision
+            AccessData.storage.apply(entry)
+            revision = AccessData.storage.revision()
+            dataset = AccessData.dataset
+            if dataset is not None and in_sync:
+                AccessData._publish(AccessData._changed(dataset, entry, AccessData.data_version + 1, None))
+                AccessData._loaded_revision = revision
+            else:
+                AccessData.data_version += 1
+            AccessData._storage_revision = revision
+
+    def _file_change(self, entry: Dict[str, Any]) -> bool:
+        # Returns True when the journal is big enough to be compacted
+        self._ensure_initialized()
+        with AccessData._load_lock:
+            dataset = AccessData.dataset
+            if dataset is None or dataset.stamp is None or AccessData._journal is None:
+                raise RuntimeError("No data loaded")
+            if dataset.read_only:
+                raise TypeError("data loaded with stream_load / snapshot_load is read only, load it normally to change it")
+
+            # Our own copy, and proof it can be written as JSON
+            entry = json.loads(json.dumps(entry, ensure_ascii=False))
+            journal.check(dataset.data, entry)
+            AccessData._check_change(entry)
+            AccessData._journal.append([entry], dataset.stamp.digest)
+            changed = AccessData._changed(
+                dataset, entry, AccessData.data_version + 1, dataset.stamp, FileStamp.find(AccessData._journal.path)
+            )
+            # The changed game is a new dict in the new data, save() encodes it again and reuses the rest
+            state = AccessData._save_state
+            if state is not None and state.data is dataset.data:
+                state.moved(changed.data)
+            AccessData._publish(changed)
+            return AccessData._journal.size() >= AccessData.journal_max_bytes
+
+    def set_game(self, game: str, game_data: Dict[str, Any]):
+        # Adds a game or replaces it whole
+        return self._journal_change({"op": "set_game", "game": game, "value": game_data}, "set_game")
+
+    def delete_game(self, game: str):
+        return self._journal_change({"op": "delete_game", "game": game}, "delete_game")
+
+    def set_quarter_stats(self, game: str, quarter: str, quarter_stats: Dict[str, Dict[str, Any]]):
+        # quarter_stats: {player: {stat: value}}, adds the quarter if it's new
+        return self._journal_change({"op": "set_quarter", "game": game, "quarter": quarter, "value": quarter_stats}, "set_quarter_stats")
+
+    def set_player_stats(self, game: str, quarter: str, player: str, stats: Dict[str, Any]):
+        # stats: {stat: value}, adds the player to the quarter if they're new
+        return self._journal_change({"op": "set_player", "game": game, "quarter": quarter, "player": player, "value": stats}, "set_player_stats")
+
+    def set_stat(self, game: str, quarter: str, player: str, stat: str, value):
+        return self._journal_change(
+            {"op": "set_stat", "game": game, "quarter": quarter, "player": player, "stat": stat, "value": value}, "set_stat"
+        )
+
+    def import_box_scores(self, paths, backup: bool = True):
+        # Box score CSV files (see utils/importer.py) merged into the data as one change: every row is
+        # checked first, then all the games are swapped in and saved once. Nothing changes if anything fails.
+        # Returns the counts and rows_per_sec, or the ERROR log (with every bad row in error["problems"]).
+        where = "import_box_scores"
+        try:
+            if isinstance(paths, str):
+                paths = [paths]
+            if not all(isinstance(path, str) for path in paths):
+                raise TypeError("paths must be strings")
             self._ensure_initialized()
+            started = time.perf_counter()
+
+            batch = importer.read(paths)
+            if batch.problems:
+                error = {
+                    "type": "ValueError",
+                    "message": f"{len(batch.problems)} problem(s) in the box scores: " + "; ".join(str(problem) for problem in batch.problems[:20]),
+                    "problems": [str(problem) for problem in batch.problems]
+                }
+                return log_action(
+                    level="ERROR",
+                    message=f"{where} failed",
+                    where=where,
+                    error=error,
+                    user_id=self.user_id,
+                    source_ip=self.source_ip,
+                    request_id=self.request_id
+                )
+
+            with AccessData._load_lock:
+                dataset = AccessData.dataset
+                if dataset is None or (AccessData.storage is None and dataset.stamp is None):
+                    raise RuntimeError("No data loaded")
+                if dataset.read_only:
+                    raise TypeError("data loaded with stream_load / snapshot_load is read only, load it normally to change it")
+                data = dataset.data
+                merged = importer.merge(data, batch)
+                if AccessData.strict_schema:
+                    problems = [problem for game, game_data in merged.items() for problem in schema.validate_game(game, game_data)]
+                    if problems:
+                        raise ValueError(f"{len(problems)} problem(s) in the merged games: {schema.summary(problems, 20)}")
+
+                # A new dict for the save to publish, dataset (and a snapshot() of it) keeps the old games
+                data = {**data, **merged}
+                state = AccessData._save_state
+                if AccessData.storage is None and state is not None and state.data is dataset.data:
+                    state.moved(data)
+                try:
+                    if AccessData.storage is not None:
+                        AccessData._save_storage(data, backup)
+                    else:
+                        AccessData._save_file(data, dataset.stamp.path, backup)
+                except Exception:
+                    if state is not None and state.data is data:
+                        state.moved(dataset.data)
+                    raise
+
+            result = importer.report(batch, merged, time.perf_counter() - started)
+            log_entry = log_action(
+                level="INFO",
+                message=f"{where} ran successfully: {result['rows']} rows, {result['games']} games, {result['rows_per_sec']} rows/s",
+                where=where,
+                user_id=self.user_id,
+                source_ip=self.source_ip,
+                request_id=self.request_id
+            )
+            return result
+        except Exception as e:
+            error = {"type": type(e).__name__, 'message': str(e)}
+            log_entry = log_action(
+                level="ERROR",
+                message=f"{where} failed",
+                where=where,
+                error=error,
+                user_id=self.user_id,
+                source_ip=self.source_ip,
+                request_id=self.request_id
+            )
+            return log_entry
+
+    def compact_journal(self, background: bool = False) -> bool:
+        # Folds the journal into a new Data.json. The dump happens under the lock, the (slow) write doesn't,
+        # changes made while it's being written stay in the journal on top of the new snapshot.
+        # A save() (or anything else replacing Data.json) during the write wins: the dump is thrown away.
+        with AccessData._load_lock:
+            data_journal = AccessData._journal
+            dataset = AccessData.dataset
+            if AccessData._compacting or AccessData.storage is not None or data_journal is None or dataset is None or dataset.stamp is None:
+                return False
+            entries = data_journal.entries_for(dataset.stamp.digest) if data_journal.size() else []
+            if not entries:
+                return False
+            AccessData._compacting = True
+            state = AccessData._save_state
+            if state is not None and state.data is dataset.data:
+                raw = state.encode(dataset.data)
+            else:
+                raw = json.dumps(dataset.data, indent=4, ensure_ascii=False, default=interning.json_default).encode("utf-8")
+            offset = data_journal.size()
+            base = dataset.stamp
+            data_file = base.path
+
+        def run() -> bool:
+            swapped = False
+            try:
+                digest = content_hash(raw)
+                temp_path = data_journal.write_snapshot(data_file, raw)
+                with AccessData._load_lock:
+                    if base.same_file(FileStamp.find(data_file)):
+                        swapped = data_journal.swap(data_file, temp_path, digest, offset, base.digest)
+                    else:
+                        os.remove(temp_path)
+                    current = AccessData.dataset
+                    if swapped and current is not None and current.stamp is not None and current.stamp.path == data_file:
+                        current.stamp = FileStamp.of(data_file, digest)
+                        current.journal = FileStamp.find(data_journal.path)
+
+                if swapped:
+                    log_entry = log_action(
+                        level="INFO",
+                        message="compact_journal ran successfully",
+                        where="compact_journal",
+                        user_id=self.user_id,
+                        source_ip=self.source_ip,
+                        request_id=self.request_id
+                    )
+                else:
+                    log_entry = log_action(
+                        level="WARNING",
+                        message="compact_journal skipped, Data.json was replaced while compacting",
+                        where="compact_journal",
+                        user_id=self.user_id,
+                        source_ip=self.source_ip,
+                        request_id=self.request_id
+                    )
+            except Exception as e:
+                error = {"type": type(e).__name__, 'message': str(e)}
+                log_entry = log_action(
+                    level="ERROR",
+                    message="compact_journal failed",
+                    where="compact_journal",
+                    error=error,
+                    user_id=self.user_id,
+                    source_ip=self.source_ip,
+                    request_id=self.request_id
+                )
+            finally:
+                AccessData._compacting = False
+            return swapped
+
+        if background:
+            # Not a daemon, so a compaction in progress gets to finish before the interpreter exits
+            threading.Thread(target=run, name="journal-compaction").start()
+            return True
+        return run()
+
+    def get_details(self, game: str, view: Optional[bool] = None):
+        try:
+            self._ensure_current(per_game=True)
+            dataset = AccessData.dataset
 
             if not isinstance(game, str):
                 raise TypeError("game must be a string")
 
-            if not game or game not in self.data:
-                raise KeyError("Could not find the game")
+            game_stats = self._game(dataset, game) if game else None
 
-            game_stats = self.data.get(game, {})
+            if game_stats is None:
+                raise KeyError("Could not find the game")
 
             details = game_stats.get("Details", {})
 
-            log_entry = create_log(
+            log_entry = log_action(
                         level="INFO",
                         message="get_details ran successfully",
                         where="get_details",
@@ -263,12 +1148,13 @@ class AccessData:
                         source_ip=self.source_ip,
                         request_id=self.request_id
                     )
-            write.write_to("C:/Users/Drags Jrs/Drags/Database/log/accessing_data_log.json", log_entry)
+            if AccessData.read_only_views if view is None else view:
+                return proxy(details)
             return details.copy()
 
         except Exception as e:
             error = {"type": type(e).__name__, 'message': str(e)}
-            log_entry = create_log(
+            log_entry = log_action(
                 level="ERROR",
                 message="get_details failed",
                 where="get_details",
@@ -277,12 +1163,12 @@ class AccessData:
                 source_ip=self.source_ip,
                 request_id=self.request_id
             )
-            write.write_to("C:/Users/Drags Jrs/Drags/Database/log/accessing_data_log.json", log_entry)
             return log_entry
 
-    def get_lineup(self, game: str, team: str):
+    def get_lineup(self, game: str, team: str, view: Optional[bool] = None):
         try:
-            self._ensure_initialized()
+            self._ensure_current(per_game=True)
+            dataset = AccessData.dataset
 
             if not isinstance(game, str):
                 raise TypeError("game must be a string")
@@ -290,7 +1176,7 @@ class AccessData:
             if not isinstance(team, str):
                 raise TypeError("team must be a string")
 
-            game_stats = self.data.get(game, {})
+            game_stats = self._game(dataset, game) or {}
 
             if not game_stats:
                 raise KeyError("Could not find the game")
@@ -299,7 +1185,7 @@ class AccessData:
 
             if not team_players:
                 raise KeyError("Could not find the team")
-            log_entry = create_log(
+            log_entry = log_action(
                         level="INFO",
                         message="get_lineup ran successfully",
                         where="get_lineup",
@@ -307,13 +1193,14 @@ class AccessData:
                         source_ip=self.source_ip,
                         request_id=self.request_id
                     )
-            write.write_to("C:/Users/Drags Jrs/Drags/Database/log/accessing_data_log.json", log_entry)
 
+            if AccessData.read_only_views if view is None else view:
+                return ListView(team_players)
             return team_players.copy()
 
         except Exception as e:
             error = {"type": type(e).__name__, 'message': str(e)}
-            log_entry = create_log(
+            log_entry = log_action(
                   level="ERROR",
                   message="get_lineup failed",
                   where="get_lineup",
@@ -322,14 +1209,14 @@ class AccessData:
                   source_ip=self.source_ip,
                   request_id=self.request_id
               )
-            write.write_to("C:/Users/Drags Jrs/Drags/Database/log/accessing_data_log.json", log_entry)
 
             return log_entry
 
     @classmethod
-    def get_quarter_stats(cls, game: str, quarter: str):
+    def get_quarter_stats(cls, game: str, quarter: str, view: Optional[bool] = None):
         try:
-            cls._ensure_initialized()
+            cls._ensure_current(per_game=True)
+            dataset = AccessData.dataset
 
             if not isinstance(game, str):
                 raise TypeError("game must be a string")
@@ -337,18 +1224,18 @@ class AccessData:
             if not isinstance(quarter, str):
                 raise TypeError("quarter must be a string")
 
-            game_stats = cls.data.get(game, {})
+            game_stats = cls._game(dataset, game) or {}
 
             if not game_stats:
                 raise KeyError("Could not find the game")
 
-            quarters = game_stats.get("Quarters")
+            quarters = cls._quarters(dataset, game_stats)
             quarter_stats = quarters.get(quarter, {})
 
             if not quarter_stats:
                 raise KeyError("Could not find the quarter")
 
-            log_entry = create_log(
+            log_entry = log_action(
                         level="INFO",
                         message="get_quarter_stats ran successfully",
                         where="get_quarter_stats",
@@ -356,12 +1243,14 @@ class AccessData:
                         source_ip=cls.source_ip,
                         request_id=cls.request_id
                     )
-            write.write_to("C:/Users/Drags Jrs/Drags/Database/log/accessing_data_log.json", log_entry)
 
+            if cls.read_only_views if view is None else view:
+                # Cube backed quarters are read only views already
+                return quarter_stats if isinstance(quarter_stats, CubeQuarter) else QuarterView(quarter_stats)
             return quarter_stats.copy()
         except Exception as e:
             error = {"type": type(e).__name__, 'message': str(e)}
-            log_entry = create_log(
+            log_entry = log_action(
                 level="ERROR",
                 message="get_quarter_stats failed",
                 where="get_quarter_stats",
@@ -370,13 +1259,13 @@ class AccessData:
                 source_ip=cls.source_ip,
                 request_id=cls.request_id
             )
-            write.write_to("C:/Users/Drags Jrs/Drags/Database/log/accessing_data_log.json", log_entry)
             return log_entry
 
     @classmethod
     def get_specific_stats(cls, game: str, quarter: str, player: str):
         try:
-            cls._ensure_initialized()
+            cls._ensure_current()
+            dataset = AccessData.dataset
 
             if not isinstance(game, str):
                 raise TypeError("game must be a string")
@@ -387,21 +1276,27 @@ class AccessData:
             if not isinstance(player, str):
                 raise TypeError("player must be a string")
 
-            game_stats = cls.data.get(game, {})
+            if cls.storage is not None and cls.storage.indexed:
+                players_stats = cls.storage.specific_stats(game, quarter, player)
+            else:
+                game_stats = dataset.data.get(game, {})
 
-            if not game_stats:
-                raise KeyError("Could not find the game")
+                if not game_stats:
+                    raise KeyError("Could not find the game")
 
-            quarter_stats = game_stats.get("Quarters").get(quarter, {})
-            if not quarter_stats:
-                raise KeyError("Could not find the quarter")
+                quarter_stats = cls._quarters(dataset, game_stats).get(quarter, {})
+                if not quarter_stats:
+                    raise KeyError("Could not find the quarter")
 
-            players_stats = quarter_stats.get(player, {})
-            if not players_stats:
-                raise KeyError("Could not find the player")
+                players_stats = quarter_stats.get(player, {})
+                if not players_stats:
+                    raise KeyError("Could not find the player")
+                if not isinstance(players_stats, dict):
+                    # A compact stat line (see utils/interning.py), callers get the dict it stands for
+                    players_stats = players_stats.copy()
 
 
-            log_entry = create_log(
+            log_entry = log_action(
                         level="INFO",
                         message="get_specific_stats ran successfully",
                         where="get_specific_stats",
@@ -409,12 +1304,11 @@ class AccessData:
                         source_ip=cls.source_ip,
                         request_id=cls.request_id
                     )
-            write.write_to("C:/Users/Drags Jrs/Drags/Database/log/accessing_data_log.json", log_entry)
 
             return players_stats
         except Exception as e:
             error = {"type": type(e).__name__, 'message': str(e)}
-            log_entry = create_log(
+            log_entry = log_action(
                 level="ERROR",
                 message="get_specific_stats failed",
                 where="get_specific_stats",
@@ -423,13 +1317,14 @@ class AccessData:
                 source_ip=cls.source_ip,
                 request_id=cls.request_id
             )
-            write.write_to("C:/Users/Drags Jrs/Drags/Database/log/accessing_data_log.json", log_entry)
             return log_entry
 
     @classmethod
+    @query_cache.cached
     def get_game_stats(cls, game: str, player: str, look_good: bool = False): # Original name: get_total_stats sums up a games stats
         try:
             cls._ensure_initialized()
+            dataset = AccessData.dataset
 
             if not isinstance(game, str):
                 raise TypeError("game must be a string")
@@ -440,27 +1335,36 @@ class AccessData:
             if not isinstance(look_good, bool):
                 raise TypeError("look_good must be a bool")
 
-            game_stats = cls.data.get(game, {})
+            game_stats = dataset.data.get(game, {})
 
             if not game_stats:
                 raise KeyError("Could not find the game")
 
-            quarters = game_stats.get("Quarters", {})
+            quarters = cls._quarters(dataset, game_stats)
             if not quarters:
                 raise KeyError("Quarters not found")
 
             totals = {}
 
-            for _, quarter_stats in quarters.items():
-                for player_name, stats in quarter_stats.items():
-                    if player and player_name != player:
-                        continue
+            source = dataset.tables if dataset.tables is not None else dataset.cube
+            if source is not None:
+                if player:
+                    player_totals = source.player_game_totals(game, player)
+                    if player_totals is not None:
+                        totals[player] = player_totals
+                else:
+                    totals = source.game_totals(game)
+            else:
+                for _, quarter_stats in quarters.items():
+                    for player_name, stats in quarter_stats.items():
+                        if player and player_name != player:
+                            continue
 
-                    if player_name not in totals:
-                        totals[player_name] = {key: 0 for key in stats}
+                        if player_name not in totals:
+                            totals[player_name] = {key: 0 for key in stats}
 
-                    for stat_name, value in stats.items():
-                        totals[player_name][stat_name] += value
+                        for stat_name, value in stats.items():
+                            totals[player_name][stat_name] += value
 
             if look_good:
                 if player:
@@ -477,7 +1381,7 @@ class AccessData:
             else:
                 output = totals if not player else totals.get(player, {})
 
-            log_entry = create_log(
+            log_entry = log_action(
                 level="INFO",
                 message="get_game_stats ran successfully",
                 where="get_game_stats",
@@ -485,11 +1389,10 @@ class AccessData:
                 source_ip=cls.source_ip,
                 request_id=cls.request_id
             )
-            write.write_to("C:/Users/Drags Jrs/Drags/Database/log/accessing_data_log.json", log_entry)
             return output
         except Exception as e:
             error = {"type": type(e).__name__, 'message': str(e)}
-            log_entry = create_log(
+            log_entry = log_action(
                 level="ERROR",
                 message="get_game_stats failed",
                 where="get_game_stats",
@@ -498,13 +1401,16 @@ class AccessData:
                 source_ip=cls.source_ip,
                 request_id=cls.request_id
             )
-            write.write_to("C:/Users/Drags Jrs/Drags/Database/log/accessing_data_log.json", log_entry)
             return log_entry
 
     @classmethod
-    def get_season_stats(cls, player: str, sum_total: bool = False, look_good: bool = False):
+    @query_cache.cached
+    def get_season_stats(cls, player: str, sum_total: bool = False, look_good: bool = False, season=None, team: Optional[str] = None, start=None, end=None):
+        # season / team: only the games of that season / team (see utils/partitions.py)
+        # start / end: only the games in that date window (see utils/game_dates.py)
         try:
-            cls._ensure_initialized()
+            cls._ensure_current()
+            dataset = AccessData.dataset
 
             if not isinstance(player, str):
                 raise TypeError("player must be a string")
@@ -512,15 +1418,36 @@ class AccessData:
                 raise TypeError("sum_total must be a bool")
             if not isinstance(look_good, bool):
                 raise TypeError("look_good must be a bool")
+            cls._check_filters(season, team)
 
             # Calculate stats
+            indexed = cls.storage is not None and cls.storage.indexed
+            filtered = any(value is not None for value in (season, team, start, end))
+            if filtered:
+                # The partition and date indexes need the games in memory, even with an indexed storage
+                cls._ensure_initialized()
+                dataset = AccessData.dataset
+                indexed = False
+                games = cls._select_games(dataset, season, team, start, end)
             if sum_total:
-                total = {}
-                for game_name, game_stats in cls.data.items():
-                    for quarter, quarter_stats in game_stats["Quarters"].items():
-                        if player in quarter_stats:
-                            for stat_name, stat_value in quarter_stats[player].items():
-                                total[stat_name] = total.get(stat_name, 0) + stat_value
+                if filtered:
+                    total = {}
+                    for game_total in cls._player_by_game(dataset, player, games).values():
+                        for stat_name, stat_value in game_total.items():
+                            total[stat_name] = total.get(stat_name, 0) + stat_value
+                elif indexed:
+                    total = cls.storage.season_totals(player)
+                elif dataset.tables is not None:
+                    total = dataset.tables.season_totals(player)
+                elif dataset.cube is not None:
+                    total = dataset.cube.season_totals(player)
+                else:
+                    total = {}
+                    for game_name, game_stats in dataset.data.items():
+                        for quarter, quarter_stats in game_stats["Quarters"].items():
+                            if player in quarter_stats:
+                                for stat_name, stat_value in quarter_stats[player].items():
+                                    total[stat_name] = total.get(stat_name, 0) + stat_value
 
                 if look_good:
                     output = f"Season stats for {player}\n"
@@ -530,14 +1457,23 @@ class AccessData:
                     output = total
             else:
                 game_totals = {}
-                for game_name, game_stats in cls.data.items():
-                    players_total = {}
-                    for quarter_stats in game_stats["Quarters"].values():
-                        if player in quarter_stats:
-                            for stat_name, stat_value in quarter_stats[player].items():
-                                players_total[stat_name] = players_total.get(stat_name, 0) + stat_value
-                    if players_total:
-                        game_totals[game_name] = players_total
+                if filtered:
+                    game_totals = cls._player_by_game(dataset, player, games)
+                elif indexed:
+                    game_totals = cls.storage.season_by_game(player)
+                elif dataset.tables is not None:
+                    game_totals = dataset.tables.season_by_game(player)
+                elif dataset.cube is not None:
+                    game_totals = dataset.cube.season_by_game(player)
+                else:
+                    for game_name, game_stats in dataset.data.items():
+                        players_total = {}
+                        for quarter_stats in game_stats["Quarters"].values():
+                            if player in quarter_stats:
+                                for stat_name, stat_value in quarter_stats[player].items():
+                                    players_total[stat_name] = players_total.get(stat_name, 0) + stat_value
+                        if players_total:
+                            game_totals[game_name] = players_total
 
                 if look_good:
                     output = f"------------------------- Game stats for {player} -------------------------------\n"
@@ -550,7 +1486,7 @@ class AccessData:
                 else:
                     output = game_totals
 
-            log_entry = create_log(
+            log_entry = log_action(
                 level="INFO",
                 message="get_season_stats ran successfully",
                 where="get_season_stats",
@@ -558,12 +1494,11 @@ class AccessData:
                 source_ip=cls.source_ip,
                 request_id=cls.request_id
             )
-            write.write_to("C:/Users/Drags Jrs/Drags/Database/log/accessing_data_log.json", log_entry)
             return output
 
         except Exception as e:
             error = {"type": type(e).__name__, 'message': str(e)}
-            log_entry = create_log(
+            log_entry = log_action(
                 level="ERROR",
                 message="get_season_stats failed",
                 where="get_season_stats",
@@ -572,13 +1507,16 @@ class AccessData:
                 source_ip=cls.source_ip,
                 request_id=cls.request_id
             )
-            write.write_to("C:/Users/Drags Jrs/Drags/Database/log/accessing_data_log.json", log_entry)
             return log_entry
 
     @classmethod
-    def get_team_season_stats(cls, sum_total: bool = False, look_good: bool = False):
+    @query_cache.cached
+    def get_team_season_stats(cls, sum_total: bool = False, look_good: bool = False, season=None, team: Optional[str] = None, start=None, end=None):
+        # season / team: only the games of that season / team, summed per partition (see utils/partitions.py)
+        # start / end: only the games in that date window (see utils/game_dates.py)
         try:
             cls._ensure_initialized()
+            dataset = AccessData.dataset
 
             if not isinstance(sum_total, bool):
                 raise TypeError("sum_total must be a bool")
@@ -586,26 +1524,40 @@ class AccessData:
             if not isinstance(look_good, bool):
                 raise TypeError("look_good must be a bool")
 
+            cls._check_filters(season, team)
+            filtered = any(value is not None for value in (season, team, start, end))
+            games = cls._select_games(dataset, season, team, start, end) if filtered else None
+
             if sum_total:
                 team_totals = {}
 
-                for game_name, game_data in cls.data.items():
-                    for quarter_name, quarter_stats in game_data["Quarters"].items():
-                        for players_name, players_stats in quarter_stats.items():
-                            if players_name not in team_totals:
-                                team_totals[players_name] = {}
-                            for stat_name, stat_value in players_stats.items():
-                                team_totals[players_name][stat_name] = team_totals[players_name].get(stat_name, 0) + stat_value
+                if filtered and start is None and end is None:
+                    team_totals = cls._partitions(dataset).team_totals(functools.partial(cls._game_player_totals, dataset), season, team)
+                elif filtered:
+                    # A date window cuts through partitions, only its own games are summed
+                    team_totals = sum_totals(functools.partial(cls._game_player_totals, dataset), games)
+                elif dataset.tables is not None:
+                    team_totals = dataset.tables.team_totals()
+                elif dataset.cube is not None:
+                    team_totals = dataset.cube.team_totals()
+                else:
+                    for game_name, game_data in dataset.data.items():
+                        for quarter_name, quarter_stats in game_data["Quarters"].items():
+                            for players_name, players_stats in quarter_stats.items():
+                                if players_name not in team_totals:
+                                    team_totals[players_name] = {}
+                                for stat_name, stat_value in players_stats.items():
+                                    team_totals[players_name][stat_name] = team_totals[players_name].get(stat_name, 0) + stat_value
 
                 if look_good:
-                    output = "---------------- Newport Raiders U16 Boys Julie Season stats ----------------\n"
+                    output = f"---------------- {cls._team_name(dataset, season, team)} Season stats ----------------\n"
 
                     for team_players_name, team_players_stats in team_totals.items():
                         output += f"\n                       {team_players_name}                               \n"
                         for team_players_stat_name, team_players_stat_value in team_players_stats.items():
                             output += f"                            - {team_players_stat_name}: {team_players_stat_value}\n"
 
-                    log_entry = create_log(
+                    log_entry = log_action(
                         level="INFO",
                         message="get_team_season_stats ran successfully",
                         where="get_team_season_stats",
@@ -613,11 +1565,10 @@ class AccessData:
                         source_ip=cls.source_ip,
                         request_id=cls.request_id
                     )
-                    write.write_to("C:/Users/Drags Jrs/Drags/Database/log/accessing_data_log.json", log_entry)
 
                     return output
                 else:
-                    log_entry = create_log(
+                    log_entry = log_action(
                         level="INFO",
                         message="get_team_season_stats ran successfully",
                         where="get_team_season_stats",
@@ -625,28 +1576,35 @@ class AccessData:
                         source_ip=cls.source_ip,
                         request_id=cls.request_id
                     )
-                    write.write_to("C:/Users/Drags Jrs/Drags/Database/log/accessing_data_log.json", log_entry)
 
                     return team_totals
             else:
                 game_team_totals = {}
 
-                for game_name, game_data in cls.data.items():
+                if filtered:
+                    for game_name in games:
+                        game_team_totals[game_name] = {player: dict(stats) for player, stats in cls._game_player_totals(dataset, game_name).items()}
+                elif dataset.tables is not None:
+                    game_team_totals = dataset.tables.team_by_game()
+                elif dataset.cube is not None:
+                    game_team_totals = dataset.cube.team_by_game()
+                else:
+                    for game_name, game_data in dataset.data.items():
 
-                    player_total = {}
+                        player_total = {}
 
-                    for quarter_name, quarter_stats in game_data["Quarters"].items():
-                        for players_name, players_data in quarter_stats.items():
-                            if players_name not in player_total:
-                                player_total[players_name] = {}
-                            for player_stat_name, player_stat_value in players_data.items():
-                                player_total[players_name][player_stat_name] = player_total[players_name].get(player_stat_name, 0) + player_stat_value
+                        for quarter_name, quarter_stats in game_data["Quarters"].items():
+                            for players_name, players_data in quarter_stats.items():
+                                if players_name not in player_total:
+                                    player_total[players_name] = {}
+                                for player_stat_name, player_stat_value in players_data.items():
+                                    player_total[players_name][player_stat_name] = player_total[players_name].get(player_stat_name, 0) + player_stat_value
 
-                    game_team_totals[game_name] = player_total
+                        game_team_totals[game_name] = player_total
 
                 if look_good:
                     output = ""
-                    output += f"---------------------- Newport Raiders U16 Boys Julie Season stats ----------------------\n"
+                    output += f"---------------------- {cls._team_name(dataset, season, team)} Season stats ----------------------\n"
                     for game_stat_name, game_stat_value in game_team_totals.items():
                         output += f"\n\n{game_stat_name}                                   \n"
                         for players_name, players_stats in game_stat_value.items():
@@ -654,7 +1612,7 @@ class AccessData:
                             for stat_name, stat_value in players_stats.items():
                                 output += f"\n{stat_name}: {stat_value}                       "
 
-                    log_entry = create_log(
+                    log_entry = log_action(
                         level="INFO",
                         message="get_team_season_stats ran successfully",
                         where="get_team_season_stats",
@@ -662,11 +1620,10 @@ class AccessData:
                         source_ip=cls.source_ip,
                         request_id=cls.request_id
                     )
-                    write.write_to("C:/Users/Drags Jrs/Drags/Database/log/accessing_data_log.json", log_entry)
 
                     return output
                 else:
-                    log_entry = create_log(
+                    log_entry = log_action(
                         level="INFO",
                         message="get_team_season_stats ran successfully",
                         where="get_team_season_stats",
@@ -674,12 +1631,11 @@ class AccessData:
                         source_ip=cls.source_ip,
                         request_id=cls.request_id
                     )
-                    write.write_to("C:/Users/Drags Jrs/Drags/Database/log/accessing_data_log.json", log_entry)
 
                     return game_team_totals
         except Exception as e:
             error = {"type": type(e).__name__, 'message': str(e)}
-            log_entry = create_log(
+            log_entry = log_action(
                 level="ERROR",
                 message="get_team_season_stats failed",
                 where="get_team_season_stats",
@@ -688,13 +1644,16 @@ class AccessData:
                 source_ip=cls.source_ip,
                 request_id=cls.request_id
             )
-            write.write_to("C:/Users/Drags Jrs/Drags/Database/log/accessing_data_log.json", log_entry)
             return log_entry
 
     @classmethod
-    def get_quarter_season_stats(cls, player: str, quarter: str, sum_total: bool = False, look_good: bool = False):
+    @query_cache.cached
+    def get_quarter_season_stats(cls, player: str, quarter: str, sum_total: bool = False, look_good: bool = False, season=None, team: Optional[str] = None, start=None, end=None):
+        # season / team: only the games of that season / team (see utils/partitions.py)
+        # start / end: only the games in that date window (see utils/game_dates.py)
         try:
             cls._ensure_initialized()
+            dataset = AccessData.dataset
 
             if not isinstance(player, str):
                 raise TypeError("player must be a string")
@@ -708,24 +1667,38 @@ class AccessData:
             if not isinstance(look_good, bool):
                 raise TypeError("look_good must be a bool")
 
+            cls._check_filters(season, team)
+            filtered = any(value is not None for value in (season, team, start, end))
+            games = cls._select_games(dataset, season, team, start, end) if filtered else dataset.data
+
             totals = {}
 
-            if quarter not in cls.data.get("Game_1", {}).get("Quarters", {}):
+            # Any game that has the quarter will do, not just the first one
+            if not any(quarter in cls._quarters(dataset, dataset.data[game_name]) for game_name in games):
                 raise KeyError("Could not find the quarter")
 
             if sum_total:
-                for game_name, game_stats in cls.data.items():
-                    if quarter in game_stats["Quarters"]:
-                        if player in game_stats["Quarters"][quarter]:
-                            for stat, value in game_stats["Quarters"][quarter][player].items():
-                                totals[stat] = totals.get(stat, 0) + value
+                if filtered:
+                    for game_total in cls._player_by_game(dataset, player, games, quarter).values():
+                        for stat, value in game_total.items():
+                            totals[stat] = totals.get(stat, 0) + value
+                elif dataset.tables is not None:
+                    totals = dataset.tables.quarter_totals(player, quarter)
+                elif dataset.cube is not None:
+                    totals = dataset.cube.quarter_totals(player, quarter)
+                else:
+                    for game_name, game_stats in dataset.data.items():
+                        if quarter in game_stats["Quarters"]:
+                            if player in game_stats["Quarters"][quarter]:
+                                for stat, value in game_stats["Quarters"][quarter][player].items():
+                                    totals[stat] = totals.get(stat, 0) + value
 
                 if look_good:
                     output = f"All of {quarter} stats together for {player}\n"
                     for stat, value in totals.items():
                         output += f"    - {stat}: {value}\n"
 
-                    log_entry = create_log(
+                    log_entry = log_action(
                                 level="INFO",
                                 message="get_quarter_season_stats ran successfully",
                                 where="get_quarter_season_stats",
@@ -733,11 +1706,10 @@ class AccessData:
                                 source_ip=cls.source_ip,
                                 request_id=cls.request_id
                             )
-                    write.write_to("C:/Users/Drags Jrs/Drags/Database/log/accessing_data_log.json", log_entry)
 
                     return output
                 else:
-                    log_entry = create_log(
+                    log_entry = log_action(
                                 level="INFO",
                                 message="get_quarter_season_stats ran successfully",
                                 where="get_quarter_season_stats",
@@ -745,23 +1717,29 @@ class AccessData:
                                 source_ip=cls.source_ip,
                                 request_id=cls.request_id
                             )
-                    write.write_to("C:/Users/Drags Jrs/Drags/Database/log/accessing_data_log.json", log_entry)
 
                     return totals
             else:
                 game_totals = {}
 
-                for game_name, game_stats in cls.data.items():
+                if filtered:
+                    game_totals = cls._player_by_game(dataset, player, games, quarter)
+                elif dataset.tables is not None:
+                    game_totals = dataset.tables.quarter_by_game(player, quarter)
+                elif dataset.cube is not None:
+                    game_totals = dataset.cube.quarter_by_game(player, quarter)
+                else:
+                    for game_name, game_stats in dataset.data.items():
 
-                    players_totals = {}
+                        players_totals = {}
 
-                    if quarter in game_stats["Quarters"]:
-                        if player in game_stats["Quarters"][quarter]:
-                            for stat_name, stat_value in game_stats["Quarters"][quarter][player].items():
-                                players_totals[stat_name] = players_totals.get(stat_name, 0) + stat_value
+                        if quarter in game_stats["Quarters"]:
+                            if player in game_stats["Quarters"][quarter]:
+                                for stat_name, stat_value in game_stats["Quarters"][quarter][player].items():
+                                    players_totals[stat_name] = players_totals.get(stat_name, 0) + stat_value
 
-                    if players_totals:
-                        game_totals[game_name] = players_totals
+                        if players_totals:
+                            game_totals[game_name] = players_totals
 
                 if look_good:
                     output = f"============= Seasons {quarter} stats for {player} =============\n"
@@ -771,7 +1749,7 @@ class AccessData:
                         for game_Stat_name, game_stat_value in game_stats.items():
                             output += f"       - {game_Stat_name}: {game_stat_value}\n"
 
-                    log_entry = create_log(
+                    log_entry = log_action(
                                 level="INFO",
                                 message="get_quarter_season_stats ran successfully",
                                 where="get_quarter_season_stats",
@@ -779,11 +1757,10 @@ class AccessData:
                                 source_ip=cls.source_ip,
                                 request_id=cls.request_id
                             )
-                    write.write_to("C:/Users/Drags Jrs/Drags/Database/log/accessing_data_log.json", log_entry)
 
                     return output
                 else:
-                    log_entry = create_log(
+                    log_entry = log_action(
                                 level="INFO",
                                 message="get_quarter_season_stats ran successfully",
                                 where="get_quarter_season_stats",
@@ -791,12 +1768,11 @@ class AccessData:
                                 source_ip=cls.source_ip,
                                 request_id=cls.request_id
                             )
-                    write.write_to("C:/Users/Drags Jrs/Drags/Database/log/accessing_data_log.json", log_entry)
 
                     return game_totals
         except Exception as e:
             error = {"type": type(e).__name__, 'message': str(e)}
-            log_entry = create_log(
+            log_entry = log_action(
                 level="ERROR",
                 message="get_quarter_season_stats failed",
                 where="get_quarter_season_stats",
@@ -805,13 +1781,196 @@ class AccessData:
                 source_ip=cls.source_ip,
                 request_id=cls.request_id
             )
-            write.write_to("C:/Users/Drags Jrs/Drags/Database/log/accessing_data_log.json", log_entry)
             return log_entry
 
     @classmethod
+    def get_season_stats_many(cls, players=None, sum_total: bool = False, season=None, team: Optional[str] = None, start=None, end=None):
+        # get_season_stats for many players at once: {player: what get_season_stats(player, sum_total) returns}.
+        # players=None is everyone who played. One pass over the games, however many players are asked for.
+        return cls._season_stats_many(cls._players_key(players), sum_total, season, team, start, end)
+
+    @classmethod
+    @query_cache.cached
+    def _season_stats_many(cls, players, sum_total, season, team, start, end):
+        try:
+            cls._ensure_initialized()
+            dataset = AccessData.dataset
+
+            players = cls._check_players(players)
+            if not isinstance(sum_total, bool):
+                raise TypeError("sum_total must be a bool")
+            cls._check_filters(season, team)
+            filtered = any(value is not None for value in (season, team, start, end))
+            wanted = None if players is None else set(players)
+
+            if not filtered and dataset.tables is not None:
+                # Already summed per player, nothing to walk
+                if sum_total:
+                    found = {player: dict(totals) for player, totals in dataset.tables.season.items() if wanted is None or player in wanted}
+                else:
+                    found = {player: {game: dict(totals) for game, totals in games.items()} for player, games in dataset.tables.players.items()
+                             if wanted is None or player in wanted}
+            else:
+                found = {}
+                for game in (cls._select_games(dataset, season, team, start, end) if filtered else dataset.data):
+                    for player, stats in cls._game_player_totals(dataset, game).items():
+                        if wanted is not None and player not in wanted:
+                            continue
+                        if sum_total:
+                            totals = found.setdefault(player, {})
+                            for stat_name, stat_value in stats.items():
+                                totals[stat_name] = totals.get(stat_name, 0) + stat_value
+                        elif stats:
+                            found.setdefault(player, {})[game] = dict(stats)
+            output = cls._by_player(players, found, dict)
+
+            log_entry = log_action(
+                level="INFO",
+                message="get_season_stats_many ran successfully",
+                where="get_season_stats_many",
+                user_id=cls.user_id,
+                source_ip=cls.source_ip,
+                request_id=cls.request_id
+            )
+            return output
+        except Exception as e:
+            error = {"type": type(e).__name__, 'message': str(e)}
+            log_entry = log_action(
+                level="ERROR",
+                message="get_season_stats_many failed",
+                where="get_season_stats_many",
+                error=error,
+                user_id=cls.user_id,
+                source_ip=cls.source_ip,
+                request_id=cls.request_id
+            )
+            return log_entry
+
+    @classmethod
+    def get_game_stats_many(cls, game: str, players=None):
+        # get_game_stats for many players of one game: {player: their totals in game ({} when they didn't play)}
+        return cls._game_stats_many(game, cls._players_key(players))
+
+    @classmethod
+    @query_cache.cached
+    def _game_stats_many(cls, game, players):
+        try:
+            cls._ensure_initialized()
+            dataset = AccessData.dataset
+
+            if not isinstance(game, str):
+                raise TypeError("game must be a string")
+            players = cls._check_players(players)
+
+            game_stats = dataset.data.get(game, {})
+            if not game_stats:
+                raise KeyError("Could not find the game")
+            if not cls._quarters(dataset, game_stats):
+                raise KeyError("Quarters not found")
+
+            found = {player: dict(stats) for player, stats in cls._game_player_totals(dataset, game).items()}
+            output = cls._by_player(players, found, dict)
+
+            log_entry = log_action(
+                level="INFO",
+                message="get_game_stats_many ran successfully",
+                where="get_game_stats_many",
+                user_id=cls.user_id,
+                source_ip=cls.source_ip,
+                request_id=cls.request_id
+            )
+            return output
+        except Exception as e:
+            error = {"type": type(e).__name__, 'message': str(e)}
+            log_entry = log_action(
+                level="ERROR",
+                message="get_game_stats_many failed",
+                where="get_game_stats_many",
+                error=error,
+                user_id=cls.user_id,
+                source_ip=cls.source_ip,
+                request_id=cls.request_id
+            )
+            return log_entry
+
+    @classmethod
+    def get_quarter_season_stats_many(cls, quarter: str, players=None, sum_total: bool = False, season=None, team: Optional[str] = None, start=None, end=None):
+        # get_quarter_season_stats for many players at once, one pass over that quarter of every game
+        return cls._quarter_season_stats_many(quarter, cls._players_key(players), sum_total, season, team, start, end)
+
+    @classmethod
+    @query_cache.cached
+    def _quarter_season_stats_many(cls, quarter, players, sum_total, season, team, start, end):
+        try:
+            cls._ensure_initialized()
+            dataset = AccessData.dataset
+
+            if not isinstance(quarter, str):
+                raise TypeError("quarter must be a string")
+            players = cls._check_players(players)
+            if not isinstance(sum_total, bool):
+                raise TypeError("sum_total must be a bool")
+            cls._check_filters(season, team)
+            filtered = any(value is not None for value in (season, team, start, end))
+            games = cls._select_games(dataset, season, team, start, end) if filtered else dataset.data
+
+            if not any(quarter in cls._quarters(dataset, dataset.data[game_name]) for game_name in games):
+                raise KeyError("Could not find the quarter")
+
+            wanted = None if players is None else set(players)
+            found = {}
+            if not filtered and dataset.tables is not None:
+                source = dataset.tables.quarters if sum_total else dataset.tables.quarter_games
+                for player, player_quarters in source.items():
+                    if quarter in player_quarters and (wanted is None or player in wanted):
+                        value = player_quarters[quarter]
+                        found[player] = dict(value) if sum_total else {game: dict(totals) for game, totals in value.items()}
+            else:
+                for game in games:
+                    quarter_stats = cls._quarters(dataset, dataset.data[game]).get(quarter)
+                    if quarter_stats is None:
+                        continue
+                    for player, stats in quarter_stats.items():
+                        if wanted is not None and player not in wanted:
+                            continue
+                        if sum_total:
+                            totals = found.setdefault(player, {})
+                        elif stats:
+                            totals = found.setdefault(player, {}).setdefault(game, {})
+                        else:
+                            continue
+                        for stat_name, stat_value in stats.items():
+                            totals[stat_name] = totals.get(stat_name, 0) + stat_value
+            output = cls._by_player(players, found, dict)
+
+            log_entry = log_action(
+                level="INFO",
+                message="get_quarter_season_stats_many ran successfully",
+                where="get_quarter_season_stats_many",
+                user_id=cls.user_id,
+                source_ip=cls.source_ip,
+                request_id=cls.request_id
+            )
+            return output
+        except Exception as e:
+            error = {"type": type(e).__name__, 'message': str(e)}
+            log_entry = log_action(
+                level="ERROR",
+                message="get_quarter_season_stats_many failed",
+                where="get_quarter_season_stats_many",
+                error=error,
+                user_id=cls.user_id,
+                source_ip=cls.source_ip,
+                request_id=cls.request_id
+            )
+            return log_entry
+
+    @classmethod
+    @query_cache.cached
     def get_highest_stats_quarter(cls, game: str, quarter: str, what_to_look_for: str, look_good: bool = False):
         try:
             cls._ensure_initialized()
+            dataset = AccessData.dataset
 
             if not isinstance(game, str):
                 raise TypeError("game must be a string")
@@ -825,22 +1984,25 @@ class AccessData:
             if not isinstance(look_good, bool):
                 raise TypeError("look_good must be a bool")
 
-            game_stats = cls.data.get(game, {})
+            game_stats = dataset.data.get(game, {})
 
             if not game_stats:
                 raise KeyError("Could not find the game")
 
-            quarter_stats = game_stats.get("Quarters").get(quarter, {})
+            quarter_stats = cls._quarters(dataset, game_stats).get(quarter, {})
 
             if not quarter_stats:
                 raise KeyError("Could not find the quarter")
 
-            nums = [(player, stats.get(what_to_look_for, 0)) for player, stats in quarter_stats.items()]
+            if dataset.cube is not None:
+                nums = dataset.cube.quarter_values(game, quarter, what_to_look_for)
+            else:
+                nums = [(player, stats.get(what_to_look_for, 0)) for player, stats in quarter_stats.items()]
 
             if not nums:
                 if look_good:
                     error_msg = f"Stat: {what_to_look_for} not found"
-                    log_entry = create_log(
+                    log_entry = log_action(
                                 level="INFO",
                                 message="get_highest_stats_quarter ran successfully",
                                 where="get_highest_stats_quarter",
@@ -848,10 +2010,9 @@ class AccessData:
                                 source_ip=cls.source_ip,
                                 request_id=cls.request_id
                             )
-                    write.write_to("C:/Users/Drags Jrs/Drags/Database/log/accessing_data_log.json", log_entry)
                     return error_msg
                 else:
-                    log_entry = create_log(
+                    log_entry = log_action(
                                 level="INFO",
                                 message="get_highest_stats_quarter ran successfully",
                                 where="get_highest_stats_quarter",
@@ -859,7 +2020,6 @@ class AccessData:
                                 source_ip=cls.source_ip,
                                 request_id=cls.request_id
                             )
-                    write.write_to("C:/Users/Drags Jrs/Drags/Database/log/accessing_data_log.json", log_entry)
                     return None
 
             max_stat_value = max(value for _, value in nums)
@@ -867,7 +2027,7 @@ class AccessData:
             if max_stat_value == 0:
                 if look_good:
                     msg = f"No one got any {what_to_look_for} in {game} of {quarter}"
-                    log_entry = create_log(
+                    log_entry = log_action(
                                 level="INFO",
                                 message="get_highest_stats_quarter ran successfully",
                                 where="get_highest_stats_quarter",
@@ -875,10 +2035,9 @@ class AccessData:
                                 source_ip=cls.source_ip,
                                 request_id=cls.request_id
                             )
-                    write.write_to("C:/Users/Drags Jrs/Drags/Database/log/accessing_data_log.json", log_entry)
                     return msg
                 else:
-                    log_entry = create_log(
+                    log_entry = log_action(
                                 level="INFO",
                                 message="get_highest_stats_quarter ran successfully",
                                 where="get_highest_stats_quarter",
@@ -886,7 +2045,6 @@ class AccessData:
                                 source_ip=cls.source_ip,
                                 request_id=cls.request_id
                             )
-                    write.write_to("C:/Users/Drags Jrs/Drags/Database/log/accessing_data_log.json", log_entry)
                     return None
 
             top_players = [player for player, value in nums if value == max_stat_value]
@@ -896,7 +2054,7 @@ class AccessData:
             if look_good:
                 result = f"In {quarter} of {game}, the {'leader' if len(top_players) == 1 else 'leaders'} for {what_to_look_for} was: {resultstr}"
 
-                log_entry = create_log(
+                log_entry = log_action(
                             level="INFO",
                             message="get_highest_stats_quarter ran successfully",
                             where="get_highest_stats_quarter",
@@ -904,10 +2062,9 @@ class AccessData:
                             source_ip=cls.source_ip,
                             request_id=cls.request_id
                         )
-                write.write_to("C:/Users/Drags Jrs/Drags/Database/log/accessing_data_log.json", log_entry)
                 return result
             else:
-                log_entry = create_log(
+                log_entry = log_action(
                             level="INFO",
                             message="get_highest_stats_quarter ran successfully",
                             where="get_highest_stats_quarter",
@@ -915,11 +2072,10 @@ class AccessData:
                             source_ip=cls.source_ip,
                             request_id=cls.request_id
                         )
-                write.write_to("C:/Users/Drags Jrs/Drags/Database/log/accessing_data_log.json", log_entry)
                 return {player: max_stat_value for player in top_players}
         except Exception as e:
             error = {"type": type(e).__name__, 'message': str(e)}
-            log_entry = create_log(
+            log_entry = log_action(
                 level="ERROR",
                 message="get_highest_stats_quarter failed",
                 where="get_highest_stats_quarter",
@@ -928,11 +2084,11 @@ class AccessData:
                 source_ip=cls.source_ip,
                 request_id=cls.request_id
             )
-            write.write_to("C:/Users/Drags Jrs/Drags/Database/log/accessing_data_log.json", log_entry)
             return log_entry
 
 
     @classmethod
+    @query_cache.cached
     def get_highest_stats_game(cls, game: str, what_to_look_for: str, look_good: bool = False):
         try:
             cls._ensure_initialized()
@@ -960,7 +2116,7 @@ class AccessData:
             if max_value == 0:
                 msg = f"Could not find {what_to_look_for} in {game}"
                 if look_good:
-                    log_entry = create_log(
+                    log_entry = log_action(
                                 level="INFO",
                                 message="get_highest_stats_game ran successfully",
                                 where="get_highest_stats_game",
@@ -968,10 +2124,9 @@ class AccessData:
                                 source_ip=cls.source_ip,
                                 request_id=cls.request_id
                             )
-                    write.write_to("C:/Users/Drags Jrs/Drags/Database/log/accessing_data_log.json", log_entry)
                     return msg
                 else:
-                    log_entry = create_log(
+                    log_entry = log_action(
                                 level="INFO",
                                 message="get_highest_stats_game ran successfully",
                                 where="get_highest_stats_game",
@@ -979,7 +2134,6 @@ class AccessData:
                                 source_ip=cls.source_ip,
                                 request_id=cls.request_id
                             )
-                    write.write_to("C:/Users/Drags Jrs/Drags/Database/log/accessing_data_log.json", log_entry)
                     return None
 
             top_players = [player for player, value in nums if value == max_value]
@@ -989,7 +2143,7 @@ class AccessData:
             if look_good:
                 result = f"In {game}, the {'leader' if len(top_players) == 1 else 'leaders'} for {what_to_look_for} was: {resultstr}"
 
-                log_entry = create_log(
+                log_entry = log_action(
                             level="INFO",
                             message="get_highest_stats_game ran successfully",
                             where="get_highest_stats_game",
@@ -997,10 +2151,9 @@ class AccessData:
                             source_ip=cls.source_ip,
                             request_id=cls.request_id
                         )
-                write.write_to("C:/Users/Drags Jrs/Drags/Database/log/accessing_data_log.json", log_entry)
                 return result
             else:
-                log_entry = create_log(
+                log_entry = log_action(
                             level="INFO",
                             message="get_highest_stats_game ran successfully",
                             where="get_highest_stats_game",
@@ -1008,11 +2161,10 @@ class AccessData:
                             source_ip=cls.source_ip,
                             request_id=cls.request_id
                         )
-                write.write_to("C:/Users/Drags Jrs/Drags/Database/log/accessing_data_log.json", log_entry)
                 return {player: max_value for player in top_players}
         except Exception as e:
             error = {"type": type(e).__name__, 'message': str(e)}
-            log_entry = create_log(
+            log_entry = log_action(
                 level="ERROR",
                 message="get_highest_stats_game failed",
                 where="get_highest_stats_game",
@@ -1021,12 +2173,13 @@ class AccessData:
                 source_ip=cls.source_ip,
                 request_id=cls.request_id
             )
-            write.write_to("C:/Users/Drags Jrs/Drags/Database/log/accessing_data_log.json", log_entry)
             return log_entry
     @classmethod
+    @query_cache.cached
     def specific_players_best_stat(cls, player: str, what_to_look_for: str, look_good: bool = False): # Original name: find_players_best_stat does exactly what the name says
         try:
-            cls._ensure_initialized()
+            cls._ensure_current()
+            dataset = AccessData.dataset
 
             if not isinstance(player, str):
                 raise TypeError("player must be a string")
@@ -1041,14 +2194,33 @@ class AccessData:
             best_game = None
             best_quarter = None
 
-            for game, game_stats in cls.data.items():
-                for quarter, quarter_stats in game_stats["Quarters"].items():
-                    if player in quarter_stats and what_to_look_for in quarter_stats[player]:
-                        value = quarter_stats[player][what_to_look_for]
-                        if value > best_val:
-                            best_val = value
-                            best_game = game
-                            best_quarter = quarter
+            players = dataset.players if dataset is not None else None
+            if cls.storage is not None and cls.storage.indexed:
+                best = cls.storage.best_stat(player, what_to_look_for)
+                if best is not None:
+                    best_val, best_game, best_quarter = best
+            elif players is not None:
+                # Only the quarters the player has a stat line in, same order as the walk below
+                data = dataset.data
+                for game, quarters in players.games(player).items():
+                    game_quarters = data[game]["Quarters"]
+                    for quarter in quarters:
+                        stats = game_quarters[quarter][player]
+                        if what_to_look_for in stats:
+                            value = stats[what_to_look_for]
+                            if value > best_val:
+                                best_val = value
+                                best_game = game
+                                best_quarter = quarter
+            else:
+                for game, game_stats in dataset.data.items():
+                    for quarter, quarter_stats in game_stats["Quarters"].items():
+                        if player in quarter_stats and what_to_look_for in quarter_stats[player]:
+                            value = quarter_stats[player][what_to_look_for]
+                            if value > best_val:
+                                best_val = value
+                                best_game = game
+                                best_quarter = quarter
 
             if best_val == -1:
                 if look_good:
@@ -1057,7 +2229,7 @@ class AccessData:
                     return TypeError(f"{player} has no recorded {what_to_look_for}")
             else:
                 if look_good:
-                    log_entry = create_log(
+                    log_entry = log_action(
                                 level="INFO",
                                 message="specific_players_best_stat ran successfully",
                                 where="specific_players_best_stat",
@@ -1065,11 +2237,10 @@ class AccessData:
                                 source_ip=cls.source_ip,
                                 request_id=cls.request_id
                             )
-                    write.write_to("C:/Users/Drags Jrs/Drags/Database/log/accessing_data_log.json", log_entry)
 
                     return f"{player} got the most {what_to_look_for} ({best_val}) in {best_quarter} of {best_game}"
                 else:
-                    log_entry = create_log(
+                    log_entry = log_action(
                                 level="INFO",
                                 message="specific_players_best_stat ran successfully",
                                 where="specific_players_best_stat",
@@ -1077,13 +2248,12 @@ class AccessData:
                                 source_ip=cls.source_ip,
                                 request_id=cls.request_id
                             )
-                    write.write_to("C:/Users/Drags Jrs/Drags/Database/log/accessing_data_log.json", log_entry)
 
                     return f"{what_to_look_for} {best_val}"
 
         except Exception as e:
             error = {"type": type(e).__name__, 'message': str(e)}
-            log_entry = create_log(
+            log_entry = log_action(
                 level="ERROR",
                 message="specific_players_best_stat failed",
                 where="specific_players_best_stat",
@@ -1092,13 +2262,13 @@ class AccessData:
                 source_ip=cls.source_ip,
                 request_id=cls.request_id
             )
-            write.write_to("C:/Users/Drags Jrs/Drags/Database/log/accessing_data_log.json", log_entry)
             return log_entry
 
     @classmethod
     def check_player(cls, game: str, team: str, player: str, look_good: bool = False):
         try:
-            cls._ensure_initialized()
+            cls._ensure_current(per_game=True)
+            dataset = AccessData.dataset
 
             if not isinstance(game, str):
                 raise TypeError("game must be a string")
@@ -1111,17 +2281,26 @@ class AccessData:
             if not isinstance(look_good, bool):
                 raise TypeError("look_good must be a bool")
 
-            if game not in cls.data:
-                raise KeyError("game not in the dataset")
+            found = None
+            if cls.storage is None and dataset is not None and dataset.players is not None:
+                # A set lookup, None when that game's lineup isn't indexed (the checks below then say why)
+                found = dataset.players.in_lineup(game, team, player)
+            if found is None:
+                if cls.storage is not None and cls.storage.indexed:
+                    found = cls.storage.in_lineup(game, team, player)
+                else:
+                    game_stats = cls._game(dataset, game)
 
-            game_stats = cls.data.get(game, {})
+                    if game_stats is None:
+                        raise KeyError("game not in the dataset")
 
-            if team not in game_stats["Lineup"]:
-                raise KeyError("team not in the game")
+                    if team not in game_stats["Lineup"]:
+                        raise KeyError("team not in the game")
 
-            team_players = game_stats.get("Lineup").get(team)
+                    team_players = game_stats.get("Lineup").get(team)
+                    found = player in team_players
 
-            if player not in team_players:
+            if not found:
                 if look_good:
                     output = f"{player} was not found in {game} of {team}"
                     return output
@@ -1130,7 +2309,7 @@ class AccessData:
             else:
                 if look_good:
                     output = f"{player} was found in {game} of {team}"
-                    log_entry = create_log(
+                    log_entry = log_action(
                                 level="INFO",
                                 message="check_player ran successfully",
                                 where="check_player",
@@ -1138,10 +2317,9 @@ class AccessData:
                                 source_ip=cls.source_ip,
                                 request_id=cls.request_id
                             )
-                    write.write_to("C:/Users/Drags Jrs/Drags/Database/log/accessing_data_log.json", log_entry)
                     return output
                 else:
-                    log_entry = create_log(
+                    log_entry = log_action(
                                 level="INFO",
                                 message="check_player ran successfully",
                                 where="check_player",
@@ -1149,13 +2327,12 @@ class AccessData:
                                 source_ip=cls.source_ip,
                                 request_id=cls.request_id
                             )
-                    write.write_to("C:/Users/Drags Jrs/Drags/Database/log/accessing_data_log.json", log_entry)
 
                     return True
 
         except Exception as e:
             error = {"type": type(e).__name__, 'message': str(e)}
-            log_entry = create_log(
+            log_entry = log_action(
                 level="ERROR",
                 message="check_player failed",
                 where="check_player",
@@ -1164,9 +2341,119 @@ class AccessData:
                 source_ip=cls.source_ip,
                 request_id=cls.request_id
             )
-            write.write_to("C:/Users/Drags Jrs/Drags/Database/log/accessing_data_log.json", log_entry)
             return log_entry
 
+    @classmethod
+    def get_games_between(cls, start=None, end=None):
+        # Game keys from start to end (both included, None = open), oldest first (see utils/game_dates.py)
+        #   start/end: 2025, "2025-08", "2025-08-14", (2025, 8) or a datetime.date
+        try:
+            cls._ensure_initialized()
+            dataset = AccessData.dataset
+
+            games = dataset.dates.between(start, end)
+
+            log_entry = log_action(
+                level="INFO",
+                message="get_games_between ran successfully",
+                where="get_games_between",
+                user_id=cls.user_id,
+                source_ip=cls.source_ip,
+                request_id=cls.request_id
+            )
+            return games
+        except Exception as e:
+            error = {"type": type(e).__name__, 'message': str(e)}
+            log_entry = log_action(
+                level="ERROR",
+                message="get_games_between failed",
+                where="get_games_between",
+                error=error,
+                user_id=cls.user_id,
+                source_ip=cls.source_ip,
+                request_id=cls.request_id
+            )
+            return log_entry
+
+    @classmethod
+    def get_last_games(cls, count: int, end=None):
+        # The count most recent game keys (up to end, when given), oldest first
+        try:
+            cls._ensure_initialized()
+            dataset = AccessData.dataset
+
+            if isinstance(count, bool) or not isinstance(count, int):
+                raise TypeError("count must be an int")
+            if count < 0:
+                raise ValueError("count can't be negative")
+
+            games = dataset.dates.last(count, end)
+
+            log_entry = log_action(
+                level="INFO",
+                message="get_last_games ran successfully",
+                where="get_last_games",
+                user_id=cls.user_id,
+                source_ip=cls.source_ip,
+                request_id=cls.request_id
+            )
+            return games
+        except Exception as e:
+            error = {"type": type(e).__name__, 'message': str(e)}
+            log_entry = log_action(
+                level="ERROR",
+                message="get_last_games failed",
+                where="get_last_games",
+                error=error,
+                user_id=cls.user_id,
+                source_ip=cls.source_ip,
+                request_id=cls.request_id
+            )
+            return log_entry
+
+    @classmethod
+    def get_partitions(cls, season=None):
+        # season -> team -> games (utils/partitions.py), season limits it to that one season
+        try:
+            cls._ensure_initialized()
+            dataset = AccessData.dataset
+            cls._check_filters(season, None)
+
+            tree = cls._partitions(dataset).tree()
+            if season is not None:
+                tree = {key: teams for key, teams in tree.items() if key == str(season)}
+
+            log_entry = log_action(
+                level="INFO",
+                message="get_partitions ran successfully",
+                where="get_partitions",
+                user_id=cls.user_id,
+                source_ip=cls.source_ip,
+                request_id=cls.request_id
+            )
+            return tree
+        except Exception as e:
+            error = {"type": type(e).__name__, 'message': str(e)}
+            log_entry = log_action(
+                level="ERROR",
+                message="get_partitions failed",
+                where="get_partitions",
+                error=error,
+                user_id=cls.user_id,
+                source_ip=cls.source_ip,
+                request_id=cls.request_id
+            )
+            return log_entry
+
+# Games in a SQLite file or a shard directory instead of Data.json: BASKETBALL_STATS_DB=path/to/Data.sqlite
+# (or path/to/Data.shards), or AccessData.use_storage(...)
+if os.environ.get("BASKETBALL_STATS_DB"):
+    AccessData.use_storage(open_storage(os.environ["BASKETBALL_STATS_DB"]))
+
+# Per-method call counts and latency: set BASKETBALL_STATS_METRICS=1 (or call metrics.instrument(AccessData) yourself)
+if os.environ.get("BASKETBALL_STATS_METRICS"):
+    metrics.instrument(AccessData)
+
 class Formatter:
 
     def __init__(self, user_id: str = "anonymous", source_ip: Optional[str] = None):
@@ -1188,7 +2475,7 @@ class Formatter:
           output.append("--------------------------------------------------")
           return "\n".join(output)
 
-          log_entry = create_log(
+          log_entry = log_action(
                 level="INFO",
                 message="formatget_details ran successfully",
                 where="format_get_details",
@@ -1196,11 +2483,10 @@ class Formatter:
                 source_ip=self.source_ip,
                 request_id=self.request_id
             )
-        write.write_to("C:/Users/Drags Jrs/Drags/Database/log/accessing_data_log.json", log_entry)
 
       except Exception as e:
         error = {"type": type(e).__name__, 'message': str(e)}
-        log_entry = create_log(
+        log_entry = log_action(
             level="ERROR",
             message="format_get_details failed",
             where="format_get_details",
@@ -1209,7 +2495,6 @@ class Formatter:
             source_ip=self.source_ip,
             request_id=self.request_id
         )
-        write.write_to("C:/Users/Drags Jrs/Drags/Database/log/accessing_data_log.json", log_entry)
         return log_entry
     def format_get_lineup(self, game: str, team: str):
         try:
@@ -1224,7 +2509,7 @@ class Formatter:
           for num, player in enumerate(team_players, start=1):
               output.append(f"{num}. {player}")
 
-          log_entry = create_log(
+          log_entry = log_action(
                           level="INFO",
                           message="format_get_lineup ran successfully",
                           where="format_get_lineup",
@@ -1232,11 +2517,10 @@ class Formatter:
                           source_ip=self.source_ip,
                           request_id=self.request_id
                       )
-          write.write_to("C:/Users/Drags Jrs/Drags/Database/log/accessing_data_log.json", log_entry)
           return "\n\n".join(output)
         except Exception as e:
             error = {"type": type(e).__name__, 'message': str(e)}
-            log_entry = create_log(
+            log_entry = log_action(
                   level="ERROR",
                   message="format_get_lineup failed",
                   where="format_get_lineup",
@@ -1245,7 +2529,6 @@ class Formatter:
                   source_ip=self.source_ip,
                   request_id=self.request_id
               )
-            write.write_to("C:/Users/Drags Jrs/Drags/Database/log/accessing_data_log.json", log_entry)
             return log_entry
     def format_get_quarter_stats(self, game: str, quarter: str):
         try:
@@ -1262,7 +2545,7 @@ class Formatter:
               for stat_name, stat_value in stats.items():
                   output.append(f"   - {stat_name}: {stat_value}")
 
-          log_entry = create_log(
+          log_entry = log_action(
                           level="INFO",
                           message="format_get_quarter_stats ran successfully",
                           where="format_get_quarter_stats",
@@ -1270,11 +2553,10 @@ class Formatter:
                           source_ip=self.source_ip,
                           request_id=self.request_id
                       )
-          write.write_to("C:/Users/Drags Jrs/Drags/Database/log/accessing_data_log.json", log_entry)
           return "\n".join(output)
         except Exception as e:
             error = {"type": type(e).__name__, 'message': str(e)}
-            log_entry = create_log(
+            log_entry = log_action(
                   level="ERROR",
                   message="format_get_quarter_stats failed",
                   where="format_get_quarter_stats",
@@ -1283,7 +2565,6 @@ class Formatter:
                   source_ip=self.source_ip,
                   request_id=self.request_id
               )
-            write.write_to("C:/Users/Drags Jrs/Drags/Database/log/accessing_data_log.json", log_entry)
             return log_entry
     def format_get_specfic_stats(self, game: str, quarter: str, player: str):
       try:
@@ -1300,7 +2581,7 @@ class Formatter:
         for stat_name, stat_value in specific_stats.items():
             output.append(f"   - {stat_name}: {stat_value}")
 
-        log_entry = create_log(
+        log_entry = log_action(
                         level="INFO",
                         message="format_get_specific_stats ran successfully",
                         where="format_get_specific_stats",
@@ -1308,11 +2589,10 @@ class Formatter:
                         source_ip=self.source_ip,
                         request_id=self.request_id
                     )
-        write.write_to("C:/Users/Drags Jrs/Drags/Database/log/accessing_data_log.json", log_entry)
         return "\n".join(output)
       except Exception as e:
           error = {"type": type(e).__name__, 'message': str(e)}
-          log_entry = create_log(
+          log_entry = log_action(
                 level="ERROR",
                 message="format_get_specific_stats failed",
                 where="format_get_specific_stats",
@@ -1321,7 +2601,6 @@ class Formatter:
                 source_ip=self.source_ip,
                 request_id=self.request_id
             )
-          write.write_to("C:/Users/Drags Jrs/Drags/Database/log/accessing_data_log.json", log_entry)
           return log_entry
 
     def format_get_game_stats(self, game: str, player: str):
@@ -1345,7 +2624,7 @@ class Formatter:
                 lines.append(f"{player_name}: {stat_line}")
             output = "\n".join(lines)
 
-          log_entry = create_log(
+          log_entry = log_action(
                 level="INFO",
                 message="format_get_game_stats ran successfully",
                 where="format_get_game_stats",
@@ -1353,11 +2632,10 @@ class Formatter:
                 source_ip=cls.source_ip,
                 request_id=cls.request_id
             )
-          write.write_to("C:/Users/Drags Jrs/Drags/Database/log/accessing_data_log.json", log_entry)
           return output
       except Exception as e:
             error = {"type": type(e).__name__, 'message': str(e)}
-            log_entry = create_log(
+            log_entry = log_action(
                 level="ERROR",
                 message="format_get_game_stats failed",
                 where="format_get_game_stats",
@@ -1366,7 +2644,6 @@ class Formatter:
                 source_ip=self.source_ip,
                 request_id=self.request_id
             )
-            write.write_to("C:/Users/Drags Jrs/Drags/Database/log/accessing_data_log.json", log_entry)
             return log_entry
 
     def format_get_season_stats(self, player: str, sum_total: bool = False):
@@ -1390,7 +2667,7 @@ class Formatter:
                     output += f"    - {stat_name}: {stat_value}\n"
                     if stat_name == "Turnovers":
                         output += "\n"
-          log_entry = create_log(
+          log_entry = log_action(
                 level="INFO",
                 message="format_get_season_stats ran successfully",
                 where="format_get_season_stats",
@@ -1398,12 +2675,11 @@ class Formatter:
                 source_ip=cls.source_ip,
                 request_id=cls.request_id
             )
-          write.write_to("C:/Users/Drags Jrs/Drags/Database/log/accessing_data_log.json", log_entry)
           return output
 
       except Exception as e:
         error = {"type": type(e).__name__, 'message': str(e)}
-        log_entry = create_log(
+        log_entry = log_action(
             level="ERROR",
             message="get_season_stats failed",
             where="get_season_stats",
@@ -1412,7 +2688,6 @@ class Formatter:
             source_ip=self.source_ip,
             request_id=self.request_id
         )
-        write.write_to("C:/Users/Drags Jrs/Drags/Database/log/accessing_data_log.json", log_entry)
         return log_entry
 
     def format_get_team_season_stats(self, sum_total: bool = False):
@@ -1458,7 +2733,7 @@ if __name__ == '__main__':
 #
 #    -   initialize(): Loads JSON data with validation and error logging
 #    -   save(): Persists data with automatic backups and atomic write operations
-#    -   _ensure_initialized(): Classmethod ensuring singleton-like initialization
+#    -   _ensure_initialized(): Classmethod ensuring singleton-like initialization, reloads Data.json when it changes on disk
 #
 #   4. QUERY METHODS (ALL CLASSMETHODS - RETURN RAW OR FORMATTED DATA)
 #
@@ -1489,15 +2764,14 @@ if __name__ == '__main__':
 #
 #   CONCERNS (WILL TRY AND FIX)
 #
-#       - Full aggregation: get_season_stats() iterates entire dataset every call
+#       - Full aggregation: season/game totals come from precomputed tables (utils/aggregates.py), rebuilt on every save()
 #       - Repeated string operations: Multiple .get() calls and .format() operations
 #       - Memory overhead: Every look_good=True call creates large formatted strings
-#       - JSON file locking: save() blocks on I/O with no async support
+#       - JSON file locking: save() blocks on I/O with no async support (small edits: set_stat & co. go to the journal)
 #
 #   SCALABILITY ISSUES
-#       - Large datasets (1000+ games) will suffer from O(n) iterations
-#       - No caching mechanism for frequently accessed aggregates
-#       - Logging to JSON sequentially creates I/O bottleneck
+#       - Large datasets (1000+ games) still pay O(n) on load and on every save()
+#       - Aggregates are memoized per data version (utils/query_cache.py), the first call after a load/save still pays
 #
 # ============================================================================
 
@@ -1508,13 +2782,18 @@ if __name__ == '__main__':
 #
 #       - json: Data serialization
 #       - os: File/directory operations
-#       - shutil: File backup operations
+#       - shutil: File backup operations (utils/save_state.py)
 #       - socket: Hostname/IP resolution
 #       - uuid: Request tracking
 #       - urllib.request: Public IP lookup
 #       - typing: Type hints
+#       - numpy: Optional, columnar stat cube (utils/stat_cube.py)
 #       - datetime: Timestamps and timezone handling
-#       - utils.write: Custom logging module (required)
+#       - utils.log_writer: Background log writer (required)
+#       - utils.metrics: Optional per-method call counts and latency
+#       - utils.query_cache: LRU memoization of aggregate results (required)
+#       - utils.aggregates: Precomputed totals, cached next to Data.json (required)
+#       - utils.journal: Append-only change log replayed over Data.json (required)
 #
 #   INTERNAL
 #
@@ -1558,7 +2837,6 @@ if __name__ == '__main__':
 #
 #       - Add caching layer: LRU cache for frequently accessed queries
 #       - Optimize aggregations: Build indices on game/player names
-#       - Async logging: Move log writes to thread pool
 #       - Separate concerns: Create QueryBuilder and Formatter classes
 #       - Batch operations: Add get_multiple_players_stats() method
 #       - Query optimization: Cache season aggregates, invalidate on save
@@ -1635,7 +2913,7 @@ if __name__ == '__main__':
 #
 #       - Set up alerts for JSON log file size growth
 #       - Monitor file I/O performance
-#       - Track query response times
+#       - Track query response times (BASKETBALL_STATS_METRICS=1, see utils/metrics.py)
 #       - Alert on unhandled exceptions
 #
 #   BACKWARDS COMPATIBILITY
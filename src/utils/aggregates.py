@@ -0,0 +1,216 @@
+# Precomputed totals for the season/game read methods
+# Built once when the data is loaded (or loaded from the sidecar file when Data.json hasn't changed)
+# and kept up to date by save(), so get_game_stats / get_season_stats / get_team_season_stats /
+# get_quarter_season_stats are a dict lookup instead of a walk over every quarter of every game.
+#
+# Sidecar: <Data.json without .json>.aggregates.json, stamped with the sha256 of the Data.json bytes
+import hashlib
+import json
+import os
+from typing import Dict, Any, Optional
+
+FORMAT = 1
+TABLES = ("games", "game_quarters", "players", "season", "quarters", "quarter_games")
+
+def content_hash(raw: bytes) -> str:
+    return hashlib.sha256(raw).hexdigest()
+
+def sidecar_path(data_file: str) -> str:
+    root, _ = os.path.splitext(data_file)
+    return f"{root}.aggregates.json"
+
+def _copy(totals: Dict[str, Any]) -> Dict[str, Any]:
+    # Callers are free to change what they get back, the tables are not
+    return {key: dict(value) if isinstance(value, dict) else value for key, value in totals.items()}
+
+def _add(totals: Dict[str, Any], stats: Dict[str, Any]):
+    for stat_name, stat_value in stats.items():
+        totals[stat_name] = totals.get(stat_name, 0) + stat_value
+
+def _game_tables(game_data: Dict[str, Any]) -> tuple:
+    # ({player: {stat: total}}, {player: {quarter: {stat: total}}}) for one game
+    players = {}
+    quarters = {}
+    for quarter, quarter_stats in game_data["Quarters"].items():
+        for player, stats in quarter_stats.items():
+            if player not in players:
+                players[player] = {}
+            _add(players[player], stats)
+            if stats:
+                player_quarters = quarters.setdefault(player, {})
+                _add(player_quarters.setdefault(quarter, {}), stats)
+    return players, quarters
+
+def _same_shape(old, new) -> bool:
+    # Same keys in the same order all the way down, and only ints at the bottom (so subtracting is exact)
+    if isinstance(old, dict) and isinstance(new, dict):
+        return list(old) == list(new) and all(_same_shape(old[key], new[key]) for key in old)
+    return type(old) is int and type(new) is int
+
+def _shift(totals: Dict[str, Any], old: Dict[str, Any], new: Dict[str, Any]):
+    for stat_name, stat_value in new.items():
+        totals[stat_name] += stat_value - old[stat_name]
+
+class AggregateTables:
+    def __init__(self):
+        # game -> player -> stat total (every player listed in the game, even with no stats)
+        self.games: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        # game -> player -> quarter -> stat total (what update_game re-derives the quarter tables from)
+        self.game_quarters: Dict[str, Dict[str, Dict[str, Dict[str, Any]]]] = {}
+        # player -> game -> stat total (only games where the player recorded something)
+        self.players: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        # player -> stat total over the season
+        self.season: Dict[str, Dict[str, Any]] = {}
+        # player -> quarter -> stat total over the season
+        self.quarters: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        # player -> quarter -> game -> stat total
+        self.quarter_games: Dict[str, Dict[str, Dict[str, Dict[str, Any]]]] = {}
+        self.source_hash: Optional[str] = None
+
+    @classmethod
+    def build(cls, data: Dict[str, Any], source_hash: Optional[str] = None) -> Optional["AggregateTables"]:
+        tables = cls()
+        tables.source_hash = source_hash
+        try:
+            per_game = {game: _game_tables(game_data) for game, game_data in data.items()}
+            tables._derive(per_game)
+        except (TypeError, KeyError, AttributeError):
+            # Data the tables can't sum up, the read methods fall back to walking it (and report the error)
+            return None
+        return tables
+
+    def _derive(self, per_game: Dict[str, tuple]):
+        # Season level tables from the per game ones, keys in the same first-seen order as the dict walks
+        self.games = {}
+        self.game_quarters = {}
+        self.players = {}
+        self.season = {}
+        self.quarters = {}
+        self.quarter_games = {}
+        for game, (players, quarters) in per_game.items():
+            self.games[game] = players
+            self.game_quarters[game] = quarters
+            for player, totals in players.items():
+                _add(self.season.setdefault(player, {}), totals)
+                if totals:
+                    self.players.setdefault(player, {})[game] = totals
+            for player, player_quarters in quarters.items():
+                for quarter, totals in player_quarters.items():
+                    _add(self.quarters.setdefault(player, {}).setdefault(quarter, {}), totals)
+                    self.quarter_games.setdefault(player, {}).setdefault(quarter, {})[game] = totals
+
+    def update_game(self, data: Dict[str, Any], game: str) -> bool:
+        # After one game was added, changed or removed: sum up that game again and re-derive the
+        # season tables from the per game ones, no other game's quarters are walked
+        try:
+            changed = _game_tables(data[game]) if game in data else None
+        except (TypeError, KeyError, AttributeError):
+            return False
+
+        if changed is not None and game in self.games and _same_shape(self.games[game], changed[0]) and _same_shape(self.game_quarters[game], changed[1]):
+            # Only numbers changed (a set_stat / set_player on existing keys): shift the season totals
+            # by the difference, key order can't change so it stays identical to a full build
+            self._shift_game(game, changed)
+            self.source_hash = None
+            return True
+
+        per_game = {}
+        for name in data:
+            if name == game:
+                per_game[name] = changed
+            elif name in self.games and name in self.game_quarters:
+                per_game[name] = (self.games[name], self.game_quarters[name])
+            else:
+                return False
+        self._derive(per_game)
+        self.source_hash = None
+        return True
+
+    def _shift_game(self, game: str, changed: tuple):
+        # The nested dicts it changes are replaced, not changed, they may be shared with the tables this was copied from
+        players, quarters = changed
+        old_players, old_quarters = self.games[game], self.game_quarters[game]
+        for player, totals in players.items():
+            season = self.season[player] = dict(self.season[player])
+            _shift(season, old_players[player], totals)
+            if totals:
+                self.players[player] = {**self.players[player], game: totals}
+        for player, player_quarters in quarters.items():
+            season_quarters = self.quarters[player] = dict(self.quarters[player])
+            quarter_games = self.quarter_games[player] = dict(self.quarter_games[player])
+            for quarter, totals in player_quarters.items():
+                season = season_quarters[quarter] = dict(season_quarters[quarter])
+                _shift(season, old_quarters[player][quarter], totals)
+                quarter_games[quarter] = {**quarter_games[quarter], game: totals}
+        self.games[game] = players
+        self.game_quarters[game] = quarters
+
+    def copy(self) -> "AggregateTables":
+        # For update_game on a dataset that's already published: the copy gets its own top level dicts
+        # and update_game never changes a nested one in place, so these tables stay as they are
+        tables = AggregateTables()
+        tables.source_hash = self.source_hash
+        for name in TABLES:
+            setattr(tables, name, dict(getattr(self, name)))
+        return tables
+
+    def game_totals(self, game: str) -> Optional[Dict[str, Dict[str, Any]]]:
+        totals = self.games.get(game)
+        return None if totals is None else _copy(totals)
+
+    def player_game_totals(self, game: str, player: str) -> Optional[Dict[str, Any]]:
+        totals = self.games.get(game, {}).get(player)
+        return None if totals is None else dict(totals)
+
+    def season_totals(self, player: str) -> Dict[str, Any]:
+        return dict(self.season.get(player, {}))
+
+    def season_by_game(self, player: str) -> Dict[str, Dict[str, Any]]:
+        return _copy(self.players.get(player, {}))
+
+    def team_totals(self) -> Dict[str, Dict[str, Any]]:
+        return _copy(self.season)
+
+    def team_by_game(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        return {game: _copy(players) for game, players in self.games.items()}
+
+    def quarter_totals(self, player: str, quarter: str) -> Dict[str, Any]:
+        return dict(self.quarters.get(player, {}).get(quarter, {}))
+
+    def quarter_by_game(self, player: str, quarter: str) -> Dict[str, Dict[str, Any]]:
+        return _copy(self.quarter_games.get(player, {}).get(quarter, {}))
+
+    def save(self, path: str) -> bool:
+        if self.source_hash is None:
+            return False
+        payload = {"format": FORMAT, "source_hash": self.source_hash}
+        payload.update({name: getattr(self, name) for name in TABLES})
+        temp_path = f"{path}.tmp"
+        try:
+            # dumps, not dump: dump streams through the pure Python encoder, many times slower
+            raw = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+            with open(temp_path, "w", encoding="utf-8") as file:
+                file.write(raw)
+            os.replace(temp_path, path)
+        except (OSError, TypeError, ValueError):
+            return False
+        return True
+
+    @classmethod
+    def load(cls, path: str, source_hash: str) -> Optional["AggregateTables"]:
+        # None when there is no sidecar, or it was made from different data
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                payload = json.load(file)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(payload, dict) or payload.get("format") != FORMAT or payload.get("source_hash") != source_hash:
+            return None
+        if not all(isinstance(payload.get(name), dict) for name in TABLES):
+            return None
+
+        tables = cls()
+        tables.source_hash = source_hash
+        for name in TABLES:
+            setattr(tables, name, payload[name])
+        return tables
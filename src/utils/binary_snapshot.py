@@ -0,0 +1,144 @@
+# Binary snapshot of Data.json that loads with mmap instead of a parse
+# <Data>.snapshot.bin holds the string tables (games, quarters, players, stats), each game's non-stat keys
+# and the stat cube's fixed-width arrays. Loading maps the file and points NumPy arrays at the mapped
+# pages, nothing is parsed or copied, and every process that maps the same file shares those pages.
+#
+#   [0:16]   magic b"BSTATSNP", format (uint32), length of the header (uint32), little endian
+#   [16:..]  header, UTF-8 JSON: source stamp, string tables, layout, skeleton, array offsets
+#   ...      values (int64 or float64), present (bool), appears (bool), layout (int32), each 8 byte aligned, C order
+#
+# A snapshot is only used while Data.json still has the mtime and size it was made from, otherwise
+# load_or_build() makes a new one.
+import json
+import mmap
+import os
+import struct
+from typing import Dict, Any, Optional
+try:
+    from utils.stat_cube import StatCube, np
+except ImportError:
+    from stat_cube import StatCube, np
+try:
+    from utils import streaming
+except ImportError:
+    import streaming
+
+MAGIC = b"BSTATSNP"
+# 2: each stat line's layout (its keys' order), format 1 files are made again
+FORMAT = 2
+_PREFIX = struct.Struct("<8sII")
+ARRAYS = ("values", "present", "appears", "layout")
+
+def snapshot_path(data_file: str) -> str:
+    root, _ = os.path.splitext(data_file)
+    return f"{root}.snapshot.bin"
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+def write(path: str, data: Dict[str, Any], cube: StatCube, mtime_ns: int, size: int, digest: str):
+    # data: the games (their Quarters aren't read, the cube has them). Written next to path, then swapped in.
+    skeleton = {game: {key: (None if key == "Quarters" else value) for key, value in game_data.items()} for game, game_data in data.items()}
+    arrays = {
+        "values": np.ascontiguousarray(cube.values, dtype="<f8" if cube.values.dtype.kind == "f" else "<i8"),
+        "present": np.ascontiguousarray(cube.present, dtype=np.bool_),
+        "appears": np.ascontiguousarray(cube.appears, dtype=np.bool_),
+        "layout": np.ascontiguousarray(cube.layout, dtype="<i4")
+    }
+    header = {
+        "source": {"mtime_ns": mtime_ns, "size": size, "digest": digest},
+        "names": {"games": cube.games, "quarters": cube.quarters, "players": cube.players, "stats": cube.stats},
+        "game_quarters": cube.game_quarters,
+        "game_players": cube.game_players,
+        "cell_players": [[g, q, cell] for (g, q), cell in cube.cell_players.items()],
+        "layouts": [list(line) for line in cube.layouts],
+        "skeleton": skeleton,
+        "dtype": arrays["values"].dtype.str,
+        "shape": list(cube.values.shape),
+        "offsets": {}
+    }
+    # Offsets depend on the header's length and the header holds the offsets: lay out with placeholders
+    # wide enough for any real offset, then write the same length again with the real numbers
+    header["offsets"] = {name: 10 ** 15 for name in ARRAYS}
+    start = _align(_PREFIX.size + len(json.dumps(header, ensure_ascii=False).encode("utf-8")))
+    for name in ARRAYS:
+        header["offsets"][name] = start
+        start = _align(start + arrays[name].nbytes)
+    raw_header = json.dumps(header, ensure_ascii=False).encode("utf-8")
+
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as file:
+        file.write(_PREFIX.pack(MAGIC, FORMAT, len(raw_header)))
+        file.write(raw_header)
+        for name in ARRAYS:
+            file.write(b"\0" * (header["offsets"][name] - file.tell()))
+            file.write(arrays[name].data)
+    os.replace(temp_path, path)
+
+def load(path: str, mtime_ns: int, size: int) -> Optional[tuple]:
+    # (data, cube, digest) answered from the mapped file, None when there's no usable snapshot for that Data.json
+    if np is None:
+        return None
+    try:
+        with open(path, "rb") as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    try:
+        magic, version, header_length = _PREFIX.unpack_from(mapped, 0)
+        if magic != MAGIC or version != FORMAT:
+            return None
+        header = json.loads(mapped[_PREFIX.size:_PREFIX.size + header_length].decode("utf-8"))
+        source = header["source"]
+        if (source["mtime_ns"], source["size"]) != (mtime_ns, size):
+            return None
+
+        shape = tuple(header["shape"])
+        kinds = {
+            "values": (np.dtype(header["dtype"]), shape), "present": (np.dtype(np.bool_), shape),
+            "appears": (np.dtype(np.bool_), shape[:3]), "layout": (np.dtype("<i4"), shape[:3])
+        }
+        arrays = {}
+        for name in ARRAYS:
+            dtype, array_shape = kinds[name]
+            # Read only views of the mapped pages, no copy
+            array = np.frombuffer(mapped, dtype=dtype, count=int(np.prod(array_shape)), offset=header["offsets"][name])
+            arrays[name] = array.reshape(array_shape)
+    except (struct.error, ValueError, KeyError, TypeError):
+        return None
+
+    cube = StatCube.from_arrays(
+        {table: header["names"][table] for table in ("games", "quarters", "players", "stats")},
+        header["game_quarters"],
+        header["game_players"],
+        {(g, q): cell for g, q, cell in header["cell_players"]},
+        arrays["values"], arrays["present"], arrays["appears"],
+        header["layouts"], arrays["layout"]
+    )
+    data = header["skeleton"]
+    for game, game_data in data.items():
+        if "Quarters" in game_data:
+            game_data["Quarters"] = cube.quarters_view(game)
+    return data, cube, source["digest"]
+
+def load_or_build(data_file: str) -> Optional[tuple]:
+    # The snapshot for data_file, made (from a streamed read) first when it's missing or older than the file.
+    # None when it can't be: no NumPy, or data the cube can't hold.
+    if np is None:
+        return None
+    stat = os.stat(data_file)
+    path = snapshot_path(data_file)
+    loaded = load(path, stat.st_mtime_ns, stat.st_size)
+    if loaded is not None:
+        return loaded
+
+    streamed = streaming.ingest(data_file)
+    if streamed is None:
+        return None
+    data, cube, digest = streamed
+    try:
+        write(path, data, cube, stat.st_mtime_ns, stat.st_size, digest)
+    except OSError:
+        # Read only directory, or (on Windows) another process still has the old one mapped: use what was just read
+        return streamed
+    return load(path, stat.st_mtime_ns, stat.st_size) or streamed
@@ -0,0 +1,63 @@
+# One loaded copy of Data.json plus everything built from it
+# AccessData swaps a whole Dataset in at once on (re)load, a reload never touches the old dicts,
+# so anyone still holding the previous snapshot keeps reading consistent data.
+import os
+from typing import Dict, Any, Optional
+
+class FileStamp:
+    # What the file looked like when it was loaded, cheap to compare (one os.stat)
+    __slots__ = ("path", "mtime_ns", "size", "digest")
+
+    def __init__(self, path: str, mtime_ns: int, size: int, digest: Optional[str] = None):
+        self.path = path
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.digest = digest
+
+    @classmethod
+    def of(cls, path: str, digest: Optional[str] = None) -> "FileStamp":
+        stat = os.stat(path)
+        return cls(path, stat.st_mtime_ns, stat.st_size, digest)
+
+    @classmethod
+    def find(cls, path: str) -> Optional["FileStamp"]:
+        # Same as of() but None when the file isn't there
+        try:
+            return cls.of(path)
+        except OSError:
+            return None
+
+    def same_file(self, other: Optional["FileStamp"]) -> bool:
+        return other is not None and (self.path, self.mtime_ns, self.size) == (other.path, other.mtime_ns, other.size)
+
+    def __repr__(self):
+        return f"<FileStamp {self.path} mtime_ns={self.mtime_ns} size={self.size} digest={self.digest}>"
+
+def same_stamp(first: Optional[FileStamp], second: Optional[FileStamp]) -> bool:
+    # Both missing counts as the same
+    if first is None or second is None:
+        return first is None and second is None
+    return first.same_file(second)
+
+class Dataset:
+    __slots__ = ("data", "tables", "cube", "version", "stamp", "journal", "read_only", "problems", "partitions", "dates", "players")
+
+    def __init__(self, data: Dict[str, Any], tables, cube, version: int, stamp: Optional[FileStamp], journal: Optional[FileStamp] = None,
+                 read_only: bool = False, problems: Optional[list] = None, partitions=None, dates=None, players=None):
+        self.data = data
+        self.tables = tables
+        self.cube = cube
+        self.version = version
+        self.stamp = stamp
+        # The journal replayed on top of stamp's file (None = there was none)
+        self.journal = journal
+        # Streamed or mapped in (utils/streaming.py, utils/binary_snapshot.py): the games' Quarters are read only views over the cube
+        self.read_only = read_only
+        # What utils/schema.py found wrong with data ([] = it passed, None = it wasn't checked)
+        self.problems = problems
+        # Games by season and team (utils/partitions.py), built the first time a query needs it
+        self.partitions = partitions
+        # Games in date order (utils/game_dates.py), built when the dataset is published
+        self.dates = dates
+        # Where each player appears, and the lineups as sets (utils/player_index.py), built when published
+        self.players = players
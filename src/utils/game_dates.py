@@ -0,0 +1,160 @@
+# Games in date order, from the Year / Month / Day / Time in their Details
+# Built when the data is published and moved along with set_* changes, so "the last 5 games" or
+# "games in August" are a bisect into one sorted list instead of parsing every game's Details.
+#
+# A game's date is (year, month, day, minute of the day). Day is only the day of the month when it's
+# a number: Data.json has weekday names there ("Monday"), those don't order anything and count as 0,
+# same as a missing month, day or time. A game without a Year isn't in the index (see undated).
+# Games on the same date keep the order they have in the data.
+import datetime
+import re
+from bisect import bisect_left, bisect_right, insort
+from typing import Any, Dict, List, Optional, Tuple
+
+DateKey = Tuple[int, int, int, int]
+
+MONTHS = {name: number for number, name in enumerate(
+    ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"), start=1
+)}
+_TIME = re.compile(r"^\s*(\d{1,2})(?::(\d{2}))?\s*([AaPp][Mm])?\s*$")
+_WINDOW = re.compile(r"^\s*(\d{4})(?:-(\d{1,2})(?:-(\d{1,2})(?:[T ](\d{1,2}):(\d{2}))?)?)?\s*$")
+END_OF_DAY = 24 * 60
+
+def _int(value) -> Optional[int]:
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str) and value.strip().isdigit():
+        return int(value)
+    return None
+
+def month_of(value) -> int:
+    number = _int(value)
+    if number is not None:
+        return number if 1 <= number <= 12 else 0
+    if isinstance(value, str):
+        return MONTHS.get(value.strip()[:3].lower(), 0)
+    return 0
+
+def minutes_of(value) -> int:
+    # "6:05PM", "18:05", "6PM" -> minutes since midnight, 0 when it can't be read
+    match = _TIME.match(value) if isinstance(value, str) else None
+    if match is None:
+        return 0
+    hour, minute, half = int(match.group(1)), int(match.group(2) or 0), match.group(3)
+    if half is not None:
+        if not 1 <= hour <= 12:
+            return 0
+        hour = hour % 12 + (12 if half.lower() == "pm" else 0)
+    if hour > 23 or minute > 59:
+        return 0
+    return hour * 60 + minute
+
+def date_of(game_data: Any) -> Optional[DateKey]:
+    details = game_data.get("Details") if isinstance(game_data, dict) else None
+    if not isinstance(details, dict):
+        return None
+    year = _int(details.get("Year"))
+    if year is None:
+        return None
+    day = _int(details.get("Day"))
+    return (year, month_of(details.get("Month")), day if day is not None and 1 <= day <= 31 else 0, minutes_of(details.get("Time")))
+
+def window_key(value, upper: bool = False) -> Optional[DateKey]:
+    # One end of a window, parts that aren't given cover the whole year / month / day:
+    #   2025, "2025-08", "2025-08-14", "2025-08-14 18:05", (2025, 8), datetime.date / datetime.datetime
+    if value is None:
+        return None
+    if isinstance(value, datetime.datetime):
+        return (value.year, value.month, value.day, value.hour * 60 + value.minute)
+    if isinstance(value, datetime.date):
+        return (value.year, value.month, value.day, END_OF_DAY if upper else 0)
+    if isinstance(value, int) and not isinstance(value, bool):
+        parts = [value]
+    elif isinstance(value, tuple) and 1 <= len(value) <= 3 and all(isinstance(part, int) and not isinstance(part, bool) for part in value):
+        parts = list(value)
+    elif isinstance(value, str) and _WINDOW.match(value):
+        groups = _WINDOW.match(value).groups()
+        parts = [int(part) for part in groups[:3] if part is not None]
+        if groups[3] is not None:
+            return (parts[0], parts[1], parts[2], int(groups[3]) * 60 + int(groups[4]))
+    else:
+        raise ValueError(f"Not a date: {value!r} (use 2025, '2025-08', '2025-08-14' or a datetime.date)")
+    # Unknown parts of a game's date are 0, so the lower end starts at 0 to take those in
+    fill = [13, 32, END_OF_DAY] if upper else [0, 0, 0]
+    return tuple(parts + fill[len(parts) - 1:])
+
+class GameDates:
+    def __init__(self, data: Dict[str, Any]):
+        # (date, order, game), sorted. order is the game's place in data, new games go after every other one.
+        self._entries: List[Tuple[DateKey, int, str]] = []
+        self._by_game: Dict[str, Tuple[DateKey, int, str]] = {}
+        self._order: Dict[str, int] = {}
+        self.undated: List[str] = []
+        for order, (game, game_data) in enumerate(data.items()):
+            self._order[game] = order
+            key = date_of(game_data)
+            if key is None:
+                self.undated.append(game)
+            else:
+                entry = (key, order, game)
+                self._entries.append(entry)
+                self._by_game[game] = entry
+        self._entries.sort()
+        self._next = len(data)
+
+    def update_game(self, data: Dict[str, Any], game: str):
+        # After one game was added, changed or removed
+        old = self._by_game.pop(game, None)
+        if old is not None:
+            del self._entries[bisect_left(self._entries, old)]
+        elif game in self.undated:
+            self.undated.remove(game)
+        if game not in data:
+            self._order.pop(game, None)
+            return
+        order = self._order.get(game)
+        if order is None:
+            order = self._order[game] = self._next
+            self._next += 1
+        key = date_of(data[game])
+        if key is None:
+            self.undated.append(game)
+            return
+        entry = (key, order, game)
+        insort(self._entries, entry)
+        self._by_game[game] = entry
+
+    def copy(self) -> "GameDates":
+        # update_game on the copy leaves this one as it was (a published dataset may still be using it)
+        dates = GameDates.__new__(GameDates)
+        dates._entries = list(self._entries)
+        dates._by_game = dict(self._by_game)
+        dates._order = dict(self._order)
+        dates.undated = list(self.undated)
+        dates._next = self._next
+        return dates
+
+    def date(self, game: str) -> Optional[DateKey]:
+        entry = self._by_game.get(game)
+        return None if entry is None else entry[0]
+
+    def between(self, start=None, end=None, data_order: bool = False) -> List[str]:
+        # Games from start to end (both included, either can be None), oldest first or in data order
+        low, high = window_key(start), window_key(end, upper=True)
+        first = 0 if low is None else bisect_left(self._entries, (low,))
+        last = len(self._entries) if high is None else bisect_right(self._entries, (high, float("inf")))
+        entries = self._entries[first:last]
+        if data_order:
+            entries = sorted(entries, key=lambda entry: entry[1])
+        return [game for _, _, game in entries]
+
+    def last(self, count: int, end=None) -> List[str]:
+        # The count most recent games (up to end), oldest first
+        high = window_key(end, upper=True)
+        last = len(self._entries) if high is None else bisect_right(self._entries, (high, float("inf")))
+        return [game for _, _, game in self._entries[max(last - count, 0):last]]
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,211 @@
+# Box score CSV files into Data.json, many rows at a time
+# A file is one row per player per quarter, the stat columns are whatever the header names after
+# the key columns (team is optional, it adds the player to that team's Lineup):
+#
+#   game,quarter,player,team,Points,Fouls,Rebounds,Assists,Turnovers
+#   Game_9,Quarter 1,Angus Lee,Newport Raiders U16 Boys Julie,4,1,2,0,1
+#
+# read() streams the files and checks every row, collecting every problem (file:line: message) instead of
+# stopping at the first. merge() then builds the new game dicts without touching the old ones, so
+# AccessData.import_box_scores() can save them all at once on a new data dict, the loaded one untouched.
+#
+#   python utils/importer.py Data.json box1.csv box2.csv ...
+import csv
+import os
+import sys
+import time
+from collections.abc import Mapping
+from typing import Dict, Any, Iterable, List, NamedTuple, Optional, Tuple
+
+KEYS = ("game", "quarter", "player")
+TEAM = "team"
+
+class RowProblem(NamedTuple):
+    file: str
+    line: int
+    message: str
+
+    def __str__(self) -> str:
+        return f"{self.file}:{self.line}: {self.message}"
+
+class Batch:
+    # Everything read from a set of files: game -> quarter -> player -> {stat: value}, plus the lineups
+    def __init__(self):
+        self.games: Dict[str, Dict[str, Dict[str, Dict[str, Any]]]] = {}
+        self.lineups: Dict[str, Dict[str, List[str]]] = {}
+        self.problems: List[RowProblem] = []
+        self.files = 0
+        self.rows = 0
+        self.seconds = 0.0
+        # (game, quarter, player) -> where it was first seen, a second row for it is a problem
+        self._seen: Dict[Tuple[str, str, str], Tuple[str, int]] = {}
+
+    def lines(self) -> int:
+        return sum(len(quarter) for quarters in self.games.values() for quarter in quarters.values())
+
+def _number(text: str):
+    # int when it is one, then float, None when it's neither
+    try:
+        return int(text)
+    except ValueError:
+        pass
+    try:
+        value = float(text)
+    except ValueError:
+        return None
+    # nan / inf would be written as invalid JSON
+    return value if value == value and value not in (float("inf"), float("-inf")) else None
+
+def read_file(path: str, batch: Batch):
+    name = os.path.basename(path)
+    with open(path, 'r', encoding='utf-8-sig', newline='') as file:
+        reader = csv.reader(file)
+        header = next(reader, None)
+        batch.files += 1
+        if header is None:
+            batch.problems.append(RowProblem(name, 1, "the file is empty"))
+            return
+        header = [column.strip() for column in header]
+        lowered = [column.lower() for column in header]
+        missing = [key for key in KEYS if key not in lowered]
+        if missing:
+            batch.problems.append(RowProblem(name, 1, f"missing column(s): {', '.join(missing)}"))
+            return
+        game_at, quarter_at, player_at = (lowered.index(key) for key in KEYS)
+        team_at = lowered.index(TEAM) if TEAM in lowered else None
+        keys = {game_at, quarter_at, player_at, team_at}
+        stat_columns = [(index, column) for index, column in enumerate(header) if index not in keys]
+        if not stat_columns:
+            batch.problems.append(RowProblem(name, 1, "no stat columns"))
+            return
+        duplicates = {column for column in header if header.count(column) > 1}
+        if duplicates:
+            batch.problems.append(RowProblem(name, 1, f"duplicate column(s): {', '.join(sorted(duplicates))}"))
+            return
+
+        width = len(header)
+        games, lineups, problems, seen = batch.games, batch.lineups, batch.problems, batch._seen
+        for row in reader:
+            line = reader.line_num
+            if not any(cell.strip() for cell in row):
+                continue
+            batch.rows += 1
+            if len(row) != width:
+                problems.append(RowProblem(name, line, f"expected {width} cells, got {len(row)}"))
+                continue
+            game, quarter, player = row[game_at].strip(), row[quarter_at].strip(), row[player_at].strip()
+            if not (game and quarter and player):
+                problems.append(RowProblem(name, line, "game, quarter and player can't be empty"))
+                continue
+
+            stats = {}
+            for index, column in stat_columns:
+                text = row[index].strip()
+                if not text:
+                    # Left blank: the row doesn't set that stat
+                    continue
+                value = _number(text)
+                if value is None:
+                    problems.append(RowProblem(name, line, f"{column} must be a number, got {text!r}"))
+                    stats = None
+                    break
+                stats[column] = value
+            if stats is None:
+                continue
+
+            key = (game, quarter, player)
+            first = seen.get(key)
+            if first is not None:
+                problems.append(RowProblem(name, line, f"{game} / {quarter} / {player} is already in {first[0]}:{first[1]}"))
+                continue
+            seen[key] = (name, line)
+            games.setdefault(game, {}).setdefault(quarter, {})[player] = stats
+
+            team = row[team_at].strip() if team_at is not None else ""
+            if team:
+                players = lineups.setdefault(game, {}).setdefault(team, [])
+                if player not in players:
+                    players.append(player)
+
+def read(paths: Iterable[str]) -> Batch:
+    # Every row of every file, checked. Nothing is merged when batch.problems isn't empty.
+    batch = Batch()
+    started = time.perf_counter()
+    for path in paths:
+        try:
+            read_file(path, batch)
+        except (OSError, UnicodeDecodeError, csv.Error) as e:
+            batch.problems.append(RowProblem(os.path.basename(path), 0, f"{type(e).__name__}: {e}"))
+    batch.seconds = time.perf_counter() - started
+    return batch
+
+def _plain(stats: Mapping) -> Dict[str, Any]:
+    # Compact stat lines (utils/interning.py) back to a dict that can be changed
+    return stats if type(stats) is dict else dict(stats.items())
+
+def merge(data: Dict[str, Any], batch: Batch) -> Dict[str, Dict[str, Any]]:
+    # game -> its new dict with the batch merged in. data itself is left alone: games, quarters and
+    # stat lines the batch touches are new dicts, everything else is shared with the old game.
+    # A row updates the stats it has and leaves the player's other stats as they were.
+    merged = {}
+    for game, quarters in batch.games.items():
+        old = data.get(game)
+        new = dict(old) if isinstance(old, Mapping) else {}
+        new_quarters = dict(new.get("Quarters") or {})
+        for quarter, players in quarters.items():
+            old_quarter = new_quarters.get(quarter)
+            if isinstance(old_quarter, Mapping):
+                new_quarter = {player: _plain(stats) if isinstance(stats, Mapping) else stats for player, stats in old_quarter.items()}
+            else:
+                new_quarter = {}
+            for player, stats in players.items():
+                line = new_quarter.get(player)
+                new_quarter[player] = {**line, **stats} if isinstance(line, Mapping) else dict(stats)
+            new_quarters[quarter] = new_quarter
+        new["Quarters"] = new_quarters
+
+        teams = batch.lineups.get(game)
+        if teams:
+            lineup = {team: list(players) for team, players in (new.get("Lineup") or {}).items()}
+            for team, players in teams.items():
+                listed = lineup.setdefault(team, [])
+                listed.extend(player for player in players if player not in listed)
+            new["Lineup"] = lineup
+        merged[game] = new
+    return merged
+
+def report(batch: Batch, merged: Optional[Dict[str, Any]] = None, seconds: Optional[float] = None) -> Dict[str, Any]:
+    # What import_box_scores() returns: counts and throughput. seconds covers reading, merging and the save,
+    # read_seconds only reading and checking the rows.
+    seconds = batch.seconds if seconds is None else seconds
+    return {
+        "files": batch.files,
+        "rows": batch.rows,
+        "games": len(merged) if merged is not None else len(batch.games),
+        "stat_lines": batch.lines(),
+        "read_seconds": round(batch.seconds, 4),
+        "seconds": round(seconds, 4),
+        "rows_per_sec": round(batch.rows / seconds) if seconds > 0 else None
+    }
+
+if __name__ == '__main__':
+    if len(sys.argv) < 3:
+        print("usage: importer.py <Data.json in Database/> <box score.csv> [...]")
+        sys.exit(2)
+    try:
+        from utils.accessing_data import AccessData
+    except ImportError:
+        sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        from utils.accessing_data import AccessData
+    app = AccessData("importer")
+    failed = app.initialize(filename=sys.argv[1])
+    if failed:
+        print(failed["error"])
+        sys.exit(1)
+    result = app.import_box_scores([os.path.abspath(path) for path in sys.argv[2:]])
+    if result.get("log_level") == "ERROR":
+        print(result["error"]["message"])
+        for problem in result["error"].get("problems", [])[:50]:
+            print(f"  {problem}")
+        sys.exit(1)
+    print(f"{result['rows']} rows, {result['games']} games from {result['files']} file(s) in {result['seconds']} s ({result['rows_per_sec']} rows/s)")
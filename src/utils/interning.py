@@ -0,0 +1,370 @@
+# Integer ids for names, and quarters kept as rows of numbers instead of one dict per stat line
+# A loaded Data.json repeats every player name and the five stat keys in every quarter of every game,
+# and each stat line is its own dict. compact() interns games, quarters, players and stats to small
+# ints and turns each quarter into a CompactQuarter: one array of player ids and one array('i') of
+# values, a row per player, the columns (the quarter's stat names) shared by every quarter that has them.
+# Memory per stat line drops from ~240 bytes (a dict plus its slot in the quarter) to ~80.
+# That's ~3x, not 10x: most of what's left is per quarter. AccessData.compact_load also skips the
+# aggregate tables and cube, which keep a total per line too (43 -> 11 MiB on the 2000-game season).
+#
+# CompactQuarter and StatLine behave like the dicts they replace (reads, set_stat / set_player writes,
+# json through json_default), so the rest of AccessData keeps working with names. A quarter the rows
+# can't describe (stat lines with different keys, values that aren't 32 bit ints) stays a dict, and a
+# write that doesn't fit turns that one quarter back into dicts.
+#
+#   python utils/interning.py Database/Data.json      (measures the quarters both ways)
+import gc
+import json
+import sys
+import tracemalloc
+from array import array
+from collections.abc import Mapping, MutableMapping
+from typing import Dict, Any, List, Optional, Tuple
+
+# Quarters with more rows than this keep a player id -> row dict for lookups by name. Up to here scanning
+# the ids is about as quick, and the dict would cost more memory than the rows it points at.
+INDEX_ROWS = 16
+
+def _fits(value) -> bool:
+    # What an array('i') can hold and give back unchanged: ints, not bools, not floats (2.0 would come back as 2)
+    return type(value) is int and -2 ** 31 <= value < 2 ** 31
+
+class Names:
+    # name <-> id, ids handed out in first-seen order
+    __slots__ = ("names", "ids")
+
+    def __init__(self):
+        self.names: List[str] = []
+        self.ids: Dict[str, int] = {}
+
+    def intern(self, name: str) -> int:
+        num = self.ids.get(name)
+        if num is None:
+            num = self.ids[name] = len(self.names)
+            self.names.append(name)
+        return num
+
+    def get(self, name) -> Optional[int]:
+        return self.ids.get(name)
+
+    def __getitem__(self, num: int) -> str:
+        return self.names[num]
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+class Interner:
+    # The id tables one load shares between all its quarters
+    __slots__ = ("games", "quarters", "players", "stats", "_columns")
+
+    def __init__(self):
+        self.games = Names()
+        self.quarters = Names()
+        self.players = Names()
+        self.stats = Names()
+        # Interned column tuples, most quarters of a season share one
+        self._columns: Dict[Tuple[int, ...], Tuple[int, ...]] = {}
+
+    def columns(self, stat_names) -> Tuple[int, ...]:
+        key = tuple(self.stats.intern(stat) for stat in stat_names)
+        return self._columns.setdefault(key, key)
+
+class CompactQuarter(MutableMapping):
+    # player -> StatLine, backed by _players (ids) and _values (row major, len(_columns) per player)
+    __slots__ = ("_names", "_columns", "_players", "_values", "_dicts", "_rows")
+
+    def __init__(self, names: Interner, columns: Tuple[int, ...], players: array, values: array):
+        self._names = names
+        self._columns = columns
+        self._players = players
+        self._values = values
+        # Set once the quarter had to go back to dicts, everything is answered from it from then on
+        self._dicts: Optional[Dict[str, Dict[str, Any]]] = None
+        # player id -> row, built on the first lookup once there are more than INDEX_ROWS rows
+        self._rows: Optional[Dict[int, int]] = None
+
+    @classmethod
+    def pack(cls, names: Interner, quarter_stats: Dict[str, Any]) -> Optional["CompactQuarter"]:
+        # None when the stat lines don't share one set of keys or hold something other than ints
+        columns = None
+        stat_keys = None
+        players = array("i")
+        values = array("i")
+        for player, stats in quarter_stats.items():
+            if not isinstance(player, str) or not isinstance(stats, dict):
+                return None
+            if stat_keys is None:
+                stat_keys = list(stats)
+                columns = names.columns(stat_keys)
+            elif len(stats) != len(stat_keys) or any(a != b for a, b in zip(stats, stat_keys)):
+                return None
+            for value in stats.values():
+                if not _fits(value):
+                    return None
+                values.append(value)
+            players.append(names.players.intern(player))
+        if columns is None:
+            columns = names.columns(())
+        return cls(names, columns, players, values)
+
+    def _row(self, player) -> int:
+        num = self._names.players.get(player)
+        if num is None:
+            return -1
+        return self._find(num)
+
+    def _find(self, num: int) -> int:
+        # Row of the player with id num, -1 if they have none
+        rows = self._rows
+        if rows is None:
+            players = self._players
+            if len(players) <= INDEX_ROWS:
+                try:
+                    return players.index(num)
+                except ValueError:
+                    return -1
+            rows = self._rows = {player: row for row, player in enumerate(players)}
+        return rows.get(num, -1)
+
+    def _unpack(self) -> Dict[str, Dict[str, Any]]:
+        if self._dicts is None:
+            self._dicts = {player: self._line(row) for player, row in zip(self._player_names(), range(len(self._players)))}
+            self._players = array("i")
+            self._values = array("i")
+            self._rows = None
+        return self._dicts
+
+    def _player_names(self):
+        names = self._names.players.names
+        return [names[num] for num in self._players]
+
+    def _line(self, row: int) -> Dict[str, Any]:
+        width = len(self._columns)
+        stat_names = self._names.stats.names
+        start = row * width
+        return {stat_names[stat]: value for stat, value in zip(self._columns, self._values[start:start + width])}
+
+    def __getitem__(self, player: str):
+        if self._dicts is not None:
+            return self._dicts[player]
+        row = self._row(player)
+        if row < 0:
+            raise KeyError(player)
+        return StatLine(self, self._players[row], row)
+
+    def __setitem__(self, player: str, stats):
+        if self._dicts is None and isinstance(player, str) and isinstance(stats, Mapping) and len(stats) == len(self._columns):
+            stat_names = self._names.stats.names
+            if all(stat_names[stat] == key and _fits(value) for stat, (key, value) in zip(self._columns, stats.items())):
+                row = self._row(player)
+                new = array("i", stats.values())
+                width = len(self._columns)
+                if row < 0:
+                    num = self._names.players.intern(player)
+                    if self._rows is not None:
+                        self._rows[num] = len(self._players)
+                    self._players.append(num)
+                    self._values.extend(new)
+                else:
+                    self._values[row * width:(row + 1) * width] = new
+                return
+        # Keys or values the rows can't hold: this quarter goes back to dicts
+        self._unpack()[player] = stats
+
+    def __delitem__(self, player: str):
+        if self._dicts is not None:
+            del self._dicts[player]
+            return
+        row = self._row(player)
+        if row < 0:
+            raise KeyError(player)
+        width = len(self._columns)
+        del self._players[row]
+        del self._values[row * width:(row + 1) * width]
+        # The rows after it moved up
+        self._rows = None
+
+    def __contains__(self, player) -> bool:
+        if self._dicts is not None:
+            return player in self._dicts
+        return self._row(player) >= 0
+
+    def __iter__(self):
+        if self._dicts is not None:
+            return iter(self._dicts)
+        return iter(self._player_names())
+
+    def __len__(self) -> int:
+        return len(self._dicts) if self._dicts is not None else len(self._players)
+
+    def items(self):
+        if self._dicts is not None:
+            return self._dicts.items()
+        return [(name, StatLine(self, num, row)) for row, (name, num) in enumerate(zip(self._player_names(), self._players))]
+
+    def values(self):
+        return [line for _, line in self.items()]
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Mapping):
+            return NotImplemented
+        return self.copy() == {key: dict(value) if isinstance(value, Mapping) else value for key, value in other.items()}
+
+    def __repr__(self) -> str:
+        return repr(self.copy())
+
+    def copy(self) -> Dict[str, Dict[str, Any]]:
+        # Plain dicts, like a copy of the dicts this replaced (the stat lines are copied too)
+        if self._dicts is not None:
+            return {player: dict(stats) for player, stats in self._dicts.items()}
+        return {player: self._line(row) for row, player in enumerate(self._player_names())}
+
+class StatLine(MutableMapping):
+    # One player's stats in a CompactQuarter, reads and writes go to the quarter's rows
+    __slots__ = ("_quarter", "_player", "_row")
+
+    def __init__(self, quarter: CompactQuarter, player: int, row: int):
+        self._quarter = quarter
+        self._player = player
+        # Where the player's row was, checked on every use: only deleting a row before it moves it
+        self._row = row
+
+    def _target(self):
+        # (row, None) while the quarter is packed, (-1, dict) once it went back to dicts
+        quarter = self._quarter
+        if quarter._dicts is not None:
+            return -1, quarter._dicts[quarter._names.players[self._player]]
+        row, players = self._row, quarter._players
+        if row < len(players) and players[row] == self._player:
+            return row, None
+        row = quarter._find(self._player)
+        if row < 0:
+            raise KeyError(quarter._names.players[self._player])
+        self._row = row
+        return row, None
+
+    def __getitem__(self, stat: str):
+        row, stats = self._target()
+        if stats is not None:
+            return stats[stat]
+        quarter = self._quarter
+        num = quarter._names.stats.get(stat)
+        try:
+            column = quarter._columns.index(num)
+        except ValueError:
+            raise KeyError(stat) from None
+        return quarter._values[row * len(quarter._columns) + column]
+
+    def __setitem__(self, stat: str, value):
+        row, stats = self._target()
+        quarter = self._quarter
+        if stats is None:
+            num = quarter._names.stats.get(stat)
+            if num in quarter._columns and _fits(value):
+                quarter._values[row * len(quarter._columns) + quarter._columns.index(num)] = value
+                return
+            stats = quarter._unpack()[quarter._names.players[self._player]]
+        stats[stat] = value
+
+    def __delitem__(self, stat: str):
+        row, stats = self._target()
+        if stats is None:
+            stats = self._quarter._unpack()[self._quarter._names.players[self._player]]
+        del stats[stat]
+
+    def __iter__(self):
+        row, stats = self._target()
+        if stats is not None:
+            return iter(stats)
+        stat_names = self._quarter._names.stats.names
+        return iter([stat_names[stat] for stat in self._quarter._columns])
+
+    def __len__(self) -> int:
+        row, stats = self._target()
+        return len(stats) if stats is not None else len(self._quarter._columns)
+
+    def items(self):
+        row, stats = self._target()
+        if stats is not None:
+            return stats.items()
+        return self._quarter._line(row).items()
+
+    def values(self):
+        return [value for _, value in self.items()]
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Mapping):
+            return NotImplemented
+        return dict(self.items()) == dict(other.items())
+
+    def __repr__(self) -> str:
+        return repr(dict(self.items()))
+
+    def copy(self) -> Dict[str, Any]:
+        return dict(self.items())
+
+def compact(data: Dict[str, Any], names: Optional[Interner] = None) -> Interner:
+    # Packs every game's quarters in place, the games' other keys (Details, Lineup) stay as they are
+    names = names if names is not None else Interner()
+    for game, game_data in data.items():
+        if not isinstance(game_data, dict):
+            continue
+        names.games.intern(game)
+        quarters = game_data.get("Quarters")
+        if not isinstance(quarters, dict):
+            continue
+        for quarter, quarter_stats in quarters.items():
+            names.quarters.intern(quarter)
+            if isinstance(quarter_stats, dict):
+                packed = CompactQuarter.pack(names, quarter_stats)
+                if packed is not None:
+                    quarters[quarter] = packed
+    return names
+
+def json_default(value):
+    # json.dumps(..., default=json_default) writes compact quarters exactly like the dicts they replaced
+    if isinstance(value, Mapping):
+        return dict(value.items())
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def measure(raw: bytes) -> Dict[str, Any]:
+    # Memory the games' quarters take as dicts and packed, for Data.json's bytes (tracemalloc after gc.collect())
+    def traced(build):
+        gc.collect()
+        tracemalloc.start()
+        try:
+            kept = build()
+            gc.collect()
+            used = tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+        return kept, used
+
+    def quarters(data):
+        return [game_data["Quarters"] for game_data in data.values()]
+
+    def packed():
+        data = json.loads(raw)
+        return quarters(data), compact(data)
+
+    kept, dicts = traced(lambda: quarters(json.loads(raw)))
+    lines = sum(len(quarter_stats) for game_quarters in kept for quarter_stats in game_quarters.values())
+    del kept
+    kept, rows = traced(packed)
+    packed_quarters = sum(isinstance(quarter_stats, CompactQuarter) for game_quarters in kept[0] for quarter_stats in game_quarters.values())
+    return {
+        "lines": lines, "quarters": sum(len(game_quarters) for game_quarters in kept[0]), "packed": packed_quarters,
+        "dict_bytes": dicts, "compact_bytes": rows, "ratio": round(dicts / rows, 2) if rows else None
+    }
+
+if __name__ == '__main__':
+    if len(sys.argv) != 2:
+        print("usage: interning.py <Data.json>")
+        sys.exit(2)
+    with open(sys.argv[1], 'rb') as file:
+        result = measure(file.read())
+    lines = result["lines"] or 1
+    print(f"{result['lines']} stat lines, {result['packed']} of {result['quarters']} quarters packed")
+    print(f"dicts:   {result['dict_bytes'] / 2 ** 20:.1f} MiB ({result['dict_bytes'] / lines:.0f} B per line)")
+    print(f"compact: {result['compact_bytes'] / 2 ** 20:.1f} MiB ({result['compact_bytes'] / lines:.0f} B per line)")
+    print(f"{result['ratio']}x smaller")
@@ -0,0 +1,276 @@
+# Append-only journal of game / quarter / player-stat changes on top of Data.json
+# A change costs one appended line instead of rewriting (and backing up) the whole season.
+# Loading replays the journal over the snapshot, compaction folds it into a new Data.json.
+#
+# <Data>.journal.jsonl, JSON Lines:
+#   {"format": 1, "base": "<sha256 of the Data.json bytes these entries apply to>"}
+#   {"op": "set_stat", "game": "Game_4", "quarter": "Quarter 2", "player": "...", "stat": "Points", "value": 6}
+#   ...
+# The base hash ties the journal to one snapshot: once Data.json is replaced the old entries are
+# in it, and a journal that doesn't match is never replayed on top of the wrong data.
+import json
+import os
+import threading
+from typing import Dict, Any, List, Optional
+
+FORMAT = 1
+
+# op -> the fields an entry needs besides "op" (the last one is what gets stored)
+OPS = {
+    "set_game": ("game", "value"),
+    "delete_game": ("game",),
+    "set_quarter": ("game", "quarter", "value"),
+    "set_player": ("game", "quarter", "player", "value"),
+    "set_stat": ("game", "quarter", "player", "stat", "value")
+}
+
+def journal_path(data_file: str) -> str:
+    root, _ = os.path.splitext(data_file)
+    return f"{root}.journal.jsonl"
+
+def _number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+def check_entry(entry: Dict[str, Any]):
+    # The part of check() that doesn't need the data: known op, every field there, values of the right shape
+    op = entry.get("op")
+    if op not in OPS:
+        raise ValueError(f"Unknown journal op: {op}")
+    for field in OPS[op]:
+        if field not in entry:
+            raise KeyError(f"{op} needs {field}")
+    for field in OPS[op]:
+        if field != "value" and not isinstance(entry[field], str):
+            raise TypeError(f"{field} must be a string")
+
+    value = entry.get("value")
+    if op == "set_game":
+        if not isinstance(value, dict) or not isinstance(value.get("Quarters"), dict):
+            raise TypeError("a game must be a dict with Quarters")
+    elif op == "set_quarter":
+        if not isinstance(value, dict) or not all(isinstance(stats, dict) and all(_number(v) for v in stats.values()) for stats in value.values()):
+            raise TypeError("quarter stats must be {player: {stat: number}}")
+    elif op == "set_player":
+        if not isinstance(value, dict) or not all(_number(v) for v in value.values()):
+            raise TypeError("player stats must be {stat: number}")
+    elif op == "set_stat":
+        if not _number(value):
+            raise TypeError("stat value must be a number")
+
+def check(data: Dict[str, Any], entry: Dict[str, Any]):
+    # Raises (KeyError / TypeError / ValueError) if the entry can't be applied, touches nothing
+    check_entry(entry)
+    op = entry["op"]
+    if op == "set_game":
+        return
+    if entry["game"] not in data:
+        raise KeyError("Could not find the game")
+    if op == "delete_game":
+        return
+
+    quarters = data[entry["game"]].get("Quarters")
+    if not isinstance(quarters, dict):
+        raise KeyError("Quarters not found")
+    if op == "set_quarter":
+        return
+    if entry["quarter"] not in quarters:
+        raise KeyError("Could not find the quarter")
+    if op == "set_player":
+        return
+    if entry["player"] not in quarters[entry["quarter"]]:
+        raise KeyError("Could not find the player")
+
+def apply(data: Dict[str, Any], entry: Dict[str, Any]):
+    check(data, entry)
+    op = entry["op"]
+    if op == "set_game":
+        data[entry["game"]] = entry["value"]
+    elif op == "delete_game":
+        del data[entry["game"]]
+    elif op == "set_quarter":
+        data[entry["game"]]["Quarters"][entry["quarter"]] = entry["value"]
+    elif op == "set_player":
+        data[entry["game"]]["Quarters"][entry["quarter"]][entry["player"]] = entry["value"]
+    else:
+        data[entry["game"]]["Quarters"][entry["quarter"]][entry["player"]][entry["stat"]] = entry["value"]
+
+def _own(mapping) -> Dict[str, Any]:
+    # A dict that can be changed without touching mapping (a compact quarter, see utils/interning.py,
+    # comes back as the plain dicts it stands for)
+    return dict(mapping) if type(mapping) is dict else mapping.copy()
+
+def applied(data: Dict[str, Any], entry: Dict[str, Any]) -> Dict[str, Any]:
+    # apply() without touching data: a new top level dict, and new dicts along the path the entry
+    # changes (the game, its Quarters, the quarter, the stat line). Everything else is shared with data,
+    # so whoever still holds data (a snapshot()) keeps seeing it as it was.
+    check(data, entry)
+    op = entry["op"]
+    game = entry["game"]
+    new = dict(data)
+    if op == "set_game":
+        new[game] = entry["value"]
+        return new
+    if op == "delete_game":
+        del new[game]
+        return new
+    game_data = new[game] = dict(data[game])
+    quarters = game_data["Quarters"] = dict(game_data["Quarters"])
+    if op == "set_quarter":
+        quarters[entry["quarter"]] = entry["value"]
+        return new
+    quarter_stats = quarters[entry["quarter"]] = _own(quarters[entry["quarter"]])
+    if op == "set_player":
+        quarter_stats[entry["player"]] = entry["value"]
+        return new
+    stats = quarter_stats[entry["player"]] = _own(quarter_stats[entry["player"]])
+    stats[entry["stat"]] = entry["value"]
+    return new
+
+def _header_line(base: str) -> bytes:
+    return (json.dumps({"format": FORMAT, "base": base}) + "\n").encode("utf-8")
+
+def _base(path: str) -> Optional[str]:
+    # Only the header line, so appending never has to read the whole journal
+    try:
+        with open(path, 'r', encoding='utf-8') as file:
+            header = json.loads(file.readline())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(header, dict) or header.get("format") != FORMAT:
+        return None
+    return header.get("base")
+
+def _read(path: str):
+    # (base, [entries]) or (None, []) when there is no usable journal. A torn last line is skipped.
+    try:
+        with open(path, 'r', encoding='utf-8') as file:
+            lines = file.readlines()
+    except OSError:
+        return None, []
+    if not lines:
+        return None, []
+    try:
+        header = json.loads(lines[0])
+    except ValueError:
+        return None, []
+    if not isinstance(header, dict) or header.get("format") != FORMAT:
+        return None, []
+
+    entries = []
+    for line in lines[1:]:
+        if not line.endswith("\n"):
+            break
+        try:
+            entries.append(json.loads(line))
+        except ValueError:
+            continue
+    return header.get("base"), entries
+
+class Journal:
+    def __init__(self, path: str, fsync: bool = False):
+        self.path = path
+        self.fsync = fsync
+        # base of the journal file as last written/checked by us
+        self._base: Optional[str] = None
+        self._lock = threading.Lock()
+
+    @property
+    def next_path(self) -> str:
+        return f"{self.path}.next"
+
+    def size(self) -> int:
+        try:
+            return os.path.getsize(self.path)
+        except OSError:
+            return 0
+
+    def entries_for(self, base: str) -> List[Dict[str, Any]]:
+        # Entries to replay over the snapshot with this hash
+        found, entries = _read(self.path)
+        if found == base:
+            return entries
+        # Compaction died between replacing Data.json and the journal, the new journal is still in .next
+        found, entries = _read(self.next_path)
+        if found == base:
+            os.replace(self.next_path, self.path)
+            self._base = base
+            return entries
+        return []
+
+    def replay(self, data: Dict[str, Any], base: str) -> int:
+        applied = 0
+        for entry in self.entries_for(base):
+            try:
+                apply(data, entry)
+            except (KeyError, TypeError, ValueError):
+                # Was checked before it was written, only a hand edited journal gets here
+                continue
+            applied += 1
+        return applied
+
+    def append(self, entries: List[Dict[str, Any]], base: str):
+        with self._lock:
+            if self._base != base or not os.path.exists(self.path):
+                if _base(self.path) != base:
+                    self.reset(base)
+                self._base = base
+            lines = "".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries).encode("utf-8")
+            with open(self.path, 'ab+') as file:
+                # A crash can leave half a line at the end, start on a fresh line so it doesn't swallow ours
+                if file.seek(0, os.SEEK_END):
+                    file.seek(-1, os.SEEK_END)
+                    if file.read(1) != b"\n":
+                        lines = b"\n" + lines
+                file.write(lines)
+                file.flush()
+                if self.fsync:
+                    os.fsync(file.fileno())
+
+    def reset(self, base: str):
+        # Empty journal on top of the snapshot with this hash (after a full save)
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'wb') as file:
+            file.write(_header_line(base))
+            if self.fsync:
+                file.flush()
+                os.fsync(file.fileno())
+        os.replace(temp_path, self.path)
+        self._base = base
+
+    def tail(self, offset: int) -> bytes:
+        # Everything appended after offset (whole lines only)
+        with open(self.path, 'rb') as file:
+            file.seek(offset)
+            data = file.read()
+        end = data.rfind(b"\n") + 1
+        return data[:end]
+
+    def write_snapshot(self, data_file: str, raw: bytes) -> str:
+        # First half of compaction, the slow part: write the new snapshot next to Data.json.
+        # Changes can keep coming in meanwhile, they end up in the journal after the offset.
+        temp_path = f"{data_file}.compact"
+        with open(temp_path, 'wb') as file:
+            file.write(raw)
+            if self.fsync:
+                file.flush()
+                os.fsync(file.fileno())
+        return temp_path
+
+    def swap(self, data_file: str, temp_path: str, base: str, offset: int, old_base: str) -> bool:
+        # Second half: the new snapshot goes live and the journal restarts on top of it, keeping
+        # whatever was appended after offset. .next covers a crash between the two renames.
+        # False (and nothing replaced) when the journal isn't on old_base any more: a save() or another
+        # compaction wrote a newer Data.json meanwhile, and the snapshot in temp_path is older than it.
+        with self._lock:
+            if _base(self.path) != old_base:
+                os.remove(temp_path)
+                return False
+            tail = self.tail(offset)
+            next_temp = f"{self.next_path}.tmp"
+            with open(next_temp, 'wb') as file:
+                file.write(_header_line(base) + tail)
+            os.replace(next_temp, self.next_path)
+            os.replace(temp_path, data_file)
+            os.replace(self.next_path, self.path)
+            self._base = base
+            return True
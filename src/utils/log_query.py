@@ -0,0 +1,302 @@
+# Query the JSON Lines logs (accessing_data_log, player_report_log, ...) from the command line
+# Segments are streamed line by line, nothing is ever loaded whole, so it works on logs with millions of entries.
+# A sidecar index (<log>.idx, sqlite) remembers where every request_id and timestamp lives,
+# so repeat queries by request_id or time range seek straight to the right lines.
+#
+#   python utils/log_query.py --request-id 1f0c...              (both default logs)
+#   python utils/log_query.py Database/log/accessing_data_log.json --level ERROR --since 2025-12-08
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+from datetime import datetime, timezone
+from typing import Optional, Iterator, Dict, Any, List
+try:
+    from utils import write
+except ImportError:
+    import write
+
+LOG_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Database", "log")
+DEFAULT_LOGS = [
+    os.path.join(LOG_DIR, "accessing_data_log.json"),
+    os.path.join(LOG_DIR, "player_report_log.json")
+]
+INDEX_BATCH = 10000
+HEAD_BYTES = 256
+
+def _open_binary(path):
+    if path.endswith(".gz"):
+        return gzip.open(path, 'rb')
+    return open(path, 'rb')
+
+def _head(path) -> str:
+    # Fingerprint of the first bytes, tells us when the active file was rotated and restarted
+    with _open_binary(path) as file:
+        return hashlib.sha1(file.read(HEAD_BYTES)).hexdigest()
+
+def _iter_lines(path, start: int = 0, stop: Optional[int] = None) -> Iterator[tuple]:
+    # Yields (offset, entry) for every line from start up to (and including) the line at stop
+    with _open_binary(path) as file:
+        if start:
+            file.seek(start)
+        offset = start
+        for raw in file:
+            line_offset = offset
+            offset += len(raw)
+            if stop is not None and line_offset > stop:
+                return
+            raw = raw.strip()
+            if not raw:
+                continue
+            try:
+                yield line_offset, json.loads(raw)
+            except ValueError:
+                continue
+
+def _segments(filename) -> List[str]:
+    segments = write.list_segments(filename)
+    if os.path.isfile(filename):
+        segments.append(filename)
+    return segments
+
+def normalize_time(value: Optional[str]) -> Optional[str]:
+    # "2025-12-08" / "2025-12-08T05:54" -> ISO string in UTC, same shape create_log writes
+    if value is None:
+        return None
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc).isoformat()
+
+class LogIndex:
+    def __init__(self, filename: str):
+        self.filename = filename
+        self.index_path = f"{filename}.idx"
+        self.connection = sqlite3.connect(self.index_path)
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS segments (
+                path TEXT PRIMARY KEY,
+                head TEXT,
+                indexed_bytes INTEGER
+            );
+            CREATE TABLE IF NOT EXISTS entries (
+                segment TEXT,
+                offset INTEGER,
+                timestamp TEXT,
+                request_id TEXT
+            );
+            CREATE INDEX IF NOT EXISTS entries_request_id ON entries (request_id);
+            CREATE INDEX IF NOT EXISTS entries_time ON entries (segment, timestamp);
+        """)
+
+    def close(self):
+        self.connection.close()
+
+    def update(self) -> int:
+        # Indexes whatever is new since last time, returns how many entries were added
+        if write.is_legacy(self.filename):
+            # An old JSON array file has no lines to point at, migrate it first
+            write.migrate(self.filename)
+
+        added = 0
+        segments = _segments(self.filename)
+        known = {row[0]: (row[1], row[2]) for row in self.connection.execute("SELECT path, head, indexed_bytes FROM segments")}
+
+        for path in known:
+            if path not in segments:
+                self._forget(path)
+
+        for path in segments:
+            head = _head(path)
+            start = 0
+            if path in known:
+                old_head, indexed_bytes = known[path]
+                if old_head != head or (indexed_bytes > os.path.getsize(path) and not path.endswith(".gz")):
+                    # Rotated away and restarted (or rewritten), index it again from the top
+                    self._forget(path)
+                elif path.endswith(".gz"):
+                    # Closed segments never change
+                    continue
+                else:
+                    start = indexed_bytes
+            added += self._index_segment(path, head, start)
+
+        self.connection.commit()
+        return added
+
+    def _forget(self, path):
+        self.connection.execute("DELETE FROM entries WHERE segment = ?", (path,))
+        self.connection.execute("DELETE FROM segments WHERE path = ?", (path,))
+
+    def _index_segment(self, path, head, start) -> int:
+        rows = []
+        added = 0
+        end = start
+        with _open_binary(path) as file:
+            if start:
+                file.seek(start)
+            offset = start
+            for raw in file:
+                line_offset = offset
+                offset += len(raw)
+                if not raw.endswith(b"\n"):
+                    # Still being written, pick it up next time
+                    break
+                end = offset
+                try:
+                    entry = json.loads(raw)
+                except ValueError:
+                    continue
+                rows.append((path, line_offset, entry.get("timestamp"), entry.get("request_id")))
+                if len(rows) >= INDEX_BATCH:
+                    self.connection.executemany("INSERT INTO entries VALUES (?, ?, ?, ?)", rows)
+                    added += len(rows)
+                    rows = []
+        if rows:
+            self.connection.executemany("INSERT INTO entries VALUES (?, ?, ?, ?)", rows)
+            added += len(rows)
+        self.connection.execute("INSERT OR REPLACE INTO segments VALUES (?, ?, ?)", (path, head, end))
+        return added
+
+    def request_offsets(self, request_id: str) -> Iterator[tuple]:
+        rows = self.connection.execute("SELECT segment, offset FROM entries WHERE request_id = ?", (request_id,))
+        order = {path: num for num, path in enumerate(_segments(self.filename))}
+        yield from sorted(rows, key=lambda row: (order.get(row[0], -1), row[1]))
+
+    def time_range(self, segment: str, since: Optional[str], until: Optional[str]) -> Optional[tuple]:
+        # First and last offset in a segment with a timestamp inside [since, until]
+        sql = "SELECT MIN(offset), MAX(offset) FROM entries WHERE segment = ?"
+        params = [segment]
+        if since is not None:
+            sql += " AND timestamp >= ?"
+            params.append(since)
+        if until is not None:
+            sql += " AND timestamp <= ?"
+            params.append(until)
+        first, last = self.connection.execute(sql, params).fetchone()
+        if first is None:
+            return None
+        return first, last
+
+def _matches(entry, request_id, where, log_level, user_id, since, until) -> bool:
+    if request_id is not None and entry.get("request_id") != request_id:
+        return False
+    if where is not None and entry.get("where") not in where:
+        return False
+    if log_level is not None and entry.get("log_level") not in log_level:
+        return False
+    if user_id is not None and entry.get("user_id") != user_id:
+        return False
+    timestamp = entry.get("timestamp") or ""
+    if since is not None and timestamp < since:
+        return False
+    if until is not None and timestamp > until:
+        return False
+    return True
+
+def query(
+    filename: str,
+    request_id: Optional[str] = None,
+    where: Optional[List[str]] = None,
+    log_level: Optional[List[str]] = None,
+    user_id: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    use_index: bool = True
+) -> Iterator[Dict[str, Any]]:
+    since = normalize_time(since)
+    until = normalize_time(until)
+    where = set(where) if where else None
+    log_level = set(log_level) if log_level else None
+    filters = (request_id, where, log_level, user_id, since, until)
+
+    if not use_index or (request_id is None and since is None and until is None):
+        for segment in _segments(filename):
+            for _, entry in _iter_lines(segment):
+                if _matches(entry, *filters):
+                    yield entry
+        return
+
+    index = LogIndex(filename)
+    try:
+        index.update()
+
+        if request_id is not None:
+            handles = {}
+            try:
+                for segment, offset in index.request_offsets(request_id):
+                    if segment not in handles:
+                        handles[segment] = _open_binary(segment)
+                    file = handles[segment]
+                    file.seek(offset)
+                    try:
+                        entry = json.loads(file.readline())
+                    except ValueError:
+                        continue
+                    if _matches(entry, *filters):
+                        yield entry
+            finally:
+                for file in handles.values():
+                    file.close()
+            return
+
+        for segment in _segments(filename):
+            found = index.time_range(segment, since, until)
+            if found is None:
+                continue
+            start, stop = found
+            for _, entry in _iter_lines(segment, start, stop):
+                if _matches(entry, *filters):
+                    yield entry
+    finally:
+        index.close()
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Search the JSON Lines logs")
+    parser.add_argument("logs", nargs="*", help="log files (default: accessing_data_log.json and player_report_log.json)")
+    parser.add_argument("--request-id")
+    parser.add_argument("--where", action="append", help="can be given more than once")
+    parser.add_argument("--level", action="append", dest="log_level", help="INFO, ERROR, ... (can be given more than once)")
+    parser.add_argument("--user-id")
+    parser.add_argument("--since", help="ISO date/time, UTC unless it has an offset")
+    parser.add_argument("--until", help="ISO date/time, UTC unless it has an offset")
+    parser.add_argument("--limit", type=int, default=0, help="stop after this many matches")
+    parser.add_argument("--count", action="store_true", help="only print how many entries matched")
+    parser.add_argument("--no-index", action="store_true", help="always do a full scan")
+    parser.add_argument("--reindex", action="store_true", help="throw the sidecar index away and rebuild it")
+    args = parser.parse_args(argv)
+
+    logs = args.logs or [path for path in DEFAULT_LOGS if os.path.exists(path)]
+    matched = 0
+
+    for log in logs:
+        if args.reindex and os.path.exists(f"{log}.idx"):
+            os.remove(f"{log}.idx")
+
+        for entry in query(
+            log,
+            request_id=args.request_id,
+            where=args.where,
+            log_level=args.log_level,
+            user_id=args.user_id,
+            since=args.since,
+            until=args.until,
+            use_index=not args.no_index
+        ):
+            matched += 1
+            if not args.count:
+                print(json.dumps(entry, ensure_ascii=False))
+            if args.limit and matched >= args.limit:
+                break
+        if args.limit and matched >= args.limit:
+            break
+
+    if args.count:
+        print(matched)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
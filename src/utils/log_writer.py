@@ -0,0 +1,225 @@
+# Background log writer
+# Log entries go onto a bounded queue and a worker thread writes them to disk in batches,
+# so the query path (AccessData) and the Qt UI thread (PlayerReport) never wait on file I/O.
+import atexit
+import json
+import os
+import queue
+import threading
+import time
+from typing import Dict, Any, Optional
+try:
+    from utils import write
+except ImportError:
+    import write
+
+# What to do when the queue is full:
+#   "block"     - wait for the worker to make room (nothing is lost)
+#   "drop_info" - throw away INFO/DEBUG entries, still wait for WARNING/ERROR
+#   "spill"     - append the entry to <log file>.spill (never rotated), the worker merges it back in later
+OVERFLOW_POLICIES = ("block", "drop_info", "spill")
+DROPPABLE_LEVELS = ("DEBUG", "INFO")
+
+_STOP = object()
+
+class LogWriter:
+    def __init__(
+        self,
+        max_queue: int = 10000,
+        batch_size: int = 200,
+        flush_interval: float = 0.5,
+        overflow: str = "block"
+    ):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow must be one of {OVERFLOW_POLICIES}")
+        if max_queue < 1 or batch_size < 1:
+            raise ValueError("max_queue and batch_size must be at least 1")
+
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow = overflow
+
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.dropped = 0
+        self.spilled = 0
+        self._spill_files = set()
+        self._spill_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        # Held from the _closed check to the enqueue, so shutdown() can't drain between the two
+        self._submit_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+    def start(self):
+        with self._start_lock:
+            if self._thread is None and not self._closed:
+                self._thread = threading.Thread(target=self._run, name="LogWriter", daemon=True)
+                self._thread.start()
+
+    def submit(self, filename: str, entry: Dict[str, Any]):
+        with self._submit_lock:
+            if not self._closed:
+                self._enqueue(filename, entry)
+                return
+        # After shutdown there is no worker, so just write it straight away
+        write.write_to(filename, entry)
+
+    def _enqueue(self, filename: str, entry: Dict[str, Any]):
+        if self._thread is None:
+            self.start()
+
+        item = (filename, entry)
+        try:
+            self.queue.put_nowait(item)
+        except queue.Full:
+            if self.overflow == "drop_info" and entry.get("log_level") in DROPPABLE_LEVELS:
+                self.dropped += 1
+            elif self.overflow == "spill":
+                self._spill(filename, entry)
+            else:
+                # The worker keeps draining, so this can't hold the lock for long
+                self.queue.put(item)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        # Blocks until everything submitted so far is on disk
+        if self._thread is None or self._closed:
+            self._merge_spills()
+            return True
+
+        done = threading.Event()
+        self.queue.put(done)
+        return done.wait(timeout)
+
+    def shutdown(self, timeout: Optional[float] = 5.0):
+        with self._submit_lock, self._start_lock:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._thread
+
+        if thread is not None:
+            self.queue.put(_STOP)
+            thread.join(timeout)
+        self._merge_spills()
+
+    def _run(self):
+        while True:
+            batch = []
+            events = []
+            stop = False
+
+            try:
+                item = self.queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                self._merge_spills()
+                continue
+
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if item is _STOP:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    events.append(item)
+                else:
+                    batch.append(item)
+
+                if stop or events or len(batch) >= self.batch_size:
+                    break
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self.queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+
+            if stop:
+                # Drain whatever is still queued before exiting
+                while True:
+                    try:
+                        item = self.queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if isinstance(item, threading.Event):
+                        events.append(item)
+                    elif item is not _STOP:
+                        batch.append(item)
+
+            self._write_batch(batch)
+            self._merge_spills()
+
+            for event in events:
+                event.set()
+
+            if stop:
+                return
+
+    def _write_batch(self, batch):
+        by_file = {}
+        for filename, entry in batch:
+            by_file.setdefault(filename, []).append(entry)
+
+        for filename, entries in by_file.items():
+            try:
+                write.write_many(filename, entries)
+            except Exception as e:
+                print(f"Logging error: {e}")
+
+    def _spill(self, filename: str, entry: Dict[str, Any]):
+        # Straight to the file, not write.write_to: a rotated spill would go to segments _merge_spills never reads
+        with self._spill_lock:
+            with open(f"{filename}.spill", 'a', encoding='utf-8') as file:
+                file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self._spill_files.add(filename)
+            self.spilled += 1
+
+    def _merge_spills(self):
+        if not self._spill_files:
+            return
+
+        with self._spill_lock:
+            pending = list(self._spill_files)
+            self._spill_files.clear()
+            moved = []
+            for filename in pending:
+                spill_path = f"{filename}.spill"
+                if os.path.exists(spill_path):
+                    merging_path = f"{spill_path}.merging"
+                    os.replace(spill_path, merging_path)
+                    moved.append((filename, merging_path))
+
+        for filename, merging_path in moved:
+            try:
+                write.write_many(filename, list(write.read_log(merging_path)))
+                os.remove(merging_path)
+            except Exception as e:
+                print(f"Logging error: {e}")
+
+_default_writer = LogWriter()
+atexit.register(lambda: _default_writer.shutdown())
+
+def get_writer() -> LogWriter:
+    return _default_writer
+
+def configure(**kwargs) -> LogWriter:
+    # Swap in a writer with new settings, the old one is drained first
+    global _default_writer
+    old = _default_writer
+    _default_writer = LogWriter(**kwargs)
+    old.shutdown()
+    return _default_writer
+
+def submit(filename: str, entry: Dict[str, Any]):
+    _default_writer.submit(filename, entry)
+
+def flush(timeout: Optional[float] = None) -> bool:
+    return _default_writer.flush(timeout)
+
+def shutdown(timeout: Optional[float] = 5.0):
+    _default_writer.shutdown(timeout)
+
+def install_qt_hook(app):
+    # Drain the queue when the Qt event loop is about to quit (before widgets are torn down)
+    app.aboutToQuit.connect(lambda: _default_writer.shutdown())
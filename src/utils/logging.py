@@ -1,22 +1,213 @@
+import json
+import os
+import random
 import socket
+import threading
+import time
 import uuid
 import urllib.request
+from pathlib import Path
 from typing import Optional, Dict, Any
 from datetime import datetime, timezone
 
+HOST_CACHE = Path.home() / "Database" / "cache" / "host_info.json"
+HOST_CACHE_TTL = 24 * 60 * 60
+PUBLIC_IP_URL = "https://api.ipify.org"
+PUBLIC_IP_TIMEOUT = 3
+
+class HostInfo:
+    # Host name and public IP, looked up lazily and never on the caller's thread.
+    # The public IP is cached on disk for ttl seconds so a restart doesn't hit the network again.
+    def __init__(self, cache_path: Optional[Path] = HOST_CACHE, ttl: float = HOST_CACHE_TTL):
+        self.cache_path = cache_path
+        self.ttl = ttl
+        self._hostname: Optional[str] = None
+        self._public_ip: Optional[str] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def hostname(self) -> str:
+        if self._hostname is None:
+            try:
+                self._hostname = socket.gethostname()
+            except OSError:
+                self._hostname = "unknown"
+        return self._hostname
+
+    @property
+    def public_ip(self) -> str:
+        # Returns whatever we know right now ("N/A" until the first lookup finishes)
+        if self._public_ip is not None:
+            return self._public_ip
+
+        cached = self._read_cache()
+        if cached is not None:
+            self._public_ip = cached
+            return cached
+
+        self.refresh()
+        return "N/A"
+
+    def refresh(self, wait: bool = False):
+        with self._lock:
+            thread = self._thread
+            if thread is None or not thread.is_alive():
+                thread = threading.Thread(target=self._resolve, name="HostInfo", daemon=True)
+                self._thread = thread
+                thread.start()
+        if wait:
+            thread.join()
+
+    def _resolve(self):
+        try:
+            try:
+                ip = urllib.request.urlopen(PUBLIC_IP_URL, timeout=PUBLIC_IP_TIMEOUT).read().decode().strip()
+            except Exception:
+                ip = socket.gethostbyname(self.hostname)
+            self._public_ip = ip
+            self._write_cache(ip)
+        except Exception:
+            pass
+
+    def _read_cache(self) -> Optional[str]:
+        if self.cache_path is None:
+            return None
+        try:
+            with open(self.cache_path, 'r', encoding="utf-8") as file:
+                cached = json.load(file)
+            if time.time() - cached["resolved_at"] > self.ttl:
+                return None
+            if cached.get("hostname") != self.hostname:
+                return None
+            return cached["public_ip"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _write_cache(self, ip: str):
+        if self.cache_path is None:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            temp_path = f"{self.cache_path}.tmp"
+            with open(temp_path, 'w', encoding="utf-8") as file:
+                json.dump({"hostname": self.hostname, "public_ip": ip, "resolved_at": time.time()}, file)
+            os.replace(temp_path, self.cache_path)
+        except OSError:
+            pass
+
+host_info = HostInfo()
+
+LEVELS = {"DEBUG": 10, "INFO": 20, "WARNING": 30, "ERROR": 40, "CRITICAL": 50}
+
+class LogFilter:
+    # Decides whether an entry gets logged at all, before create_log builds anything.
+    #   min_level:    entries below this level are skipped (one dict lookup + one comparison)
+    #   sample_rates: {where: 0.0-1.0}, fraction of DEBUG/INFO entries kept for that method
+    #   rate_limit:   max identical (level, where, message) entries per rate_window seconds, 0 = off
+    # Error messages carry per-call detail, so the rate limit's counters are swept once there are more
+    # than MAX_SEEN: expired ones go first, then the oldest, down to half.
+    MAX_SEEN = 1024
+
+    def __init__(
+        self,
+        min_level: str = "DEBUG",
+        sample_rates: Optional[Dict[str, float]] = None,
+        rate_limit: int = 0,
+        rate_window: float = 60.0
+    ):
+        self._lock = threading.Lock()
+        self._seen: Dict[tuple, list] = {}
+        self.suppressed = 0
+        self.configure(min_level=min_level, sample_rates=sample_rates or {}, rate_limit=rate_limit, rate_window=rate_window)
+
+    def configure(
+        self,
+        min_level: Optional[str] = None,
+        sample_rates: Optional[Dict[str, float]] = None,
+        rate_limit: Optional[int] = None,
+        rate_window: Optional[float] = None
+    ):
+        if min_level is not None:
+            if min_level not in LEVELS:
+                raise ValueError(f"min_level must be one of {list(LEVELS)}")
+            self.min_level = LEVELS[min_level]
+        if sample_rates is not None:
+            for where, rate in sample_rates.items():
+                if not 0.0 <= rate <= 1.0:
+                    raise ValueError(f"sample rate for {where} must be between 0 and 1")
+            self.sample_rates = dict(sample_rates)
+        if rate_limit is not None:
+            if rate_limit < 0:
+                raise ValueError("rate_limit must be 0 or more")
+            self.rate_limit = rate_limit
+        if rate_window is not None:
+            self.rate_window = rate_window
+        self._seen.clear()
+
+    def allow(self, level: str, where: str, message: str) -> bool:
+        level_no = LEVELS.get(level, 0)
+        if level_no < self.min_level:
+            return False
+
+        if self.sample_rates and level_no < LEVELS["WARNING"]:
+            rate = self.sample_rates.get(where)
+            if rate is not None and random.random() >= rate:
+                self.suppressed += 1
+                return False
+
+        if self.rate_limit:
+            key = (level, where, message)
+            now = time.monotonic()
+            with self._lock:
+                seen = self._seen.get(key)
+                if seen is None or now - seen[0] >= self.rate_window:
+                    # Re-inserted so the dict stays oldest window first
+                    self._seen.pop(key, None)
+                    self._seen[key] = [now, 1]
+                    if len(self._seen) > self.MAX_SEEN:
+                        self._sweep(now)
+                elif seen[1] >= self.rate_limit:
+                    self.suppressed += 1
+                    return False
+                else:
+                    seen[1] += 1
+
+        return True
+
+    def _sweep(self, now: float):
+        # Called with _lock held
+        seen = self._seen
+        for key in [key for key, (start, _) in seen.items() if now - start >= self.rate_window]:
+            del seen[key]
+        if len(seen) > self.MAX_SEEN:
+            for key in list(seen)[:len(seen) - self.MAX_SEEN // 2]:
+                del seen[key]
+
 class Logging:
-    def __init__(self, service_name: str = "", user_id: str = "Unknown"):
+    def __init__(
+        self,
+        service_name: str = "",
+        user_id: str = "Unknown",
+        host: Optional[HostInfo] = None,
+        log_filter: Optional[LogFilter] = None
+    ):
         self.service_name = service_name
-        self.host = socket.gethostname()
-        self.public_ip = self.get_public_ip()
+        self.host_info = host or host_info
+        self.log_filter = log_filter or LogFilter()
         self.user_id = user_id
 
+    @property
+    def host(self) -> str:
+        return self.host_info.hostname
+
+    @property
+    def public_ip(self) -> str:
+        return self.host_info.public_ip
+
     def get_public_ip(self) -> str:
-        try:
-            return urllib.request.urlopen("https://api.ipify.org").read().decode()
-        except Exception as e:
-            return socket.gethostbyname(socket.gethostname())
-        
+        return self.host_info.public_ip
+
     def create_log(
         self,
         level: str,
@@ -30,10 +221,10 @@ class Logging:
         request_id: str = None
     ) -> Dict[str, Any]:
         if host is None:
-            host = socket.gethostname()
+            host = self.host_info.hostname
         if request_id is None:
             request_id = str(uuid.uuid4())
-            
+
         return {
             "timestamp": datetime.now(timezone.utc).isoformat(),
             "log_level": level,
@@ -45,4 +236,4 @@ class Logging:
             "source_ip": source_ip,
             "request_id": request_id,
             **({"error": error} if error else {})
-        }
\ No newline at end of file
+        }
@@ -0,0 +1,155 @@
+# Per-method call counts, error counts and latency histograms
+# instrument(AccessData) wraps every public method, uninstrument() puts the originals back,
+# so when metrics are off there is no wrapper on the query path at all.
+import atexit
+import bisect
+import functools
+import threading
+import time
+from typing import Dict, Any, Optional
+
+# Upper bounds (ms) of the histogram buckets, anything slower lands in the last "+inf" bucket
+BUCKETS_MS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+_local = threading.local()
+
+class MethodStats:
+    __slots__ = ("calls", "errors", "total_ms", "max_ms", "buckets")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+
+    def percentile(self, pct: float) -> float:
+        # Upper bound of the bucket the pct-th call falls in (good enough to spot a slow method)
+        if not self.calls:
+            return 0.0
+        target = self.calls * pct / 100
+        seen = 0
+        for num, count in enumerate(self.buckets):
+            seen += count
+            if seen >= target:
+                return BUCKETS_MS[num] if num < len(BUCKETS_MS) else self.max_ms
+        return self.max_ms
+
+class Metrics:
+    def __init__(self):
+        self.enabled = False
+        self.stats: Dict[str, MethodStats] = {}
+        self._lock = threading.Lock()
+        self._instrumented = {}
+        self._dump_registered = False
+
+    def record(self, name: str, duration_ms: float, error: bool):
+        with self._lock:
+            stats = self.stats.get(name)
+            if stats is None:
+                stats = self.stats[name] = MethodStats()
+            stats.calls += 1
+            stats.errors += error
+            stats.total_ms += duration_ms
+            if duration_ms > stats.max_ms:
+                stats.max_ms = duration_ms
+            stats.buckets[bisect.bisect_left(BUCKETS_MS, duration_ms)] += 1
+
+    def reset(self):
+        with self._lock:
+            self.stats = {}
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            output = {}
+            for name, stats in self.stats.items():
+                labels = [f"<={bound}ms" for bound in BUCKETS_MS] + ["+inf"]
+                output[name] = {
+                    "calls": stats.calls,
+                    "errors": stats.errors,
+                    "total_ms": round(stats.total_ms, 3),
+                    "mean_ms": round(stats.total_ms / stats.calls, 3) if stats.calls else 0.0,
+                    "max_ms": round(stats.max_ms, 3),
+                    "p50_ms": stats.percentile(50),
+                    "p95_ms": stats.percentile(95),
+                    "histogram": dict(zip(labels, stats.buckets))
+                }
+            return output
+
+    def dump(self) -> str:
+        snapshot = self.snapshot()
+        lines = [f"{'method':<40}{'calls':>8}{'errors':>8}{'total ms':>12}{'mean ms':>10}{'p95 ms':>10}{'max ms':>10}"]
+        for name, stats in sorted(snapshot.items(), key=lambda item: item[1]["total_ms"], reverse=True):
+            lines.append(
+                f"{name:<40}{stats['calls']:>8}{stats['errors']:>8}{stats['total_ms']:>12.3f}"
+                f"{stats['mean_ms']:>10.3f}{stats['p95_ms']:>10}{stats['max_ms']:>10.3f}"
+            )
+        return "\n".join(lines)
+
+    def instrument(self, cls, dump_at_exit: bool = True):
+        # Wraps every public method (instance, class and static) of cls
+        if cls in self._instrumented:
+            return
+        originals = {}
+        for attr_name, attr in list(vars(cls).items()):
+            if attr_name.startswith("_"):
+                continue
+            if isinstance(attr, classmethod):
+                wrapped = classmethod(self._wrap(f"{cls.__name__}.{attr_name}", attr.__func__))
+            elif isinstance(attr, staticmethod):
+                wrapped = staticmethod(self._wrap(f"{cls.__name__}.{attr_name}", attr.__func__))
+            elif callable(attr):
+                wrapped = self._wrap(f"{cls.__name__}.{attr_name}", attr)
+            else:
+                continue
+            originals[attr_name] = attr
+            setattr(cls, attr_name, wrapped)
+
+        self._instrumented[cls] = originals
+        self.enabled = True
+
+        if dump_at_exit and not self._dump_registered:
+            self._dump_registered = True
+            atexit.register(self._dump_at_exit)
+
+    def uninstrument(self, cls=None):
+        classes = [cls] if cls is not None else list(self._instrumented)
+        for klass in classes:
+            for attr_name, attr in self._instrumented.pop(klass, {}).items():
+                setattr(klass, attr_name, attr)
+        self.enabled = bool(self._instrumented)
+
+    def _dump_at_exit(self):
+        if self.stats:
+            print(self.dump())
+
+    def _wrap(self, name: str, func):
+        record = self.record
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            stack = getattr(_local, "starts", None)
+            if stack is None:
+                stack = _local.starts = []
+            start = time.perf_counter()
+            stack.append(start)
+            error = True
+            try:
+                result = func(*args, **kwargs)
+                # AccessData reports failures by returning the ERROR log entry (or an exception) instead of raising
+                error = isinstance(result, Exception) or (isinstance(result, dict) and result.get("log_level") == "ERROR")
+                return result
+            finally:
+                stack.pop()
+                record(name, (time.perf_counter() - start) * 1000, error)
+
+        return wrapper
+
+def elapsed_ms() -> Optional[float]:
+    # Time since the innermost instrumented call on this thread started, None outside one
+    stack = getattr(_local, "starts", None)
+    if not stack:
+        return None
+    return round((time.perf_counter() - stack[-1]) * 1000, 3)
+
+metrics = Metrics()
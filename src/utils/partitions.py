@@ -0,0 +1,133 @@
+# Games grouped by season and team, so a query for one season or one team only looks at those games
+# Data.json stays one flat {game: {...}} dict, the partition a game belongs to comes from its Details:
+#   season: Details["Season"], else Details["Year"]                       (as a string, "2025")
+#   team:   Details["Team"], else the one Lineup team that isn't Details["Game_against"]
+# A game where either can't be worked out goes in the UNDATED season / NO_TEAM team. Those are plain
+# strings so they can be asked for (season="Undated") and the tree stays JSON with sorted keys.
+#
+# PartitionIndex is built from the data the first time a season/team query needs it, kept on the Dataset,
+# and moved along with set_* changes like the aggregate tables. Each partition's team totals are summed
+# once, from the per game totals, and kept until one of its games changes.
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+UNDATED = "Undated"
+NO_TEAM = "No team"
+
+Key = Tuple[str, str]
+
+def season_of(game_data: Any) -> str:
+    details = game_data.get("Details") if isinstance(game_data, dict) else None
+    if not isinstance(details, dict):
+        return UNDATED
+    season = details.get("Season", details.get("Year"))
+    return UNDATED if season is None else str(season)
+
+def team_of(game_data: Any) -> str:
+    if not isinstance(game_data, dict):
+        return NO_TEAM
+    details = game_data.get("Details")
+    details = details if isinstance(details, dict) else {}
+    team = details.get("Team")
+    if isinstance(team, str):
+        return team
+    lineup = game_data.get("Lineup")
+    if not isinstance(lineup, dict):
+        return NO_TEAM
+    ours = [name for name in lineup if name != details.get("Game_against")]
+    return ours[0] if len(ours) == 1 else NO_TEAM
+
+def partition_of(game_data: Any) -> Key:
+    return season_of(game_data), team_of(game_data)
+
+def _add(totals: Dict[str, Any], stats: Dict[str, Any]):
+    for stat_name, stat_value in stats.items():
+        totals[stat_name] = totals.get(stat_name, 0) + stat_value
+
+def sum_totals(game_totals: Callable[[str], Dict[str, Dict[str, Any]]], games: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+    # player -> stat total over games, game_totals(game) gives one game's player totals
+    totals: Dict[str, Dict[str, Any]] = {}
+    for game in games:
+        for player, stats in game_totals(game).items():
+            _add(totals.setdefault(player, {}), stats)
+    return totals
+
+class PartitionIndex:
+    def __init__(self, data: Dict[str, Any]):
+        self._build(data)
+
+    def _build(self, data: Dict[str, Any]):
+        # (season, team) -> games in data order, plus where each game sits in data (to merge partitions back in order)
+        self.partitions: Dict[Key, List[str]] = {}
+        self.keys: Dict[str, Key] = {}
+        self.position: Dict[str, int] = {}
+        for position, (game, game_data) in enumerate(data.items()):
+            key = partition_of(game_data)
+            self.partitions.setdefault(key, []).append(game)
+            self.keys[game] = key
+            self.position[game] = position
+        # (season, team) -> player -> stat total
+        self._totals: Dict[Key, Dict[str, Dict[str, Any]]] = {}
+
+    def update_game(self, data: Dict[str, Any], game: str):
+        # After one game was added, changed or removed
+        key = partition_of(data[game]) if game in data else None
+        if game in data and self.keys.get(game) == key:
+            # Same partition (the usual set_stat): only its totals are stale
+            self._totals.pop(key, None)
+            return
+        self._build(data)
+
+    def copy(self) -> "PartitionIndex":
+        # update_game on the copy leaves this one as it was (a published dataset may still be using it):
+        # the lists and maps are only ever replaced whole, the totals cache is the copy's own
+        index = PartitionIndex.__new__(PartitionIndex)
+        index.partitions = self.partitions
+        index.keys = self.keys
+        index.position = self.position
+        index._totals = dict(self._totals)
+        return index
+
+    @staticmethod
+    def _season(season) -> Optional[str]:
+        return None if season is None else str(season)
+
+    def matching(self, season=None, team: Optional[str] = None) -> List[Key]:
+        # The partitions a (season, team) filter touches, None = any
+        season = self._season(season)
+        return [key for key in self.partitions if (season is None or key[0] == season) and (team is None or key[1] == team)]
+
+    def games(self, season=None, team: Optional[str] = None) -> List[str]:
+        # The games in the matching partitions, in data order
+        keys = self.matching(season, team)
+        if len(keys) == 1:
+            return list(self.partitions[keys[0]])
+        found = [game for key in keys for game in self.partitions[key]]
+        found.sort(key=self.position.__getitem__)
+        return found
+
+    def seasons(self) -> List[str]:
+        return list(dict.fromkeys(season for season, _ in self.partitions))
+
+    def teams(self, season=None) -> List[str]:
+        return list(dict.fromkeys(team for _, team in self.matching(season)))
+
+    def tree(self) -> Dict[str, Dict[str, List[str]]]:
+        # season -> team -> games
+        tree: Dict[str, Dict[str, List[str]]] = {}
+        for (season, team), games in self.partitions.items():
+            tree.setdefault(season, {})[team] = list(games)
+        return tree
+
+    def team_totals(self, game_totals: Callable[[str], Dict[str, Dict[str, Any]]], season=None, team: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        # player -> stat total over the matching partitions. game_totals(game) gives one game's player totals;
+        # a partition is only summed the first time it's asked for.
+        keys = self.matching(season, team)
+        keys.sort(key=lambda key: self.position[self.partitions[key][0]])
+        result: Dict[str, Dict[str, Any]] = {}
+        for key in keys:
+            totals = self._totals.get(key)
+            if totals is None:
+                totals = self._totals[key] = sum_totals(game_totals, self.partitions[key])
+            for player, stats in totals.items():
+                _add(result.setdefault(player, {}), stats)
+        return result
@@ -0,0 +1,127 @@
+# Where each player shows up, so player queries don't walk the whole season
+#   cells:   player -> game -> [quarters they have a stat line in], in quarter order
+#   lineups: game -> team -> frozenset of players
+# Built when the data is published and moved along with set_* changes (update_game on a copy(), like the date index).
+# A query for one player reads only that player's games: cost follows their appearances, not the season.
+from typing import Any, Dict, FrozenSet, Iterator, List, Optional, Tuple
+
+class PlayerIndex:
+    def __init__(self, data: Dict[str, Any]):
+        self.cells: Dict[str, Dict[str, List[str]]] = {}
+        self.lineups: Dict[str, Dict[str, FrozenSet[str]]] = {}
+        # game -> its place in data (new games after every other one) and the players it was indexed under
+        self._order: Dict[str, int] = {}
+        self._players: Dict[str, List[str]] = {}
+        # Players whose games may be out of data order (a game they weren't in got them)
+        self._unsorted = set()
+        # Players whose games dict is shared with a copy() and has to be copied before it's changed
+        self._shared = set()
+        self._next = 0
+        for game, game_data in data.items():
+            self._add(game, game_data)
+
+    def _add(self, game: str, game_data: Any):
+        if game not in self._order:
+            self._order[game] = self._next
+            self._next += 1
+        cells = self.cells
+        # A game that isn't the last one only keeps data order for players who already had it
+        last = self._order[game] == self._next - 1
+        players = self._scan(game_data)
+        for player, quarters in players.items():
+            games = cells.get(player)
+            if games is None:
+                games = cells[player] = {}
+            elif games.get(game) == quarters:
+                continue
+            else:
+                if game not in games and not last:
+                    self._unsorted.add(player)
+                games = self._own(player)
+            games[game] = quarters
+        self._players[game] = list(players)
+
+        self.lineups.pop(game, None)
+        lineup = game_data.get("Lineup") if isinstance(game_data, dict) else None
+        if isinstance(lineup, dict) and all(isinstance(team_players, list) for team_players in lineup.values()):
+            self.lineups[game] = {team: frozenset(team_players) for team, team_players in lineup.items()}
+
+    @staticmethod
+    def _scan(game_data: Any) -> Dict[str, List[str]]:
+        # player -> the quarters they have a stat line in
+        quarters = game_data.get("Quarters") if isinstance(game_data, dict) else None
+        players: Dict[str, List[str]] = {}
+        if hasattr(quarters, "items"):
+            for quarter, quarter_stats in quarters.items():
+                if hasattr(quarter_stats, "keys"):
+                    for player in quarter_stats.keys():
+                        player_quarters = players.get(player)
+                        if player_quarters is None:
+                            players[player] = [quarter]
+                        else:
+                            player_quarters.append(quarter)
+        return players
+
+    def update_game(self, data: Dict[str, Any], game: str):
+        # After one game was added, changed or removed. Players still in it keep the game where it was.
+        kept = self._scan(data[game]) if game in data else {}
+        for player in self._players.pop(game, ()):
+            if player not in kept:
+                games = self.cells.get(player)
+                if games is not None and game in games:
+                    if len(games) == 1:
+                        del self.cells[player]
+                        self._shared.discard(player)
+                    else:
+                        del self._own(player)[game]
+        if game not in data:
+            self._order.pop(game, None)
+            self.lineups.pop(game, None)
+            return
+        self._add(game, data[game])
+
+    def _own(self, player: str) -> Dict[str, List[str]]:
+        # The player's games dict, copied first if a copy() still shares it
+        games = self.cells[player]
+        if player in self._shared:
+            self._shared.discard(player)
+            games = self.cells[player] = dict(games)
+        return games
+
+    def copy(self) -> "PlayerIndex":
+        # update_game on the copy leaves this one as it was (a published dataset may still be using it).
+        # Each player's games dict is copied the first time either side changes it, not up front.
+        index = PlayerIndex.__new__(PlayerIndex)
+        index.cells = dict(self.cells)
+        index.lineups = dict(self.lineups)
+        index._order = dict(self._order)
+        index._players = dict(self._players)
+        index._unsorted = set(self._unsorted)
+        index._shared = set(self.cells)
+        index._next = self._next
+        self._shared = set(self.cells)
+        return index
+
+    def games(self, player: str) -> Dict[str, List[str]]:
+        # game -> quarters for one player, games in data order (read only)
+        games = self.cells.get(player, {})
+        if player in self._unsorted:
+            self._unsorted.discard(player)
+            if games:
+                order = self._order
+                games = self.cells[player] = dict(sorted(games.items(), key=lambda item: order[item[0]]))
+                self._shared.discard(player)
+        return games
+
+    def appearances(self, player: str) -> Iterator[Tuple[str, str]]:
+        # (game, quarter) for every stat line the player has, in the order a walk over the data finds them
+        for game, quarters in self.games(player).items():
+            for quarter in quarters:
+                yield game, quarter
+
+    def in_lineup(self, game: str, team: str, player: str) -> Optional[bool]:
+        # None when the game (or its Lineup) isn't indexed, the caller then looks at the game itself
+        teams = self.lineups.get(game)
+        if teams is None or team not in teams:
+            return None
+        return player in teams[team]
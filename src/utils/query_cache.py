@@ -0,0 +1,98 @@
+# Memoizes AccessData query results
+# Keyed by method + arguments + the data version, so once initialize() or save() bumps
+# AccessData.data_version every older result stops matching (and gets thrown away).
+# Callers always get their own copy, mutating a result can't corrupt what's cached.
+import functools
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+from typing import Any, Dict
+
+_MISSING = object()
+
+def copy_result(value: Any) -> Any:
+    # Query results are nested dicts/lists of strings and numbers, this is a lot cheaper than deepcopy
+    if isinstance(value, Mapping):
+        # Compact stat lines (utils/interning.py) come back as the plain dicts they stand for
+        return {key: copy_result(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [copy_result(item) for item in value]
+    return value
+
+class QueryCache:
+    def __init__(self, max_size: int = 256):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.max_size = max_size
+        self.version = None
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, version) -> Any:
+        with self._lock:
+            if version != self.version:
+                # Data changed since these were computed
+                self._entries.clear()
+                self.version = version
+                self.misses += 1
+                return _MISSING
+            value = self._entries.get(key, _MISSING)
+            if value is _MISSING:
+                self.misses += 1
+                return _MISSING
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return copy_result(value)
+
+    def put(self, key, version, value):
+        with self._lock:
+            if version != self.version:
+                return
+            self._entries[key] = copy_result(value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"size": len(self._entries), "max_size": self.max_size, "hits": self.hits, "misses": self.misses}
+
+    def cached(self, func):
+        # For classmethods/methods whose owner has a data_version, put it under @classmethod
+        # Results only change when data_version does: edit AccessData.data in place and save() before reading again
+        name = func.__name__
+
+        @functools.wraps(func)
+        def wrapper(owner, *args, **kwargs):
+            try:
+                key = (name, args, tuple(sorted(kwargs.items())))
+                hash(key)
+            except TypeError:
+                # Unhashable argument, just run it
+                return func(owner, *args, **kwargs)
+
+            # Load the data first, otherwise the very first call computes against a version that's about to change
+            # (_ensure_current when the owner has one: a storage backend may not need the data loaded at all)
+            ensure = getattr(owner, "_ensure_current", None) or getattr(owner, "_ensure_initialized", None)
+            if ensure is not None:
+                ensure()
+            version = owner.data_version
+            value = self.get(key, version)
+            if value is not _MISSING:
+                return value
+
+            value = func(owner, *args, **kwargs)
+            # Errors come back as the ERROR log entry, those shouldn't be cached
+            if not (isinstance(value, dict) and value.get("log_level") == "ERROR") and not isinstance(value, Exception):
+                self.put(key, version, value)
+            return value
+
+        return wrapper
+
+query_cache = QueryCache()
@@ -0,0 +1,73 @@
+# Read only views over the loaded data, for callers that only read
+# The getters normally hand out a copy so callers can change what they get. A view wraps the stored
+# structure instead: one small object, nothing copied, and no way to change the shared data through it.
+# Details and stat lines are flat, a MappingProxyType covers them; lineups (lists) and quarters
+# (player -> stat line) need the two classes below.
+from collections.abc import Mapping, MutableMapping, Sequence
+from types import MappingProxyType
+from typing import Any, Dict, List
+
+def proxy(mapping: Mapping) -> Mapping:
+    # Dicts and compact stat lines (utils/interning.py) get wrapped, cube backed ones are read only already
+    return MappingProxyType(mapping) if isinstance(mapping, MutableMapping) else mapping
+
+class ListView(Sequence):
+    __slots__ = ("_items",)
+
+    def __init__(self, items: List[Any]):
+        self._items = items
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return tuple(self._items[index])
+        return self._items[index]
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __contains__(self, value) -> bool:
+        return value in self._items
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, ListView):
+            other = other._items
+        if not isinstance(other, (list, tuple)):
+            return NotImplemented
+        return len(self._items) == len(other) and all(a == b for a, b in zip(self._items, other))
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"ListView({self._items!r})"
+
+    def copy(self) -> List[Any]:
+        return list(self._items)
+
+class QuarterView(Mapping):
+    # player -> stat line, each stat line handed out as a MappingProxyType
+    __slots__ = ("_players",)
+
+    def __init__(self, players: Mapping):
+        self._players = players
+
+    def __getitem__(self, player: str) -> Mapping:
+        return proxy(self._players[player])
+
+    def __contains__(self, player) -> bool:
+        return player in self._players
+
+    def __iter__(self):
+        return iter(self._players)
+
+    def __len__(self) -> int:
+        return len(self._players)
+
+    def __repr__(self) -> str:
+        return f"QuarterView({dict(self._players)!r})"
+
+    def copy(self) -> Dict[str, Any]:
+        # Same as get_quarter_stats without views: a new outer dict, the stat lines themselves shared
+        return dict(self._players)
@@ -0,0 +1,122 @@
+# What save() knows about Data.json on disk, so it only does the work a change needs
+# SaveState follows one loaded data dict: which games changed since it was loaded or last saved,
+# and each game's JSON, encoded once and reused until that game changes. A save with nothing
+# changed skips the write altogether, a save after a few changes re-encodes only those games.
+# Games that are added, removed or replaced with a new dict are noticed by identity. Edits made
+# inside a game's dicts directly (not through set_*) are caught by a fingerprint of each game: its
+# compact JSON through the C encoder, several times faster than the indent=4 one the file needs.
+#
+# Backups are named after the sha256 of what they hold, <Data.json>.<hash>.bak, the newest few are kept.
+import glob
+import hashlib
+import json
+import os
+import re
+import shutil
+import time
+from typing import Dict, Any, Optional, Tuple, List
+try:
+    from utils.interning import json_default
+except ImportError:
+    from interning import json_default
+
+BACKUP_KEEP = 5
+_BACKUP_HASH = re.compile(r"\.([0-9a-f]{16})\.bak$")
+
+def encode_game(game: str, game_data: Any) -> bytes:
+    # One "Game_N": {...} pair exactly as json.dumps(data, indent=4, ensure_ascii=False) writes it
+    # inside the top level object. Strings never hold a raw newline, so indenting by line is safe.
+    body = json.dumps(game_data, indent=4, ensure_ascii=False, default=json_default).replace("\n", "\n    ")
+    return f"    {json.dumps(game, ensure_ascii=False)}: {body}".encode("utf-8")
+
+def fingerprint(game_data: Any) -> bytes:
+    # Changes whenever encode_game's output would
+    raw = json.dumps(game_data, separators=(",", ":"), default=json_default).encode("ascii")
+    return hashlib.blake2b(raw, digest_size=16).digest()
+
+class SaveState:
+    def __init__(self, data: Dict[str, Any], path: str, digest: Optional[str], clean: bool = True):
+        # data as it is in the file at path (clean=False: it's been changed since, e.g. a replayed journal)
+        self.data = data
+        self.path = path
+        self.digest = digest
+        self.clean = clean
+        # game -> (its dict when encoded, its fingerprint then, encoded bytes)
+        self._fragments: Dict[str, Tuple[Any, bytes, bytes]] = {}
+        self.encoded = 0
+        # Games the last encode() had to encode again or found removed
+        self.changed: List[str] = []
+
+    def mark(self, game: Optional[str] = None):
+        # game changed in place (None = any of them might have)
+        if game is None:
+            self._fragments.clear()
+        else:
+            self._fragments.pop(game, None)
+        self.clean = False
+
+    def moved(self, data: Dict[str, Any]):
+        # data replaces the dict this was for, with the changed games (and only those) as new dicts:
+        # encode() keeps the fragments of the games data still shares
+        self.data = data
+        self.clean = False
+
+    def encode(self, data: Dict[str, Any]) -> bytes:
+        # data as json.dumps(data, indent=4, ensure_ascii=False), byte for byte. A game's fragment is
+        # reused when it's the same dict with the same fingerprint, so edits made in place are written too.
+        fragments = self._fragments
+        changed = self.changed = [game for game in fragments if game not in data]
+        for game in changed:
+            del fragments[game]
+        if not data:
+            return b"{}"
+        if not all(isinstance(game, str) for game in data):
+            # json.dumps turns other keys into strings its own way
+            fragments.clear()
+            self.changed = list(data)
+            return json.dumps(data, indent=4, ensure_ascii=False, default=json_default).encode("utf-8")
+
+        parts = []
+        for game, game_data in data.items():
+            cached = fragments.get(game)
+            check = fingerprint(game_data)
+            if cached is None or cached[0] is not game_data or cached[1] != check:
+                cached = (game_data, check, encode_game(game, game_data))
+                fragments[game] = cached
+                changed.append(game)
+                self.encoded += 1
+            parts.append(cached[2])
+        return b"{\n" + b",\n".join(parts) + b"\n}"
+
+    def written(self, data: Dict[str, Any], path: str, digest: str):
+        # data has just been written to path
+        self.data = data
+        self.path = path
+        self.digest = digest
+        self.clean = True
+
+def backup_path(path: str, digest: str) -> str:
+    return f"{path}.{digest[:16]}.bak"
+
+def backups(path: str) -> List[str]:
+    # Backups of path, newest first
+    found = [candidate for candidate in glob.glob(f"{glob.escape(path)}.*.bak") if _BACKUP_HASH.search(candidate)]
+    return sorted(found, key=os.path.getmtime, reverse=True)
+
+def backup(path: str, digest: str, keep: int = BACKUP_KEEP) -> str:
+    # Keeps a copy of path (whose sha256 is digest) and drops all but the newest keep.
+    # A copy of the same content is already there when nothing changed in between, it's only moved to the front.
+    target = backup_path(path, digest)
+    if os.path.exists(target):
+        now = time.time()
+        os.utime(target, (now, now))
+    else:
+        temp_path = f"{target}.tmp"
+        shutil.copyfile(path, temp_path)
+        os.replace(temp_path, target)
+    for old in backups(path)[max(keep, 1):]:
+        try:
+            os.remove(old)
+        except OSError:
+            pass
+    return target
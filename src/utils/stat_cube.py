@@ -0,0 +1,321 @@
+# Columnar copy of every quarter stat line: a dense game x quarter x player x stat array
+# Built once in AccessData.initialize, the season/game aggregations become array reductions
+# instead of walking Game -> Quarters -> Player -> Stat dicts on every call.
+# NumPy is optional, without it build() returns None and AccessData keeps using the dict walks.
+from array import array
+from collections.abc import Mapping
+from typing import Dict, Any, Optional, List
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+class StatCube:
+    def __init__(self, data: Optional[Dict[str, Any]] = None):
+        # string <-> index tables, in first-seen order (the order the dict walks would produce)
+        self.games: List[str] = []
+        self.game_index: Dict[str, int] = {}
+        self.quarters: List[str] = []
+        self.quarter_index: Dict[str, int] = {}
+        self.players: List[str] = []
+        self.player_index: Dict[str, int] = {}
+        self.stats: List[str] = []
+        self.stat_index: Dict[str, int] = {}
+        # Each stat line's keys as stat indices in their own order, 0 = no stats (or no line at all).
+        # The dicts handed back keep the order a walk over the same lines would give them.
+        self.layouts: List[tuple] = [()]
+        self.layout_index: Dict[tuple, int] = {(): 0}
+        self._orders: Dict[tuple, tuple] = {}
+
+        # (game, quarter) -> player indices in the order they appear in that quarter
+        self.cell_players: Dict[tuple, List[int]] = {}
+        # (game, quarter) -> each of those lines' layout, until finish() puts them in the layout array
+        self._cell_layouts: Dict[tuple, List[int]] = {}
+        # game -> quarter indices in the order they appear in that game
+        self.game_quarters: List[List[int]] = []
+        # game -> player indices in first-seen order across that game's quarters
+        self.game_players: List[List[int]] = []
+
+        # One entry per stat line until finish() turns them into the arrays, flat machine ints rather
+        # than a tuple per line so a streamed archive (see utils/streaming.py) doesn't need much more
+        self._rows = [array("q"), array("q"), array("q"), array("q")]
+        self._row_values = array("q")
+
+        if data is not None:
+            for game, game_data in data.items():
+                self.add_game(game, game_data)
+            self.finish()
+
+    def add_game(self, game: str, game_data: Dict[str, Any]):
+        # Games go in one at a time (in season order), finish() once they're all in
+        if game in self.game_index:
+            raise ValueError(f"{game} was added twice")
+        g = self._intern(game, self.games, self.game_index)
+        game_quarters = []
+        game_players = []
+        seen = set()
+        for quarter, quarter_stats in game_data["Quarters"].items():
+            q = self._intern(quarter, self.quarters, self.quarter_index)
+            game_quarters.append(q)
+            cell = []
+            cell_layouts = []
+            for player, stats in quarter_stats.items():
+                p = self._intern(player, self.players, self.player_index)
+                cell.append(p)
+                if p not in seen:
+                    seen.add(p)
+                    game_players.append(p)
+                line = []
+                for stat, value in stats.items():
+                    if isinstance(value, bool) or not isinstance(value, (int, float)):
+                        raise TypeError(f"{game} {quarter} {player} {stat} is not a number")
+                    if isinstance(value, float) and self._row_values.typecode == "q":
+                        self._row_values = array("d", self._row_values)
+                    s = self._intern(stat, self.stats, self.stat_index)
+                    line.append(s)
+                    for column, num in zip(self._rows, (g, q, p, s)):
+                        column.append(num)
+                    self._row_values.append(value)
+                cell_layouts.append(self._intern(tuple(line), self.layouts, self.layout_index))
+            self.cell_players[(g, q)] = cell
+            self._cell_layouts[(g, q)] = cell_layouts
+        self.game_quarters.append(game_quarters)
+        self.game_players.append(game_players)
+
+    def finish(self):
+        shape = (len(self.games), len(self.quarters), len(self.players), len(self.stats))
+        self.values = np.zeros(shape, dtype=np.float64 if self._row_values.typecode == "d" else np.int64)
+        # A stat that was never recorded is not the same as a recorded 0, the dict walks leave it out
+        self.present = np.zeros(shape, dtype=bool)
+        # Player listed in a quarter at all (even with no stats)
+        self.appears = np.zeros(shape[:3], dtype=bool)
+        # Which of self.layouts each line has
+        self.layout = np.zeros(shape[:3], dtype=np.int32)
+
+        for (g, q), cell in self.cell_players.items():
+            self.appears[g, q, cell] = True
+            self.layout[g, q, cell] = self._cell_layouts[(g, q)]
+        self._cell_layouts = None
+        self._order_lines()
+        if self._row_values:
+            # One flat index into the C ordered arrays, built a column at a time
+            flat = np.zeros(len(self._row_values), dtype=np.int64)
+            for column, size in zip(self._rows, shape):
+                flat *= size
+                flat += np.frombuffer(column, dtype=np.int64)
+            self._rows = None
+            np.put(self.values, flat, np.frombuffer(self._row_values, dtype=self.values.dtype))
+            np.put(self.present, flat, True)
+        self._rows = None
+        self._row_values = None
+
+    @staticmethod
+    def _intern(name: str, names: List[str], index: Dict[str, int]) -> int:
+        num = index.get(name)
+        if num is None:
+            num = index[name] = len(names)
+            names.append(name)
+        return num
+
+    @classmethod
+    def build(cls, data: Dict[str, Any]) -> Optional["StatCube"]:
+        if np is None:
+            return None
+        try:
+            return cls(data)
+        except (TypeError, KeyError, AttributeError, ValueError):
+            # Data the cube can't represent, the dict walks still handle it
+            return None
+
+    def _order_lines(self):
+        # (game, quarter) cells flattened in the order the dict walks visit them: games in order, each
+        # game's quarters in its own order (which needn't be the order of the quarter indexes)
+        quarter_count = len(self.quarters)
+        self._line_order = np.array(
+            [g * quarter_count + q for g, game_quarters in enumerate(self.game_quarters) for q in game_quarters], dtype=np.int64
+        )
+
+    def _stat_order(self, lines) -> tuple:
+        # Stat indices in the order a dict walk summing these lines adds them, lines = their layouts in data order
+        if len(lines) > 16:
+            ids, first = np.unique(np.asarray(lines), return_index=True)
+            lines = ids[np.argsort(first)]
+        if hasattr(lines, "tolist"):
+            lines = lines.tolist()
+        key = tuple(dict.fromkeys(layout for layout in lines if layout))
+        order = self._orders.get(key)
+        if order is None:
+            order = self._orders[key] = tuple(dict.fromkeys(s for layout in key for s in self.layouts[layout]))
+        return order
+
+    def _stat_dict(self, sums, order) -> Dict[str, Any]:
+        sums = sums.tolist()
+        return {self.stats[s]: sums[s] for s in order}
+
+    def _game_lines(self, g: int) -> List[List[int]]:
+        # player index -> that player's layouts in game g, in the game's quarter order
+        return self.layout[g, self.game_quarters[g]].T.tolist()
+
+    def _season_lines(self, p: int):
+        # One player's layouts over every game, in data order
+        return self.layout[:, :, p].ravel()[self._line_order]
+
+    def game_totals(self, game: str) -> Dict[str, Dict[str, Any]]:
+        # {player: {stat: total}} for one game, same as get_game_stats(player="")
+        g = self.game_index[game]
+        sums = self.values[g].sum(axis=0)
+        lines = self._game_lines(g)
+        return {self.players[p]: self._stat_dict(sums[p], self._stat_order(lines[p])) for p in self.game_players[g]}
+
+    def player_game_totals(self, game: str, player: str) -> Optional[Dict[str, Any]]:
+        # None when the player isn't in the game at all
+        g = self.game_index[game]
+        p = self.player_index.get(player)
+        if p is None or not self.appears[g, :, p].any():
+            return None
+        return self._stat_dict(self.values[g, :, p].sum(axis=0), self._stat_order(self.layout[g, self.game_quarters[g], p]))
+
+    def season_totals(self, player: str) -> Dict[str, Any]:
+        # {stat: total} for one player over every game
+        p = self.player_index.get(player)
+        if p is None:
+            return {}
+        return self._stat_dict(self.values[:, :, p].sum(axis=(0, 1)), self._stat_order(self._season_lines(p)))
+
+    def season_by_game(self, player: str) -> Dict[str, Dict[str, Any]]:
+        # {game: {stat: total}} for games where the player has at least one stat
+        p = self.player_index.get(player)
+        if p is None:
+            return {}
+        sums = self.values[:, :, p].sum(axis=1)
+        present = self.present[:, :, p].any(axis=1)
+        lines = self.layout[:, :, p].tolist()
+        return {
+            self.games[g]: self._stat_dict(sums[g], self._stat_order([lines[g][q] for q in self.game_quarters[g]]))
+            for g in np.flatnonzero(present.any(axis=1)).tolist()
+        }
+
+    def team_totals(self) -> Dict[str, Dict[str, Any]]:
+        # {player: {stat: total}} over the whole season
+        sums = self.values.sum(axis=(0, 1))
+        appears = self.appears.any(axis=(0, 1))
+        return {self.players[p]: self._stat_dict(sums[p], self._stat_order(self._season_lines(p))) for p in np.flatnonzero(appears).tolist()}
+
+    def team_by_game(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        sums = self.values.sum(axis=1)
+        by_game = {}
+        for g, game in enumerate(self.games):
+            lines = self._game_lines(g)
+            by_game[game] = {self.players[p]: self._stat_dict(sums[g, p], self._stat_order(lines[p])) for p in self.game_players[g]}
+        return by_game
+
+    def quarter_totals(self, player: str, quarter: str) -> Dict[str, Any]:
+        # {stat: total} for one quarter over every game
+        p = self.player_index.get(player)
+        q = self.quarter_index.get(quarter)
+        if p is None or q is None:
+            return {}
+        return self._stat_dict(self.values[:, q, p].sum(axis=0), self._stat_order(self.layout[:, q, p]))
+
+    def quarter_by_game(self, player: str, quarter: str) -> Dict[str, Dict[str, Any]]:
+        p = self.player_index.get(player)
+        q = self.quarter_index.get(quarter)
+        if p is None or q is None:
+            return {}
+        sums = self.values[:, q, p]
+        present = self.present[:, q, p]
+        lines = self.layout[:, q, p].tolist()
+        return {self.games[g]: self._stat_dict(sums[g], self.layouts[lines[g]]) for g in np.flatnonzero(present.any(axis=1)).tolist()}
+
+    def quarter_values(self, game: str, quarter: str, stat: str) -> Optional[List[tuple]]:
+        # [(player, value)] for everyone in one quarter, 0 when they have no such stat (like stats.get(stat, 0))
+        g = self.game_index[game]
+        q = self.quarter_index.get(quarter)
+        cell = self.cell_players.get((g, q))
+        if cell is None:
+            return None
+        s = self.stat_index.get(stat)
+        if s is None:
+            return [(self.players[p], 0) for p in cell]
+        values = self.values[g, q, cell, s].tolist()
+        return [(self.players[p], value) for p, value in zip(cell, values)]
+
+    @classmethod
+    def from_arrays(cls, names: Dict[str, List[str]], game_quarters: List[List[int]], game_players: List[List[int]],
+                    cell_players: Dict[tuple, List[int]], values, present, appears, layouts: List[tuple], layout) -> "StatCube":
+        # A cube someone already built (utils/binary_snapshot.py maps the arrays straight from its file)
+        cube = cls()
+        for table in ("games", "quarters", "players", "stats"):
+            setattr(cube, table, names[table])
+            setattr(cube, f"{table[:-1]}_index", {name: num for num, name in enumerate(names[table])})
+        cube.game_quarters = game_quarters
+        cube.game_players = game_players
+        cube.cell_players = cell_players
+        cube.values = values
+        cube.present = present
+        cube.appears = appears
+        cube.layouts = [tuple(line) for line in layouts]
+        cube.layout_index = {line: num for num, line in enumerate(cube.layouts)}
+        cube.layout = layout
+        cube._cell_layouts = None
+        cube._rows = None
+        cube._row_values = None
+        cube._order_lines()
+        return cube
+
+    def player_stats(self, g: int, q: int, p: int) -> Dict[str, Any]:
+        # One player's {stat: value} in one quarter, stats in the line's own order
+        return self._stat_dict(self.values[g, q, p], self.layouts[int(self.layout[g, q, p])])
+
+    def quarters_view(self, game: str) -> "CubeQuarters":
+        return CubeQuarters(self, self.game_index[game])
+
+# Read only stand-ins for a game's "Quarters" dict, answered from the cube. A streamed load
+# (utils/streaming.py) keeps these instead of the parsed quarter dicts.
+class CubeQuarters(Mapping):
+    def __init__(self, cube: StatCube, g: int):
+        self._cube = cube
+        self._g = g
+
+    def __getitem__(self, quarter: str) -> "CubeQuarter":
+        q = self._cube.quarter_index.get(quarter)
+        if q is None or (self._g, q) not in self._cube.cell_players:
+            raise KeyError(quarter)
+        return CubeQuarter(self._cube, self._g, q)
+
+    def __contains__(self, quarter) -> bool:
+        return (self._g, self._cube.quarter_index.get(quarter)) in self._cube.cell_players
+
+    def __iter__(self):
+        return (self._cube.quarters[q] for q in self._cube.game_quarters[self._g])
+
+    def __len__(self) -> int:
+        return len(self._cube.game_quarters[self._g])
+
+    def copy(self) -> Dict[str, Any]:
+        return {quarter: self[quarter].copy() for quarter in self}
+
+class CubeQuarter(Mapping):
+    def __init__(self, cube: StatCube, g: int, q: int):
+        self._cube = cube
+        self._g = g
+        self._q = q
+        self._cell = cube.cell_players[(g, q)]
+
+    def __getitem__(self, player: str) -> Dict[str, Any]:
+        p = self._cube.player_index.get(player)
+        if p is None or p not in self._cell:
+            raise KeyError(player)
+        return self._cube.player_stats(self._g, self._q, p)
+
+    def __contains__(self, player) -> bool:
+        return self._cube.player_index.get(player) in self._cell
+
+    def __iter__(self):
+        return (self._cube.players[p] for p in self._cell)
+
+    def __len__(self) -> int:
+        return len(self._cell)
+
+    def copy(self) -> Dict[str, Dict[str, Any]]:
+        return {player: self[player] for player in self}
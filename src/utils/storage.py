@@ -0,0 +1,567 @@
+# Where AccessData's games live when it isn't the Data.json file
+# StorageBackend is the interface, SqliteStorage keeps every stat line as a row (stdlib sqlite3) so the
+# per player / per game getters are indexed queries instead of needing the whole season in memory.
+# ShardedStorage keeps one JSON file per game plus a manifest, and only reads the games that are asked for.
+#
+#   AccessData.use_storage(SqliteStorage("Database/Data.sqlite"))     (or BASKETBALL_STATS_DB=...)
+#   AccessData.use_storage(ShardedStorage("Database/Data.shards"))
+#   python utils/storage.py to-sqlite Database/Data.json Database/Data.sqlite
+#   python utils/storage.py to-shards Database/Data.json Database/Data.shards
+#   python utils/storage.py to-json Database/Data.sqlite|Database/Data.shards Database/Data.json
+import copy
+import json
+import os
+import re
+import shutil
+import sqlite3
+import sys
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional, List, Tuple
+try:
+    from utils import journal
+except ImportError:
+    import journal
+
+SCHEMA_VERSION = 1
+
+# Position columns (gpos, tpos, qpos, ppos, spos) keep the dict order of the JSON, so everything
+# comes back out in the same order the dict walks would produce.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    game TEXT PRIMARY KEY,
+    gpos INTEGER NOT NULL,
+    doc TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS teams (
+    game TEXT NOT NULL,
+    team TEXT NOT NULL,
+    tpos INTEGER NOT NULL,
+    PRIMARY KEY (game, team)
+);
+CREATE TABLE IF NOT EXISTS lineups (
+    game TEXT NOT NULL,
+    team TEXT NOT NULL,
+    player TEXT NOT NULL,
+    ppos INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS quarters (
+    game TEXT NOT NULL,
+    quarter TEXT NOT NULL,
+    qpos INTEGER NOT NULL,
+    PRIMARY KEY (game, quarter)
+);
+CREATE TABLE IF NOT EXISTS appearances (
+    game TEXT NOT NULL,
+    quarter TEXT NOT NULL,
+    player TEXT NOT NULL,
+    ppos INTEGER NOT NULL,
+    PRIMARY KEY (game, quarter, player)
+);
+CREATE TABLE IF NOT EXISTS stats (
+    game TEXT NOT NULL,
+    quarter TEXT NOT NULL,
+    player TEXT NOT NULL,
+    stat TEXT NOT NULL,
+    spos INTEGER NOT NULL,
+    value,
+    PRIMARY KEY (game, quarter, player, stat)
+);
+CREATE INDEX IF NOT EXISTS stats_player ON stats (player);
+CREATE INDEX IF NOT EXISTS stats_game_quarter ON stats (game, quarter);
+CREATE INDEX IF NOT EXISTS stats_game_player ON stats (game, player);
+CREATE INDEX IF NOT EXISTS lineups_game_team ON lineups (game, team, player);
+"""
+
+# Game keys that get their own tables, the rest of the game dict is kept as JSON in games.doc
+NORMALIZED = ("Lineup", "Quarters")
+
+# Walk order of a stat line as one sortable number (quarters and stats per quarter stay far below a million)
+ORDER = "g.gpos * 1000000000000 + q.qpos * 1000000 + s.spos"
+
+class StorageBackend:
+    # indexed = True: has specific_stats / season_totals / season_by_game / best_stat / in_lineup (see SqliteStorage)
+    indexed = False
+    # per_game = True: game() hands out one game without loading the rest
+    per_game = False
+
+    def load(self) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    def save(self, data: Dict[str, Any]):
+        raise NotImplementedError
+
+    def apply(self, entry: Dict[str, Any]):
+        # One change in the journal's format (see utils/journal.py)
+        raise NotImplementedError
+
+    def revision(self):
+        # Anything that changes whenever the stored data does
+        raise NotImplementedError
+
+    def game(self, game: str) -> Optional[Dict[str, Any]]:
+        # The game's dict (None if there's no such game), read only: changes go through apply()
+        raise NotImplementedError
+
+    def backup(self):
+        # Copy of what's stored now, before save() replaces it
+        pass
+
+    def close(self):
+        pass
+
+class SqliteStorage(StorageBackend):
+    indexed = True
+
+    def __init__(self, path: str):
+        self.path = os.path.abspath(path)
+        self._lock = threading.RLock()
+        self._writes = 0
+        self.connection = sqlite3.connect(self.path, check_same_thread=False)
+        self.connection.executescript(SCHEMA)
+        self.connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self.connection.commit()
+
+    def close(self):
+        with self._lock:
+            self.connection.close()
+
+    def revision(self) -> Tuple[int, int]:
+        # data_version moves when another connection commits, _writes when we do
+        with self._lock:
+            return self.connection.execute("PRAGMA data_version").fetchone()[0], self._writes
+
+    def backup(self):
+        # <db>.bak, through sqlite's backup API so it's consistent even mid-write elsewhere
+        target = sqlite3.connect(f"{self.path}.bak")
+        try:
+            with self._lock:
+                self.connection.backup(target)
+        finally:
+            target.close()
+
+    def _query(self, sql: str, params=()) -> List[tuple]:
+        with self._lock:
+            return self.connection.execute(sql, params).fetchall()
+
+    # ---------------------------------------------------------------- whole dataset
+
+    def load(self) -> Dict[str, Any]:
+        with self._lock:
+            data = {}
+            for game, doc in self.connection.execute("SELECT game, doc FROM games ORDER BY gpos"):
+                data[game] = json.loads(doc)
+
+            lineups = {}
+            for game, team in self.connection.execute("SELECT game, team FROM teams ORDER BY game, tpos"):
+                lineups.setdefault(game, {})[team] = []
+            for game, team, player in self.connection.execute("SELECT game, team, player FROM lineups ORDER BY game, team, ppos"):
+                lineups[game][team].append(player)
+
+            quarters = {}
+            for game, quarter in self.connection.execute("SELECT game, quarter FROM quarters ORDER BY game, qpos"):
+                quarters.setdefault(game, {})[quarter] = {}
+            for game, quarter, player in self.connection.execute("SELECT game, quarter, player FROM appearances ORDER BY game, quarter, ppos"):
+                quarters[game][quarter][player] = {}
+            for game, quarter, player, stat, value in self.connection.execute(
+                "SELECT game, quarter, player, stat, value FROM stats ORDER BY game, quarter, player, spos"
+            ):
+                quarters[game][quarter][player][stat] = value
+
+        for game, game_data in data.items():
+            if "Lineup" in game_data:
+                game_data["Lineup"] = lineups.get(game, {})
+            if "Quarters" in game_data:
+                game_data["Quarters"] = quarters.get(game, {})
+        return data
+
+    def save(self, data: Dict[str, Any]):
+        # Replaces everything, one transaction
+        with self._lock:
+            with self.connection:
+                for table in ("games", "teams", "lineups", "quarters", "appearances", "stats"):
+                    self.connection.execute(f"DELETE FROM {table}")
+                for gpos, (game, game_data) in enumerate(data.items()):
+                    self._insert_game(game, gpos, game_data)
+            self._writes += 1
+
+    def _insert_game(self, game: str, gpos: int, game_data: Dict[str, Any]):
+        if not isinstance(game_data, dict):
+            raise TypeError(f"{game} must be a dict")
+        lineup = game_data.get("Lineup", {})
+        quarters = game_data.get("Quarters", {})
+        if not isinstance(lineup, dict) or not all(isinstance(players, list) for players in lineup.values()):
+            raise TypeError(f"{game} Lineup must be {{team: [players]}}")
+        if not isinstance(quarters, dict):
+            raise TypeError(f"{game} Quarters must be a dict")
+
+        # Normalized keys stay in the doc as null so the game's own key order survives
+        doc = {key: (None if key in NORMALIZED else value) for key, value in game_data.items()}
+        self.connection.execute("INSERT INTO games VALUES (?, ?, ?)", (game, gpos, json.dumps(doc, ensure_ascii=False)))
+        for tpos, (team, players) in enumerate(lineup.items()):
+            self.connection.execute("INSERT INTO teams VALUES (?, ?, ?)", (game, team, tpos))
+            self.connection.executemany(
+                "INSERT INTO lineups VALUES (?, ?, ?, ?)", [(game, team, player, ppos) for ppos, player in enumerate(players)]
+            )
+        for qpos, (quarter, quarter_stats) in enumerate(quarters.items()):
+            self.connection.execute("INSERT INTO quarters VALUES (?, ?, ?)", (game, quarter, qpos))
+            self._insert_quarter(game, quarter, quarter_stats)
+
+    def _insert_quarter(self, game: str, quarter: str, quarter_stats: Dict[str, Any]):
+        if not isinstance(quarter_stats, dict):
+            raise TypeError(f"{game} {quarter} must be {{player: {{stat: value}}}}")
+        for ppos, (player, stats) in enumerate(quarter_stats.items()):
+            self.connection.execute("INSERT INTO appearances VALUES (?, ?, ?, ?)", (game, quarter, player, ppos))
+            self._insert_stats(game, quarter, player, stats)
+
+    def _insert_stats(self, game: str, quarter: str, player: str, stats: Dict[str, Any]):
+        if not isinstance(stats, dict):
+            raise TypeError(f"{game} {quarter} {player} must be {{stat: value}}")
+        self.connection.executemany(
+            "INSERT INTO stats VALUES (?, ?, ?, ?, ?, ?)",
+            [(game, quarter, player, stat, spos, value) for spos, (stat, value) in enumerate(stats.items())]
+        )
+
+    # ---------------------------------------------------------------- changes
+
+    def _next(self, sql: str, params) -> int:
+        return self.connection.execute(sql, params).fetchone()[0]
+
+    def _delete_game(self, game: str):
+        for table in ("games", "teams", "lineups", "quarters", "appearances", "stats"):
+            self.connection.execute(f"DELETE FROM {table} WHERE game = ?", (game,))
+
+    def apply(self, entry: Dict[str, Any]):
+        # Same checks and messages as journal.check(), one transaction
+        journal.check_entry(entry)
+        op = entry["op"]
+        game = entry["game"]
+        with self._lock:
+            with self.connection:
+                exists = self._query("SELECT gpos FROM games WHERE game = ?", (game,))
+                if op == "set_game":
+                    gpos = exists[0][0] if exists else self._next("SELECT COALESCE(MAX(gpos) + 1, 0) FROM games", ())
+                    self._delete_game(game)
+                    self._insert_game(game, gpos, entry["value"])
+                elif not exists:
+                    raise KeyError("Could not find the game")
+                elif op == "delete_game":
+                    self._delete_game(game)
+                elif op == "set_quarter":
+                    quarter = entry["quarter"]
+                    found = self._query("SELECT qpos FROM quarters WHERE game = ? AND quarter = ?", (game, quarter))
+                    if found:
+                        self.connection.execute("DELETE FROM appearances WHERE game = ? AND quarter = ?", (game, quarter))
+                        self.connection.execute("DELETE FROM stats WHERE game = ? AND quarter = ?", (game, quarter))
+                    else:
+                        qpos = self._next("SELECT COALESCE(MAX(qpos) + 1, 0) FROM quarters WHERE game = ?", (game,))
+                        self.connection.execute("INSERT INTO quarters VALUES (?, ?, ?)", (game, quarter, qpos))
+                    self._insert_quarter(game, quarter, entry["value"])
+                else:
+                    quarter, player = entry["quarter"], entry["player"]
+                    if not self._query("SELECT 1 FROM quarters WHERE game = ? AND quarter = ?", (game, quarter)):
+                        raise KeyError("Could not find the quarter")
+                    appears = self._query("SELECT 1 FROM appearances WHERE game = ? AND quarter = ? AND player = ?", (game, quarter, player))
+                    if op == "set_player":
+                        if appears:
+                            self.connection.execute(
+                                "DELETE FROM stats WHERE game = ? AND quarter = ? AND player = ?", (game, quarter, player)
+                            )
+                        else:
+                            ppos = self._next("SELECT COALESCE(MAX(ppos) + 1, 0) FROM appearances WHERE game = ? AND quarter = ?", (game, quarter))
+                            self.connection.execute("INSERT INTO appearances VALUES (?, ?, ?, ?)", (game, quarter, player, ppos))
+                        self._insert_stats(game, quarter, player, entry["value"])
+                    else:
+                        if not appears:
+                            raise KeyError("Could not find the player")
+                        updated = self.connection.execute(
+                            "UPDATE stats SET value = ? WHERE game = ? AND quarter = ? AND player = ? AND stat = ?",
+                            (entry["value"], game, quarter, player, entry["stat"])
+                        ).rowcount
+                        if not updated:
+                            spos = self._next(
+                                "SELECT COALESCE(MAX(spos) + 1, 0) FROM stats WHERE game = ? AND quarter = ? AND player = ?", (game, quarter, player)
+                            )
+                            self.connection.execute(
+                                "INSERT INTO stats VALUES (?, ?, ?, ?, ?, ?)", (game, quarter, player, entry["stat"], spos, entry["value"])
+                            )
+            self._writes += 1
+
+    # ---------------------------------------------------------------- indexed getters
+
+    def _require_game(self, game: str):
+        if not self._query("SELECT 1 FROM games WHERE game = ?", (game,)):
+            raise KeyError("Could not find the game")
+
+    def specific_stats(self, game: str, quarter: str, player: str) -> Dict[str, Any]:
+        # Same errors as the dict version of get_specific_stats
+        rows = self._query(
+            "SELECT stat, value FROM stats WHERE game = ? AND quarter = ? AND player = ? ORDER BY spos", (game, quarter, player)
+        )
+        if rows:
+            return dict(rows)
+        self._require_game(game)
+        if not self._query("SELECT 1 FROM appearances WHERE game = ? AND quarter = ? LIMIT 1", (game, quarter)):
+            raise KeyError("Could not find the quarter")
+        raise KeyError("Could not find the player")
+
+    def season_totals(self, player: str) -> Dict[str, Any]:
+        return dict(self._query(f"""
+            SELECT s.stat, SUM(s.value)
+            FROM stats s
+            JOIN games g ON g.game = s.game
+            JOIN quarters q ON q.game = s.game AND q.quarter = s.quarter
+            WHERE s.player = ?
+            GROUP BY s.stat
+            ORDER BY MIN({ORDER})
+        """, (player,)))
+
+    def season_by_game(self, player: str) -> Dict[str, Dict[str, Any]]:
+        totals = {}
+        for game, stat, value in self._query(f"""
+            SELECT s.game, s.stat, SUM(s.value)
+            FROM stats s
+            JOIN games g ON g.game = s.game
+            JOIN quarters q ON q.game = s.game AND q.quarter = s.quarter
+            WHERE s.player = ?
+            GROUP BY s.game, s.stat
+            ORDER BY MIN({ORDER})
+        """, (player,)):
+            totals.setdefault(game, {})[stat] = value
+        return totals
+
+    def best_stat(self, player: str, stat: str) -> Optional[tuple]:
+        # (value, game, quarter) of the player's highest value, earliest one on ties, like the dict walk
+        rows = self._query("""
+            SELECT s.value, s.game, s.quarter
+            FROM stats s
+            JOIN games g ON g.game = s.game
+            JOIN quarters q ON q.game = s.game AND q.quarter = s.quarter
+            WHERE s.player = ? AND s.stat = ? AND s.value > -1
+            ORDER BY s.value DESC, g.gpos, q.qpos
+            LIMIT 1
+        """, (player, stat))
+        return rows[0] if rows else None
+
+    def in_lineup(self, game: str, team: str, player: str) -> bool:
+        # Same errors as the dict version of check_player
+        if not self._query("SELECT 1 FROM games WHERE game = ?", (game,)):
+            raise KeyError("game not in the dataset")
+        if not self._query("SELECT 1 FROM teams WHERE game = ? AND team = ?", (game, team)):
+            raise KeyError("team not in the game")
+        return bool(self._query("SELECT 1 FROM lineups WHERE game = ? AND team = ? AND player = ? LIMIT 1", (game, team, player)))
+
+SHARD_FORMAT = 1
+MANIFEST = "manifest.json"
+
+def _write_json(path: str, payload):
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as file:
+        json.dump(payload, file, indent=4, ensure_ascii=False)
+    os.replace(temp_path, path)
+
+def _shard_file(game: str, taken: set) -> str:
+    # Game names can hold anything, file names can't
+    base = re.sub(r"[^A-Za-z0-9_.-]", "_", game) or "game"
+    name = f"{base}.json"
+    count = 1
+    while name in taken:
+        count += 1
+        name = f"{base}_{count}.json"
+    return name
+
+class ShardedStorage(StorageBackend):
+    # <directory>/manifest.json  {"format": 1, "revision": n, "games": [[game, file, revision], ...]}  (season order)
+    # <directory>/games/<file>   one game, same layout as in Data.json
+    per_game = True
+
+    def __init__(self, directory: str, max_cached_games: int = 64):
+        if max_cached_games < 1:
+            raise ValueError("max_cached_games must be at least 1")
+        self.directory = os.path.abspath(directory)
+        self.max_cached_games = max_cached_games
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.RLock()
+        # game -> dict, least recently used first
+        self._cache: OrderedDict = OrderedDict()
+        os.makedirs(os.path.join(self.directory, "games"), exist_ok=True)
+        self._read_manifest()
+
+    @property
+    def manifest_path(self) -> str:
+        return os.path.join(self.directory, MANIFEST)
+
+    def _shard_path(self, file: str) -> str:
+        return os.path.join(self.directory, "games", file)
+
+    def _manifest_stamp(self) -> Optional[tuple]:
+        try:
+            stat = os.stat(self.manifest_path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _read_manifest(self):
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as file:
+                payload = json.load(file)
+        except FileNotFoundError:
+            payload = {"format": SHARD_FORMAT, "revision": 0, "games": []}
+        if not isinstance(payload, dict) or payload.get("format") != SHARD_FORMAT:
+            raise ValueError(f"{self.manifest_path} is not a shard manifest this version can read")
+        self._revision = payload["revision"]
+        # game -> [file, revision of that game's shard], in season order
+        self._games = {game: [file, revision] for game, file, revision in payload["games"]}
+        self._stamp = self._manifest_stamp()
+
+    def _write_manifest(self):
+        self._revision += 1
+        _write_json(self.manifest_path, {
+            "format": SHARD_FORMAT,
+            "revision": self._revision,
+            "games": [[game, file, revision] for game, (file, revision) in self._games.items()]
+        })
+        self._stamp = self._manifest_stamp()
+
+    def revision(self) -> tuple:
+        # One os.stat. When another process rewrote the manifest the shards it changed drop out of the cache.
+        with self._lock:
+            stamp = self._manifest_stamp()
+            if stamp != self._stamp:
+                before = self._games
+                self._read_manifest()
+                for game in list(self._cache):
+                    if self._games.get(game) != before.get(game):
+                        del self._cache[game]
+            return self._revision, self._stamp
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"games": len(self._games), "cached": len(self._cache), "max_cached_games": self.max_cached_games, "hits": self.hits, "misses": self.misses}
+
+    def _remember(self, game: str, game_data: Dict[str, Any]):
+        self._cache[game] = game_data
+        self._cache.move_to_end(game)
+        while len(self._cache) > self.max_cached_games:
+            self._cache.popitem(last=False)
+
+    def game(self, game: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            game_data = self._cache.get(game)
+            if game_data is not None:
+                self._cache.move_to_end(game)
+                self.hits += 1
+                return game_data
+            if game not in self._games:
+                return None
+            self.misses += 1
+            with open(self._shard_path(self._games[game][0]), 'r', encoding='utf-8') as file:
+                game_data = json.load(file)
+            self._remember(game, game_data)
+            return game_data
+
+    def load(self) -> Dict[str, Any]:
+        # Straight from the files, the caller gets dicts nobody else holds
+        with self._lock:
+            data = {}
+            for game, (file, _) in self._games.items():
+                with open(self._shard_path(file), 'r', encoding='utf-8') as shard:
+                    data[game] = json.load(shard)
+            return data
+
+    def save(self, data: Dict[str, Any]):
+        with self._lock:
+            for game, game_data in data.items():
+                if not isinstance(game_data, dict):
+                    raise TypeError(f"{game} must be a dict")
+            revision = self._revision + 1
+            taken = {self._games[game][0] for game in data if game in self._games}
+            games = {}
+            for game, game_data in data.items():
+                file = self._games[game][0] if game in self._games else _shard_file(game, taken)
+                taken.add(file)
+                _write_json(self._shard_path(file), game_data)
+                games[game] = [file, revision]
+            removed = [file for game, (file, _) in self._games.items() if game not in games]
+            self._games = games
+            self._cache.clear()
+            self._write_manifest()
+            for file in removed:
+                os.remove(self._shard_path(file))
+
+    def apply(self, entry: Dict[str, Any]):
+        # The change is made on a copy of the one game it touches, written, and only then cached
+        journal.check_entry(entry)
+        with self._lock:
+            game = entry["game"]
+            current = self.game(game)
+            view = {} if current is None else {game: copy.deepcopy(current)}
+            journal.apply(view, entry)
+            if game in view:
+                if game in self._games:
+                    file = self._games[game][0]
+                else:
+                    file = _shard_file(game, {file for file, _ in self._games.values()})
+                _write_json(self._shard_path(file), view[game])
+                self._games[game] = [file, self._revision + 1]
+                self._remember(game, view[game])
+                self._write_manifest()
+            else:
+                file = self._games.pop(game)[0]
+                self._cache.pop(game, None)
+                self._write_manifest()
+                os.remove(self._shard_path(file))
+
+    def backup(self):
+        # <directory>.bak, a full copy
+        backup_path = f"{self.directory}.bak"
+        with self._lock:
+            if os.path.isdir(backup_path):
+                shutil.rmtree(backup_path)
+            shutil.copytree(self.directory, backup_path)
+
+def open_storage(path: str) -> StorageBackend:
+    # A directory (or a path with no extension) is a shard directory, anything else a SQLite file
+    if os.path.isdir(path) or not os.path.splitext(path)[1]:
+        return ShardedStorage(path)
+    return SqliteStorage(path)
+
+def to_sqlite(json_path: str, db_path: str) -> int:
+    # Returns the number of games converted
+    with open(json_path, 'r', encoding='utf-8') as file:
+        data = json.load(file)
+    storage = SqliteStorage(db_path)
+    try:
+        storage.save(data)
+    finally:
+        storage.close()
+    return len(data)
+
+def to_shards(json_path: str, directory: str) -> int:
+    with open(json_path, 'r', encoding='utf-8') as file:
+        data = json.load(file)
+    ShardedStorage(directory).save(data)
+    return len(data)
+
+def to_json(source: str, json_path: str) -> int:
+    # source: a SQLite file or a shard directory
+    storage = open_storage(source)
+    try:
+        data = storage.load()
+    finally:
+        storage.close()
+    temp_path = f"{json_path}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as file:
+        json.dump(data, file, indent=4, ensure_ascii=False)
+    os.replace(temp_path, json_path)
+    return len(data)
+
+if __name__ == '__main__':
+    converters = {"to-sqlite": to_sqlite, "to-shards": to_shards, "to-json": to_json}
+    if len(sys.argv) != 4 or sys.argv[1] not in converters:
+        print("usage: storage.py to-sqlite <Data.json> <Data.sqlite> | to-shards <Data.json> <directory> | to-json <Data.sqlite|directory> <Data.json>")
+        sys.exit(2)
+    _, direction, source, target = sys.argv
+    convert = converters[direction]
+    print(f"{convert(source, target)} games: {source} -> {target}")
@@ -0,0 +1,133 @@
+# Reads Data.json one game at a time
+# json.load needs the whole file as one string and then builds the whole tree. iter_games() keeps a
+# window of the file instead: it decodes one "Game_N": {...} pair, hands it out and drops it from the
+# buffer before reading on, so the buffer stays around one game plus one chunk.
+# ingest() feeds each game into the stat cube and keeps only a skeleton of it (Details, Lineup...),
+# its "Quarters" are answered from the cube from then on. The aggregate tables are left out on purpose:
+# they're dicts as big as the quarters themselves, the cube answers the same queries from flat arrays.
+import codecs
+import hashlib
+import json
+from typing import Iterator, Tuple, Dict, Any, Optional
+try:
+    from utils.stat_cube import StatCube, np
+except ImportError:
+    from stat_cube import StatCube, np
+
+CHUNK_SIZE = 64 * 1024
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+
+class _Window:
+    def __init__(self, file, chunk_size: int, hasher):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.hasher = hasher
+        self.text = codecs.getincrementaldecoder("utf-8")()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        # Largest the buffer got, in characters
+        self.peak = 0
+
+    def more(self, size: int) -> bool:
+        # Reads on, dropping everything before pos. False at the end of the file.
+        if self.eof:
+            return False
+        raw = self.file.read(size)
+        if self.hasher is not None:
+            self.hasher.update(raw)
+        self.eof = not raw
+        self.buffer = self.buffer[self.pos:] + self.text.decode(raw, final=self.eof)
+        self.pos = 0
+        self.peak = max(self.peak, len(self.buffer))
+        return not self.eof
+
+    def skip_whitespace(self):
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer) or not self.more(self.chunk_size):
+                return
+
+    def expect(self, chars: str) -> str:
+        self.skip_whitespace()
+        if self.pos >= len(self.buffer):
+            raise ValueError("Data.json ended early")
+        char = self.buffer[self.pos]
+        if char not in chars:
+            raise ValueError(f"Expected one of {chars!r} but found {char!r}")
+        self.pos += 1
+        return char
+
+    def peek(self) -> str:
+        self.skip_whitespace()
+        return self.buffer[self.pos] if self.pos < len(self.buffer) else ""
+
+    def value(self):
+        self.skip_whitespace()
+        size = self.chunk_size
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                # Not all of it is in the buffer yet. Reading twice as much each time keeps a big game from
+                # being decoded over and over.
+                if not self.more(size):
+                    raise
+                size *= 2
+                continue
+            if end == len(self.buffer) and self.more(size):
+                # A number can go on in the next chunk
+                continue
+            self.pos = end
+            return value
+
+def iter_games(path: str, chunk_size: int = CHUNK_SIZE, hasher=None, stats: Optional[Dict[str, Any]] = None) -> Iterator[Tuple[str, Any]]:
+    # (game, game_data) in file order. hasher (e.g. hashlib.sha256()) sees every byte of the file,
+    # stats gets {"peak_buffer": chars} once the file is done.
+    with open(path, 'rb') as file:
+        window = _Window(file, chunk_size, hasher)
+        window.expect("{")
+        seen = set()
+        if window.peek() == "}":
+            window.pos += 1
+        else:
+            while True:
+                game = window.value()
+                if not isinstance(game, str):
+                    raise ValueError("Game names must be strings")
+                if game in seen:
+                    raise ValueError(f"{game} appears twice")
+                seen.add(game)
+                window.expect(":")
+                yield game, window.value()
+                if window.expect(",}") == "}":
+                    break
+        if window.peek():
+            raise ValueError("Extra data after the games")
+        if stats is not None:
+            stats["peak_buffer"] = window.peak
+
+def ingest(path: str, chunk_size: int = CHUNK_SIZE, stats: Optional[Dict[str, Any]] = None) -> Optional[tuple]:
+    # (data, cube, sha256 of the file) without ever holding more than one game's quarters as dicts.
+    # data has every game with its "Quarters" as read only views over the cube.
+    # None when that's not possible: no NumPy, or stats the cube can't hold (the normal load handles those).
+    if np is None:
+        return None
+    hasher = hashlib.sha256()
+    data = {}
+    cube = StatCube()
+    try:
+        for game, game_data in iter_games(path, chunk_size, hasher, stats):
+            cube.add_game(game, game_data)
+            # Same keys in the same order, the quarters themselves are dropped here
+            data[game] = {key: (None if key == "Quarters" else value) for key, value in game_data.items()}
+        cube.finish()
+    except (TypeError, KeyError, AttributeError):
+        return None
+
+    for game, game_data in data.items():
+        game_data["Quarters"] = cube.quarters_view(game)
+    return data, cube, hasher.hexdigest()
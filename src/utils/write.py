@@ -1,16 +1,193 @@
-# Writes to a given file for errors 
+# Writes to a given file for errors
+# Log files are JSON Lines: one entry per line, so writing never has to read the file back.
+# Old log files (one big JSON array) are still readable and get migrated the first time we write to them.
+# Each log rotates once it gets too big (or a new day starts), closed segments are gzipped and only the newest few are kept.
+import gzip
 import json
 import os
+import re
+import shutil
+import threading
+from datetime import datetime, date
+
+DEFAULT_ROTATION = {
+    "max_bytes": 5 * 1024 * 1024,   # 0 = never rotate on size
+    "daily": False,                 # rotate when the day changes
+    "backup_count": 10,             # closed segments to keep, 0 = keep all
+    "compress": True
+}
+
+_migrated = set()
+_rotation = {}
+_opened_day = {}
+_lock = threading.RLock()
+
 def write_to(filename, what_to_write):
+    line = json.dumps(what_to_write, ensure_ascii=False)
+    _append(filename, line + "\n")
+
+def write_many(filename, entries):
+    # Same as write_to but one open() and one write() for a whole batch
+    if not entries:
+        return
+    lines = "".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries)
+    _append(filename, lines)
+
+def set_rotation(filename=None, **policy):
+    # set_rotation("log.json", max_bytes=1_000_000, backup_count=5), no filename changes the default for every log
+    unknown = set(policy) - set(DEFAULT_ROTATION)
+    if unknown:
+        raise KeyError(f"Unknown rotation settings: {', '.join(sorted(unknown))}")
+    with _lock:
+        if filename is None:
+            DEFAULT_ROTATION.update(policy)
+        else:
+            _rotation[filename] = {**_rotation.get(filename, DEFAULT_ROTATION), **policy}
+
+def get_rotation(filename):
+    return _rotation.get(filename, DEFAULT_ROTATION)
+
+def _append(filename, text):
+    with _lock:
+        if filename not in _migrated:
+            migrate(filename)
+            _migrated.add(filename)
+
+        policy = get_rotation(filename)
+
+        if policy["daily"]:
+            today = date.today()
+            opened = _opened_day.get(filename)
+            if opened is None:
+                opened = date.fromtimestamp(os.path.getmtime(filename)) if os.path.exists(filename) else today
+            if opened != today:
+                rotate(filename)
+            _opened_day[filename] = today
+
+        with open(filename, 'a', encoding='utf-8') as file:
+            file.write(text)
+            size = file.tell()
+
+        if policy["max_bytes"] and size >= policy["max_bytes"]:
+            rotate(filename)
+
+def rotate(filename):
+    # Closes the active file as a timestamped segment: <log>.<YYYYmmddTHHMMSSffffff>[.gz]
+    with _lock:
+        if not os.path.isfile(filename) or os.path.getsize(filename) == 0:
+            return None
+
+        policy = get_rotation(filename)
+        segment = f"{filename}.{datetime.now().strftime('%Y%m%dT%H%M%S%f')}"
+        while os.path.exists(segment) or os.path.exists(f"{segment}.gz"):
+            segment += "0"
+        os.replace(filename, segment)
+
+        if policy["compress"]:
+            with open(segment, 'rb') as source, gzip.open(f"{segment}.gz", 'wb') as target:
+                shutil.copyfileobj(source, target)
+            os.remove(segment)
+            segment = f"{segment}.gz"
+
+        if policy["backup_count"]:
+            for old in list_segments(filename)[:-policy["backup_count"]]:
+                os.remove(old)
+
+        return segment
+
+def list_segments(filename):
+    # Closed segments for a log, oldest first (the active file is not included)
+    folder = os.path.dirname(os.path.abspath(filename))
+    pattern = re.compile(re.escape(os.path.basename(filename)) + r"\.(\d{8}T\d{12}0*)(\.gz)?$")
+    if not os.path.isdir(folder):
+        return []
+
+    segments = []
+    for name in os.listdir(folder):
+        match = pattern.match(name)
+        if match:
+            segments.append((match.group(1), os.path.join(folder, name)))
+    return [path for _, path in sorted(segments)]
+
+def _open_text(filename):
+    if filename.endswith(".gz"):
+        return gzip.open(filename, 'rt', encoding='utf-8')
+    return open(filename, 'r', encoding='utf-8')
+
+def is_legacy(filename) -> bool:
+    # Legacy files start with "[" (json.dump of a list), JSON Lines files start with "{"
     try:
-        with open(filename, 'r') as file:
-            data = json.load(file)
-            if not isinstance(data, list):
-                data = [data]
-    except (FileNotFoundError, json.JSONDecodeError):
-        data = []
-    
-    data.append(what_to_write)
-    
-    with open(filename, 'w') as file:
-        json.dump(data, file, indent=2)
\ No newline at end of file
+        with _open_text(filename) as file:
+            while True:
+                char = file.read(1)
+                if not char:
+                    return False
+                if not char.isspace():
+                    return char == '['
+    except FileNotFoundError:
+        return False
+
+def read_log(filename):
+    if not os.path.isfile(filename):
+        return
+
+    if is_legacy(filename):
+        try:
+            with _open_text(filename) as file:
+                data = json.load(file)
+        except json.JSONDecodeError:
+            return
+        yield from (data if isinstance(data, list) else [data])
+        return
+
+    with _open_text(filename) as file:
+        for line in file:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                # A half written line from a crash, skip it instead of losing the whole log
+                continue
+
+def read_all(filename):
+    # Every entry of a log in order: closed segments oldest first, then the active file
+    for segment in list_segments(filename):
+        yield from read_log(segment)
+    yield from read_log(filename)
+
+def migrate(filename) -> int:
+    if not is_legacy(filename):
+        return 0
+
+    entries = list(read_log(filename))
+
+    temp_path = f"{filename}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as file:
+        for entry in entries:
+            file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    os.replace(temp_path, filename)
+    return len(entries)
+
+if __name__ == '__main__':
+    import sys
+    # python write.py <log files...>  (defaults to everything in Database/log)
+    files = sys.argv[1:]
+    if not files:
+        # The folder the loggers write to (AccessData's ACCESS_DATA_LOG, PlayerReport's log sits next to it)
+        try:
+            from utils.accessing_data import ACCESS_DATA_LOG
+        except ImportError:
+            sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+            from utils.accessing_data import ACCESS_DATA_LOG
+        log_dir = os.path.dirname(os.path.abspath(ACCESS_DATA_LOG))
+        if not os.path.isdir(log_dir):
+            print(f"No log folder at {log_dir}, pass the log files to migrate: python write.py <log files...>")
+            sys.exit(1)
+        files = [os.path.join(log_dir, name) for name in sorted(os.listdir(log_dir)) if name.endswith(".json")]
+        if not files:
+            print(f"No .json logs in {log_dir}")
+    for name in files:
+        print(f"{name}: migrated {migrate(name)} entries")